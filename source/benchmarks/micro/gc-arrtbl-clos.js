@@ -0,0 +1,56 @@
+/*
+GC scanning microbenchmark. Builds a live heap dominated by array
+tables (arrtbl) and closures with captured cells (clos, cell), then
+forces repeated collections so that the per-object scan cost of the
+collector dominates the run time.
+*/
+
+function makeClos(n)
+{
+    var count = n;
+
+    return function ()
+    {
+        return count++;
+    };
+}
+
+function makeHeap(numArrs, arrLen)
+{
+    var arrs = new Array(numArrs);
+
+    for (var i = 0; i < numArrs; ++i)
+    {
+        var arr = new Array(arrLen);
+
+        for (var j = 0; j < arrLen; ++j)
+            arr[j] = (j % 2 === 0)? makeClos(j):[j, j + 1];
+
+        arrs[i] = arr;
+    }
+
+    return arrs;
+}
+
+function test(numGCs)
+{
+    var heap = makeHeap(1000, 100);
+
+    var startTime = (new Date()).getTime();
+
+    for (var i = 0; i < numGCs; ++i)
+        $ir_gc_collect(0);
+
+    var endTime = (new Date()).getTime();
+
+    // Keep the heap alive until after the collections
+    if (heap.length !== 1000)
+        throw Error('invalid heap length');
+
+    return endTime - startTime;
+}
+
+var totalTime = test(100);
+
+print('gc scan time (ms): ', totalTime);
+print('gc count: ', $ir_get_gc_count());
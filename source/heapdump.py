@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+
+# Decoder for the heap dumps written with "higgs --heap_dump=<file>" or
+# $rt_heapDump(fileName). The dump is memory-mapped and the objects are
+# decoded in place, using the layout metadata generated along with the
+# VM's layout code by runtime/layout.py.
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runtime'))
+import layout_info
+
+# Heap dump file magic number and format version, see heapDump in gc.d
+HEAP_DUMP_MAGIC = b'HIGGSHD\0'
+HEAP_DUMP_VERSION = 1
+
+# Header: magic, version, layout hash, heap base, heap size,
+# number of roots, number of large objects, heap pointer tag range
+HEADER_FMT = '<8s8Q'
+
+PTR_SIZE = 8
+
+# Root kinds, indexed by kind number
+ROOT_KINDS = ['vm', 'gc', 'stack']
+
+# Layouts whose next field points to the overflow slot table
+EXT_TBL_LAYOUTS = ['obj', 'arr', 'clos', 'tarr']
+
+# Layouts whose references do not keep objects alive
+WEAK_LAYOUTS = ['strtbl']
+
+# Layouts reported as strings and as arrays
+STR_LAYOUTS = ['str', 'str8']
+ARR_LAYOUTS = ['arrtbl', 'f64arr', 'i32arr', 'u8arr', 'i8arr', 'u32arr']
+
+# Memoryview formats of the field types
+typeFmt = {
+    'uint8':'B',
+    'uint16':'H',
+    'uint32':'I',
+    'uint64':'Q',
+    'int8':'b',
+    'int16':'h',
+    'int32':'i',
+    'int64':'q',
+    'float64':'d',
+    'rawptr':'Q',
+    'refptr':'Q',
+    'cref32':'I',
+    'funptr':'Q',
+    'shapeptr':'Q',
+}
+
+def fieldIdx(layout, name):
+    for idx, field in enumerate(layout['fields']):
+        if field['name'] == name:
+            return idx
+    return -1
+
+class HeapDump:
+
+    def __init__(self, fileName):
+
+        self.file = open(fileName, 'rb')
+        self.buf = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mem = memoryview(self.buf)
+
+        (
+            magic,
+            version,
+            layoutHash,
+            self.heapBase,
+            self.heapSize,
+            numRoots,
+            numLarge,
+            self.refTagMin,
+            self.refTagMax
+        ) = struct.unpack_from(HEADER_FMT, self.buf, 0)
+
+        if magic != HEAP_DUMP_MAGIC:
+            raise Exception('not a heap dump file')
+        if version != HEAP_DUMP_VERSION:
+            raise Exception('unsupported heap dump version %d' % version)
+        if layoutHash != layout_info.LAYOUT_HASH:
+            raise Exception(
+                'layout hash mismatch (dump %08X, layout_info.py %08X), '
+                'regenerate the layouts with the options the VM was built with' %
+                (layoutHash, layout_info.LAYOUT_HASH)
+            )
+
+        self.layouts = layout_info.layouts
+        self.layoutIds = { l['name']:i for i, l in enumerate(self.layouts) }
+
+        # The header field is at the same offset in all layouts
+        headerOfs = set(l['fields'][fieldIdx(l, 'header')]['ofs'] for l in self.layouts)
+        assert len(headerOfs) == 1
+        self.headerOfs = headerOfs.pop()
+
+        ofs = struct.calcsize(HEADER_FMT)
+
+        # Root words and their tag and kind
+        self.roots = []
+        for i in range(numRoots):
+            word, tagKind = struct.unpack_from('<2Q', self.buf, ofs)
+            self.roots += [(word, tagKind & 0xFF, tagKind >> 8)]
+            ofs += 16
+
+        # File offsets and sizes of the large objects, by address
+        self.large = {}
+        for i in range(numLarge):
+            addr, size = struct.unpack_from('<2Q', self.buf, ofs)
+            ofs += 16
+            self.large[addr] = (ofs, size)
+            ofs += (size + PTR_SIZE - 1) & -PTR_SIZE
+
+        self.heapOfs = ofs
+        assert self.heapOfs + self.heapSize <= len(self.buf)
+
+    def fileOfs(self, addr):
+        """
+        Get the file offset of an object, None if this is not an
+        address in the heap or of a large object
+        """
+
+        if addr >= self.heapBase and addr < self.heapBase + self.heapSize:
+            return self.heapOfs + (addr - self.heapBase)
+        if addr in self.large:
+            return self.large[addr][0]
+        return None
+
+    def layoutId(self, ofs):
+        return struct.unpack_from('<I', self.buf, ofs + self.headerOfs)[0]
+
+    def fields(self, ofs):
+        """
+        Compute the offsets and lengths of the fields of an object,
+        and its size, the same way the collector does in gcScanObj
+        """
+
+        layout = self.layouts[self.layoutId(ofs)]
+        fields = layout['fields']
+
+        fieldOfs = [0] * len(fields)
+        fieldLen = [1] * len(fields)
+
+        for i in range(layout['firstVar']):
+            fieldOfs[i] = fields[i]['ofs']
+
+        curOfs = layout['hdrSize']
+        for i in range(layout['firstVar'], len(fields)):
+            field = fields[i]
+
+            if field['dynAlign']:
+                curOfs = (curOfs + PTR_SIZE - 1) & -PTR_SIZE
+            else:
+                curOfs += field['alignPad']
+
+            fieldOfs[i] = curOfs
+
+            if field['szField'] >= 0:
+                szOfs = ofs + fieldOfs[field['szField']]
+                fieldLen[i] = struct.unpack_from('<I', self.buf, szOfs)[0]
+
+            curOfs += field['elemSize'] * fieldLen[i]
+
+        return layout, fieldOfs, fieldLen, curOfs
+
+    def fieldView(self, ofs, layout, fieldOfs, fieldLen, idx):
+        """
+        Get a zero-copy view of the elements of an object field
+        """
+
+        field = layout['fields'][idx]
+        start = ofs + fieldOfs[idx]
+        end = start + field['elemSize'] * fieldLen[idx]
+        return self.mem[start:end].cast(typeFmt[field['type']])
+
+    def objects(self):
+        """
+        Iterate over the (address, file offset) pairs of the objects,
+        the heap objects first, in address order
+        """
+
+        fillerId = self.layoutIds.get('filler', -1)
+
+        addr = self.heapBase
+        heapEnd = self.heapBase + self.heapSize
+        while addr < heapEnd:
+            ofs = self.heapOfs + (addr - self.heapBase)
+            size = self.fields(ofs)[3]
+
+            if self.layoutId(ofs) != fillerId:
+                yield addr, ofs
+
+            addr += (size + PTR_SIZE - 1) & -PTR_SIZE
+
+        for addr in sorted(self.large):
+            yield addr, self.large[addr][0]
+
+    def refs(self, ofs):
+        """
+        Iterate over the addresses of the objects referenced by an object
+        """
+
+        layout, fieldOfs, fieldLen, size = self.fields(ofs)
+        fields = layout['fields']
+
+        if layout['name'] in WEAK_LAYOUTS:
+            return
+
+        for i, field in enumerate(fields):
+
+            isExtTbl = field['name'] == 'next' and layout['name'] in EXT_TBL_LAYOUTS
+
+            if field['isRef'] or isExtTbl and field['type'] == 'refptr':
+                for ptr in self.fieldView(ofs, layout, fieldOfs, fieldLen, i):
+                    if ptr != 0:
+                        yield ptr
+
+            elif field['isCRef'] or isExtTbl and field['type'] == 'cref32':
+                for cref in self.fieldView(ofs, layout, fieldOfs, fieldLen, i):
+                    if cref != 0:
+                        yield self.heapBase + ((cref - 1) << 3)
+
+            elif field['tpField'] >= 0:
+                words = self.fieldView(ofs, layout, fieldOfs, fieldLen, i)
+                tags = self.fieldView(ofs, layout, fieldOfs, fieldLen, field['tpField'])
+                for word, tag in zip(words, tags):
+                    if tag >= self.refTagMin and tag <= self.refTagMax and word != 0:
+                        yield word
+
+    def strValue(self, ofs, maxLen):
+        layout, fieldOfs, fieldLen, size = self.fields(ofs)
+        data = self.fieldView(ofs, layout, fieldOfs, fieldLen, fieldIdx(layout, 'data'))
+        return ''.join(map(chr, data[:maxLen]))
+
+class HeapGraph:
+    """
+    Object graph of a heap dump, with its dominator tree. Node 0 is a
+    virtual root, pointing to the roots, node i + 1 is object i.
+    """
+
+    def __init__(self, dump):
+
+        self.dump = dump
+
+        self.addrs = array('Q')
+        self.ofss = array('Q')
+        self.layoutIds = array('B')
+        self.sizes = array('Q')
+
+        for addr, ofs in dump.objects():
+            self.addrs.append(addr)
+            self.ofss.append(ofs)
+            self.layoutIds.append(dump.layoutId(ofs))
+            size = dump.fields(ofs)[3]
+            self.sizes.append((size + PTR_SIZE - 1) & -PTR_SIZE)
+
+        # The large objects follow the heap objects, out of address order
+        self.numHeapObjs = len(self.addrs) - len(dump.large)
+        self.largeIdx = {}
+        for i in range(self.numHeapObjs, len(self.addrs)):
+            self.largeIdx[self.addrs[i]] = i
+
+        numNodes = len(self.addrs) + 1
+
+        # Successors of each node, in compressed row form
+        self.succStart = array('Q', [0])
+        self.succs = array('Q')
+
+        self.rootKinds = {}
+        for word, tag, kind in dump.roots:
+            idx = self.objIdx(word)
+            if idx is None:
+                continue
+            self.succs.append(idx + 1)
+            self.rootKinds[idx + 1] = ROOT_KINDS[kind]
+        self.succStart.append(len(self.succs))
+
+        for i in range(len(self.addrs)):
+            for ptr in dump.refs(self.ofss[i]):
+                idx = self.objIdx(ptr)
+                if idx is not None:
+                    self.succs.append(idx + 1)
+            self.succStart.append(len(self.succs))
+
+        self.numNodes = numNodes
+        self.computeOrder()
+        self.computeDoms()
+        self.computeRetained()
+
+    def objIdx(self, addr):
+        """
+        Get the index of the object at a given address, None if there is none
+        """
+
+        idx = bisect_left(self.addrs, addr, 0, self.numHeapObjs)
+        if idx < self.numHeapObjs and self.addrs[idx] == addr:
+            return idx
+        return self.largeIdx.get(addr)
+
+    def succList(self, node):
+        return self.succs[self.succStart[node]:self.succStart[node + 1]]
+
+    def computeOrder(self):
+        """
+        Compute a reverse postorder of the nodes. The objects not reachable
+        from the roots are referenced by the VM itself, through IR constants,
+        and are made children of the virtual root.
+        """
+
+        visited = bytearray(self.numNodes)
+        succs = self.succs
+        succStart = self.succStart
+
+        def dfs(start, post, extraSuccs=()):
+            """
+            Iterative depth-first search. Stack entries hold the node and
+            the range of its successors left to visit, the extra successors
+            are visited after those of the start node.
+            """
+
+            visited[start] = 1
+            stack = [[start, succStart[start], succStart[start + 1]]]
+            extraIdx = 0
+            while stack:
+                frame = stack[-1]
+                node, idx, end = frame
+                if idx < end:
+                    frame[1] = idx + 1
+                    succ = succs[idx]
+                elif node == start and extraIdx < len(extraSuccs):
+                    succ = extraSuccs[extraIdx]
+                    extraIdx += 1
+                else:
+                    stack.pop()
+                    if post is not None:
+                        post(node)
+                    continue
+
+                if not visited[succ]:
+                    visited[succ] = 1
+                    stack.append([succ, succStart[succ], succStart[succ + 1]])
+
+        # Find the unreachable objects which are not reachable
+        # from the unreachable objects found before them
+        self.extraRoots = array('Q')
+        dfs(0, None)
+        for node in range(1, self.numNodes):
+            if not visited[node]:
+                self.extraRoots.append(node)
+                dfs(node, None)
+
+        self.postNum = array('q', [-1]) * self.numNodes
+        self.rpo = array('Q')
+
+        def post(node):
+            self.postNum[node] = len(self.rpo)
+            self.rpo.append(node)
+
+        # The virtual root is the parent of the extra roots
+        visited[:] = bytearray(self.numNodes)
+        dfs(0, post, self.extraRoots)
+        self.rpo.reverse()
+
+    def computeDoms(self):
+        """
+        Compute the immediate dominators, using the iterative algorithm
+        of Cooper, Harvey and Kennedy
+        """
+
+        # Predecessors of each node, in compressed row form
+        numPreds = array('Q', [0]) * (self.numNodes + 1)
+        for node in range(self.numNodes):
+            for succ in self.succList(node):
+                numPreds[succ + 1] += 1
+        for node in self.extraRoots:
+            numPreds[node + 1] += 1
+        for node in range(self.numNodes):
+            numPreds[node + 1] += numPreds[node]
+        predStart = numPreds
+        preds = array('Q', [0]) * predStart[self.numNodes]
+        fill = array('Q', predStart[:self.numNodes])
+        for node in range(self.numNodes):
+            for succ in self.succList(node):
+                preds[fill[succ]] = node
+                fill[succ] += 1
+        for node in self.extraRoots:
+            preds[fill[node]] = 0
+            fill[node] += 1
+
+        postNum = self.postNum
+        doms = array('q', [-1]) * self.numNodes
+        doms[0] = 0
+
+        def intersect(a, b):
+            while a != b:
+                while postNum[a] < postNum[b]:
+                    a = doms[a]
+                while postNum[b] < postNum[a]:
+                    b = doms[b]
+            return a
+
+        changed = True
+        while changed:
+            changed = False
+            for node in self.rpo[1:]:
+                newDom = -1
+                for pred in preds[predStart[node]:predStart[node + 1]]:
+                    if doms[pred] == -1:
+                        continue
+                    newDom = pred if newDom == -1 else intersect(pred, newDom)
+                if doms[node] != newDom:
+                    doms[node] = newDom
+                    changed = True
+
+        self.doms = doms
+
+    def computeRetained(self):
+        """
+        Compute the retained size of each object, the total size of
+        the objects it dominates, itself included
+        """
+
+        self.retained = array('Q', [0]) * self.numNodes
+        for node in reversed(self.rpo):
+            if node == 0:
+                continue
+            self.retained[node] += self.sizes[node - 1]
+            self.retained[self.doms[node]] += self.retained[node]
+
+    def layoutStats(self):
+        """
+        Count the objects, shallow bytes and retained bytes of each layout.
+        The retained bytes of a layout only count the objects which are not
+        dominated by another object of the same layout.
+        """
+
+        numLayouts = len(self.dump.layouts)
+        counts = [0] * numLayouts
+        shallow = [0] * numLayouts
+        retained = [0] * numLayouts
+
+        # Layouts of the dominators of each node, as bit masks
+        domMasks = [0] * self.numNodes
+        for node in self.rpo:
+            if node == 0:
+                continue
+            dom = self.doms[node]
+            if dom != 0:
+                domMasks[node] = domMasks[dom] | (1 << self.layoutIds[dom - 1])
+
+            layoutId = self.layoutIds[node - 1]
+            counts[layoutId] += 1
+            shallow[layoutId] += self.sizes[node - 1]
+            if not domMasks[node] & (1 << layoutId):
+                retained[layoutId] += self.retained[node]
+
+        return counts, shallow, retained
+
+    def biggest(self, layoutNames, num):
+        """
+        Get the nodes of the largest objects of some layouts
+        """
+
+        ids = set(self.dump.layoutIds[name] for name in layoutNames if name in self.dump.layoutIds)
+        nodes = [i + 1 for i in range(len(self.addrs)) if self.layoutIds[i] in ids]
+        nodes.sort(key=lambda node: self.sizes[node - 1], reverse=True)
+        return nodes[:num]
+
+    def describe(self, node):
+        layout = self.dump.layouts[self.layoutIds[node - 1]]
+        return '%s @ 0x%x' % (layout['name'], self.addrs[node - 1])
+
+def printReport(graph, numTop):
+
+    dump = graph.dump
+
+    print('heap size (bytes): %s' % dump.heapSize)
+    print('num large objs: %s' % len(dump.large))
+    print('num objects: %s' % len(graph.addrs))
+    for kind in ROOT_KINDS:
+        print('num %s roots: %s' % (kind, list(graph.rootKinds.values()).count(kind)))
+    print('num vm internal roots: %s' % len(graph.extraRoots))
+    print('')
+
+    counts, shallow, retained = graph.layoutStats()
+    print('%-10s %12s %16s %16s' % ('layout', 'count', 'shallow bytes', 'retained bytes'))
+    order = sorted(range(len(counts)), key=lambda i: retained[i], reverse=True)
+    for i in order:
+        if counts[i] == 0:
+            continue
+        print('%-10s %12s %16s %16s' % (dump.layouts[i]['name'], counts[i], shallow[i], retained[i]))
+    print('')
+
+    print('biggest strings:')
+    for node in graph.biggest(STR_LAYOUTS, numTop):
+        ofs = graph.ofss[node - 1]
+        layout, fieldOfs, fieldLen, size = dump.fields(ofs)
+        length = fieldLen[fieldIdx(layout, 'data')]
+        print('  %s, len %s, %s bytes: %r' % (graph.describe(node), length, size, dump.strValue(ofs, 40)))
+    print('')
+
+    print('biggest arrays:')
+    for node in graph.biggest(ARR_LAYOUTS, numTop):
+        ofs = graph.ofss[node - 1]
+        layout, fieldOfs, fieldLen, size = dump.fields(ofs)
+        length = max(fieldLen)
+        print('  %s, cap %s, %s bytes, retains %s bytes' % (graph.describe(node), length, size, graph.retained[node]))
+    print('')
+
+    print('biggest retainers:')
+    nodes = sorted(range(1, graph.numNodes), key=lambda node: graph.retained[node], reverse=True)
+    for node in nodes[:numTop]:
+        dom = graph.doms[node]
+        domStr = graph.describe(dom) if dom != 0 else graph.rootKinds.get(node, 'vm internal') + ' root'
+        print('  %s, retains %s bytes, dominated by %s' % (graph.describe(node), graph.retained[node], domStr))
+
+if __name__ == '__main__':
+
+    parser = OptionParser(usage='%prog [options] <dump file>')
+    parser.add_option("--top", type="int", default=10)
+    (options, args) = parser.parse_args()
+
+    if len(args) != 1:
+        parser.error('expected a heap dump file')
+
+    dump = HeapDump(args[0])
+    graph = HeapGraph(dump)
+    printReport(graph, options.top)
@@ -225,7 +225,7 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
         // scan next token
         while (cursor < end)
         {
-            chr = $rt_str_get_data(input, cursor);
+            chr = $rt_strGetChar(input, cursor);
 
             // Handle Loners
             switch(chr)
@@ -264,11 +264,11 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
                 break;
             // comments /* */
             case 47:
-                chr = $rt_str_get_data(input, ++cursor);
+                chr = $rt_strGetChar(input, ++cursor);
                 if (chr === 42)
                     while (true)
                     {
-                        chr = $rt_str_get_data(input, ++cursor);
+                        chr = $rt_strGetChar(input, ++cursor);
 
                         if (chr === 10)
                         {
@@ -277,7 +277,7 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
                             this.last_index = cursor;
                         }
 
-                        if (chr === 42 && $rt_str_get_data(input, cursor + 1) === 47)
+                        if (chr === 42 && $rt_strGetChar(input, cursor + 1) === 47)
                             break;
                         else if (cursor === end)
                             throw CParseError('unterminated comment'); 
@@ -292,7 +292,7 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
                 if ((cursor === index) && (chr > 47 && chr < 58))
                 {
                      while (chr > 47 && chr < 58)
-                        chr = $rt_str_get_data(input, ++cursor);
+                        chr = $rt_strGetChar(input, ++cursor);
 
                     if (((chr >= 65 && chr <= 90) || (chr >= 97 && chr <= 122) ||
                          (chr >= 48 && chr <= 57) || (chr === 95)))
@@ -305,7 +305,7 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
                     // idents
                     while (((chr >= 65 && chr <= 90) || (chr >= 97 && chr <= 122) ||
                             (chr >= 48 && chr <= 57) || (chr === 95)) && cursor < end)
-                        chr = $rt_str_get_data(input, ++cursor);
+                        chr = $rt_strGetChar(input, ++cursor);
                     this.token_type = IDENTIFIER;
                 }
 
@@ -313,7 +313,7 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
                 t_length = cursor - index;
                 t_string = $rt_str_alloc(t_length);
                 for (i = 0; i < t_length; i++)
-                    $rt_str_set_data(t_string, i, $rt_str_get_data(input, index++));
+                    $rt_str_set_data(t_string, i, $rt_strGetChar(input, index++));
 
                 // emit
                 t = $ir_get_str(t_string);
@@ -1957,7 +1957,7 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
         c_str = c.malloc(len + 1);
 
         for (i = 0; i < len; i++)
-            $ir_store_u8(c_str, i, $rt_str_get_data(str, i));
+            $ir_store_u8(c_str, i, $rt_strGetChar(str, i));
 
         $ir_store_u8(c_str, len, 0);
         return c_str;
@@ -1972,7 +1972,7 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
         var i;
 
         for (i = 0; i < len; i++)
-            $ir_store_u8(buff, i, $rt_str_get_data(jstr, i));
+            $ir_store_u8(buff, i, $rt_strGetChar(jstr, i));
 
         $ir_store_u8(buff, len, 0);
         return buff;
@@ -2002,12 +2002,12 @@ FFI - provides functionality for writing bindings to/wrappers for C code.
             len -= 1;
         }
 
-        // Allocate string
-        s = $rt_str_alloc(len);
+        // Allocate a one-byte string, C strings hold 8-bit characters
+        s = $rt_str8_alloc(len);
 
         // Copy
         for (i = 0; i < len; i++)
-            $rt_str_set_data(s, i, $ir_load_u8(cstr, offset + i));
+            $rt_str8_set_data(s, i, $ir_load_u8(cstr, offset + i));
 
         // Attempt to find the string in the string table
         return $ir_get_str(s);
@@ -353,7 +353,7 @@ Bindings for common c I/O functions
     */
     File.prototype.putc = function(chr)
     {
-        var code = $rt_str_get_data(chr, 0);
+        var code = $rt_strGetChar(chr, 0);
         var r;
         r = c.fputc(code, this.ptr);
         return (r === code);
@@ -2,6 +2,10 @@
 // Code auto-generated from "runtime/layout.py". Do not modify.
 //
 
+$ir_obj_def_const(this, "$rt_CREF32", false, false);
+
+$ir_obj_def_const(this, "$rt_LARGE_OBJ_SIZE", 32768, false);
+
 $ir_obj_def_const(this, "$rt_LAYOUT_STR", 0, false);
 
 function $rt_str_ofs_next(o)
@@ -11,22 +15,22 @@ function $rt_str_ofs_next(o)
 
 function $rt_str_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_str_ofs_len(o)
 {    
-    return $ir_add_i32($ir_add_i32(0, 8), 4);
+    return 12;
 }
 
 function $rt_str_ofs_hash(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4);
+    return 16;
 }
 
 function $rt_str_ofs_data(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), $ir_mul_i32(2, i));
+    return $ir_add_i32($ir_mul_i32(2, i), 20);
 }
 
 function $rt_str_get_next(o)
@@ -55,6 +59,12 @@ function $rt_str_get_data(o, i)
 }
 
 function $rt_str_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_str_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_str_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_str_ofs_next(o), v);
 }
@@ -79,9 +89,23 @@ function $rt_str_set_data(o, i, v)
     $ir_store_u16(o, $rt_str_ofs_data(o, i), v);
 }
 
+function $rt_str_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_str_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u16(o, $ir_add_i32(ofs, $ir_mul_i32(i, 2)), v);
+    }
+}
+
+function $rt_str_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_str_ofs_data(dst, dstIdx), src, $rt_str_ofs_data(src, srcIdx), $ir_mul_i32(count, 2));
+}
+
 function $rt_str_comp_size(len)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), $ir_mul_i32(2, len));
+    return $ir_add_i32($ir_mul_i32(2, len), 20);
 }
 
 function $rt_str_sizeof(o)
@@ -91,14 +115,15 @@ function $rt_str_sizeof(o)
 
 function $rt_str_alloc(len)
 {    
-    var o = $ir_alloc_string($rt_str_comp_size(len));
+    var o_size = $rt_str_comp_size(len);
+    var o = $ir_alloc_string(o_size);
+    $ir_count_alloc(0, 1, o_size);
     $rt_str_set_len(o, len);
     return o;
 }
 
 function $rt_str_visit_gc(o)
-{    
-    $rt_str_set_next(o, $rt_gcForward(vm, $rt_str_get_next(o)));
+{
 }
 
 $ir_obj_def_const(this, "$rt_LAYOUT_STRTBL", 1, false);
@@ -110,22 +135,27 @@ function $rt_strtbl_ofs_next(o)
 
 function $rt_strtbl_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_strtbl_ofs_cap(o)
 {    
-    return $ir_add_i32($ir_add_i32(0, 8), 4);
+    return 12;
 }
 
 function $rt_strtbl_ofs_num_strs(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4);
+    return 16;
 }
 
 function $rt_strtbl_ofs_str(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, i));
+    return $ir_add_i32($ir_mul_i32(8, i), 24);
+}
+
+function $rt_strtbl_ofs_hash(o, i)
+{    
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, $rt_strtbl_get_cap(o)), $ir_mul_i32(4, i)), 24);
 }
 
 function $rt_strtbl_get_next(o)
@@ -153,7 +183,18 @@ function $rt_strtbl_get_str(o, i)
     return $ir_load_refptr(o, $rt_strtbl_ofs_str(o, i));
 }
 
+function $rt_strtbl_get_hash(o, i)
+{    
+    return $ir_load_u32(o, $rt_strtbl_ofs_hash(o, i));
+}
+
 function $rt_strtbl_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_strtbl_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_strtbl_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_strtbl_ofs_next(o), v);
 }
@@ -176,11 +217,52 @@ function $rt_strtbl_set_num_strs(o, v)
 function $rt_strtbl_set_str(o, i, v)
 {    
     $ir_store_refptr(o, $rt_strtbl_ofs_str(o, i), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_strtbl_init_str(o, i, v)
+{    
+    $ir_store_refptr(o, $rt_strtbl_ofs_str(o, i), v);
+}
+
+function $rt_strtbl_set_hash(o, i, v)
+{    
+    $ir_store_u32(o, $rt_strtbl_ofs_hash(o, i), v);
+}
+
+function $rt_strtbl_fill_str(o, start, count, v)
+{    
+    var ofs = $rt_strtbl_ofs_str(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_refptr(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+    $ir_write_barrier(o);
+}
+
+function $rt_strtbl_copy_str(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_strtbl_ofs_str(dst, dstIdx), src, $rt_strtbl_ofs_str(src, srcIdx), $ir_mul_i32(count, 8));
+    $ir_write_barrier(dst);
+}
+
+function $rt_strtbl_fill_hash(o, start, count, v)
+{    
+    var ofs = $rt_strtbl_ofs_hash(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u32(o, $ir_add_i32(ofs, $ir_mul_i32(i, 4)), v);
+    }
+}
+
+function $rt_strtbl_copy_hash(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_strtbl_ofs_hash(dst, dstIdx), src, $rt_strtbl_ofs_hash(src, srcIdx), $ir_mul_i32(count, 4));
 }
 
 function $rt_strtbl_comp_size(cap)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, cap));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), $ir_mul_i32(4, cap)), 24);
 }
 
 function $rt_strtbl_sizeof(o)
@@ -190,7 +272,9 @@ function $rt_strtbl_sizeof(o)
 
 function $rt_strtbl_alloc(cap)
 {    
-    var o = $ir_alloc_refptr($rt_strtbl_comp_size(cap));
+    var o_size = $rt_strtbl_comp_size(cap);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(1, 1, o_size);
     $rt_strtbl_set_cap(o, cap);
     $rt_strtbl_set_header(o, 1);
     return o;
@@ -198,11 +282,10 @@ function $rt_strtbl_alloc(cap)
 
 function $rt_strtbl_visit_gc(o)
 {    
-    $rt_strtbl_set_next(o, $rt_gcForward(vm, $rt_strtbl_get_next(o)));
     var cap = $rt_strtbl_get_cap(o);
     for (var i = 0; $ir_lt_i32(i, cap); i = $ir_add_i32(i, 1))
     {    
-        $rt_strtbl_set_str(o, i, $rt_gcForward(vm, $rt_strtbl_get_str(o, i)));
+        $rt_strtbl_init_str(o, i, $rt_gcForward(vm, $rt_strtbl_get_str(o, i)));
     }
 }
 
@@ -215,22 +298,27 @@ function $rt_rope_ofs_next(o)
 
 function $rt_rope_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_rope_ofs_len(o)
 {    
-    return $ir_add_i32($ir_add_i32(0, 8), 4);
+    return 12;
+}
+
+function $rt_rope_ofs_depth(o)
+{    
+    return 16;
 }
 
 function $rt_rope_ofs_left(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4);
+    return 24;
 }
 
 function $rt_rope_ofs_right(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 8);
+    return 32;
 }
 
 function $rt_rope_get_next(o)
@@ -248,6 +336,11 @@ function $rt_rope_get_len(o)
     return $ir_load_u32(o, $rt_rope_ofs_len(o));
 }
 
+function $rt_rope_get_depth(o)
+{    
+    return $ir_load_u32(o, $rt_rope_ofs_depth(o));
+}
+
 function $rt_rope_get_left(o)
 {    
     return $ir_load_refptr(o, $rt_rope_ofs_left(o));
@@ -259,6 +352,12 @@ function $rt_rope_get_right(o)
 }
 
 function $rt_rope_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_rope_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_rope_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_rope_ofs_next(o), v);
 }
@@ -273,19 +372,36 @@ function $rt_rope_set_len(o, v)
     $ir_store_u32(o, $rt_rope_ofs_len(o), v);
 }
 
+function $rt_rope_set_depth(o, v)
+{    
+    $ir_store_u32(o, $rt_rope_ofs_depth(o), v);
+}
+
 function $rt_rope_set_left(o, v)
+{    
+    $ir_store_refptr(o, $rt_rope_ofs_left(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_rope_init_left(o, v)
 {    
     $ir_store_refptr(o, $rt_rope_ofs_left(o), v);
 }
 
 function $rt_rope_set_right(o, v)
+{    
+    $ir_store_refptr(o, $rt_rope_ofs_right(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_rope_init_right(o, v)
 {    
     $ir_store_refptr(o, $rt_rope_ofs_right(o), v);
 }
 
 function $rt_rope_comp_size()
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 8), 8);
+    return 40;
 }
 
 function $rt_rope_sizeof(o)
@@ -295,16 +411,17 @@ function $rt_rope_sizeof(o)
 
 function $rt_rope_alloc()
 {    
-    var o = $ir_alloc_rope($rt_rope_comp_size());
+    var o = $ir_alloc_rope(40);
+    $ir_count_alloc(2, 1, 40);
     $rt_rope_set_header(o, 2);
+    $rt_rope_set_depth(o, 1);
     return o;
 }
 
 function $rt_rope_visit_gc(o)
 {    
-    $rt_rope_set_next(o, $rt_gcForward(vm, $rt_rope_get_next(o)));
-    $rt_rope_set_left(o, $rt_gcForward(vm, $rt_rope_get_left(o)));
-    $rt_rope_set_right(o, $rt_gcForward(vm, $rt_rope_get_right(o)));
+    $rt_rope_init_left(o, $rt_gcForward(vm, $rt_rope_get_left(o)));
+    $rt_rope_init_right(o, $rt_gcForward(vm, $rt_rope_get_right(o)));
 }
 
 $ir_obj_def_const(this, "$rt_LAYOUT_OBJ", 3, false);
@@ -316,27 +433,27 @@ function $rt_obj_ofs_next(o)
 
 function $rt_obj_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_obj_ofs_cap(o)
 {    
-    return $ir_add_i32($ir_add_i32(0, 8), 4);
+    return 12;
 }
 
 function $rt_obj_ofs_shape_idx(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4);
+    return 16;
 }
 
 function $rt_obj_ofs_word(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, i));
+    return $ir_add_i32($ir_mul_i32(8, i), 24);
 }
 
 function $rt_obj_ofs_tag(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, $rt_obj_get_cap(o))), $ir_mul_i32(1, i));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, $rt_obj_get_cap(o)), i), 24);
 }
 
 function $rt_obj_get_next(o)
@@ -370,6 +487,12 @@ function $rt_obj_get_tag(o, i)
 }
 
 function $rt_obj_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_obj_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_obj_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_obj_ofs_next(o), v);
 }
@@ -390,6 +513,12 @@ function $rt_obj_set_shape_idx(o, v)
 }
 
 function $rt_obj_set_word(o, i, v)
+{    
+    $ir_store_u64(o, $rt_obj_ofs_word(o, i), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_obj_init_word(o, i, v)
 {    
     $ir_store_u64(o, $rt_obj_ofs_word(o, i), v);
 }
@@ -399,9 +528,39 @@ function $rt_obj_set_tag(o, i, v)
     $ir_store_u8(o, $rt_obj_ofs_tag(o, i), v);
 }
 
+function $rt_obj_fill_word(o, start, count, v)
+{    
+    var ofs = $rt_obj_ofs_word(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u64(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+    $ir_write_barrier(o);
+}
+
+function $rt_obj_copy_word(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_obj_ofs_word(dst, dstIdx), src, $rt_obj_ofs_word(src, srcIdx), $ir_mul_i32(count, 8));
+    $ir_write_barrier(dst);
+}
+
+function $rt_obj_fill_tag(o, start, count, v)
+{    
+    var ofs = $rt_obj_ofs_tag(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_obj_copy_tag(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_obj_ofs_tag(dst, dstIdx), src, $rt_obj_ofs_tag(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
 function $rt_obj_comp_size(cap)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, cap)), $ir_mul_i32(1, cap));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), cap), 24);
 }
 
 function $rt_obj_sizeof(o)
@@ -411,7 +570,9 @@ function $rt_obj_sizeof(o)
 
 function $rt_obj_alloc(cap)
 {    
-    var o = $ir_alloc_object($rt_obj_comp_size(cap));
+    var o_size = $rt_obj_comp_size(cap);
+    var o = $ir_alloc_object(o_size);
+    $ir_count_alloc(3, 1, o_size);
     $rt_obj_set_cap(o, cap);
     $rt_obj_set_header(o, 3);
     return o;
@@ -419,11 +580,21 @@ function $rt_obj_alloc(cap)
 
 function $rt_obj_visit_gc(o)
 {    
-    $rt_obj_set_next(o, $rt_gcForward(vm, $rt_obj_get_next(o)));
     var cap = $rt_obj_get_cap(o);
+    var word_ofs = $rt_obj_ofs_word(o, 0);
+    var tag_ofs = $rt_obj_ofs_tag(o, 0);
     for (var i = 0; $ir_lt_i32(i, cap); i = $ir_add_i32(i, 1))
     {    
-        $rt_obj_set_word(o, i, $rt_gcForward(vm, $rt_obj_get_word(o, i), $rt_obj_get_tag(o, i)));
+        var t = $ir_load_u8(o, $ir_add_i32(tag_ofs, i));
+        if ($ir_gt_i32(t, $ir_get_tag($nullptr)))
+        {    
+            var w = $ir_load_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)));
+            var fw = $rt_gcForward(vm, w, t);
+            if ($ir_ne_i32(fw, w))
+            {    
+                $ir_store_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)), fw);
+            }
+        }
     }
 }
 
@@ -436,37 +607,39 @@ function $rt_clos_ofs_next(o)
 
 function $rt_clos_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_clos_ofs_cap(o)
 {    
-    return $ir_add_i32($ir_add_i32(0, 8), 4);
+    return 12;
 }
 
 function $rt_clos_ofs_shape_idx(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4);
+    return 16;
 }
 
 function $rt_clos_ofs_word(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, i));
+    return $ir_add_i32($ir_mul_i32(8, i), 24);
 }
 
 function $rt_clos_ofs_tag(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, $rt_clos_get_cap(o))), $ir_mul_i32(1, i));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, $rt_clos_get_cap(o)), i), 24);
 }
 
 function $rt_clos_ofs_num_cells(o)
 {    
-    return $ir_and_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, $rt_clos_get_cap(o))), $ir_mul_i32(1, $rt_clos_get_cap(o))), 7), -8);
+    var cap = $rt_clos_get_cap(o);
+    return $ir_and_i32($ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), cap), 31), -8);
 }
 
 function $rt_clos_ofs_cell(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_and_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, $rt_clos_get_cap(o))), $ir_mul_i32(1, $rt_clos_get_cap(o))), 7), -8), 4), $ir_mul_i32(8, i));
+    var cap = $rt_clos_get_cap(o);
+    return $ir_add_i32($ir_add_i32($ir_and_i32($ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), cap), 31), -8), $ir_mul_i32(8, i)), 4);
 }
 
 function $rt_clos_get_next(o)
@@ -510,6 +683,12 @@ function $rt_clos_get_cell(o, i)
 }
 
 function $rt_clos_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_clos_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_clos_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_clos_ofs_next(o), v);
 }
@@ -530,6 +709,12 @@ function $rt_clos_set_shape_idx(o, v)
 }
 
 function $rt_clos_set_word(o, i, v)
+{    
+    $ir_store_u64(o, $rt_clos_ofs_word(o, i), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_clos_init_word(o, i, v)
 {    
     $ir_store_u64(o, $rt_clos_ofs_word(o, i), v);
 }
@@ -547,11 +732,63 @@ function $rt_clos_set_num_cells(o, v)
 function $rt_clos_set_cell(o, i, v)
 {    
     $ir_store_refptr(o, $rt_clos_ofs_cell(o, i), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_clos_init_cell(o, i, v)
+{    
+    $ir_store_refptr(o, $rt_clos_ofs_cell(o, i), v);
+}
+
+function $rt_clos_fill_word(o, start, count, v)
+{    
+    var ofs = $rt_clos_ofs_word(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u64(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+    $ir_write_barrier(o);
+}
+
+function $rt_clos_copy_word(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_clos_ofs_word(dst, dstIdx), src, $rt_clos_ofs_word(src, srcIdx), $ir_mul_i32(count, 8));
+    $ir_write_barrier(dst);
+}
+
+function $rt_clos_fill_tag(o, start, count, v)
+{    
+    var ofs = $rt_clos_ofs_tag(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_clos_copy_tag(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_clos_ofs_tag(dst, dstIdx), src, $rt_clos_ofs_tag(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
+function $rt_clos_fill_cell(o, start, count, v)
+{    
+    var ofs = $rt_clos_ofs_cell(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_refptr(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+    $ir_write_barrier(o);
+}
+
+function $rt_clos_copy_cell(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_clos_ofs_cell(dst, dstIdx), src, $rt_clos_ofs_cell(src, srcIdx), $ir_mul_i32(count, 8));
+    $ir_write_barrier(dst);
 }
 
 function $rt_clos_comp_size(cap, num_cells)
 {    
-    return $ir_add_i32($ir_add_i32($ir_and_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, cap)), $ir_mul_i32(1, cap)), 7), -8), 4), $ir_mul_i32(8, num_cells));
+    return $ir_add_i32($ir_add_i32($ir_and_i32($ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), cap), 31), -8), $ir_mul_i32(8, num_cells)), 4);
 }
 
 function $rt_clos_sizeof(o)
@@ -561,7 +798,9 @@ function $rt_clos_sizeof(o)
 
 function $rt_clos_alloc(cap, num_cells)
 {    
-    var o = $ir_alloc_closure($rt_clos_comp_size(cap, num_cells));
+    var o_size = $rt_clos_comp_size(cap, num_cells);
+    var o = $ir_alloc_closure(o_size);
+    $ir_count_alloc(4, 1, o_size);
     $rt_clos_set_cap(o, cap);
     $rt_clos_set_num_cells(o, num_cells);
     $rt_clos_set_header(o, 4);
@@ -570,16 +809,26 @@ function $rt_clos_alloc(cap, num_cells)
 
 function $rt_clos_visit_gc(o)
 {    
-    $rt_clos_set_next(o, $rt_gcForward(vm, $rt_clos_get_next(o)));
     var cap = $rt_clos_get_cap(o);
+    var word_ofs = $rt_clos_ofs_word(o, 0);
+    var tag_ofs = $rt_clos_ofs_tag(o, 0);
     for (var i = 0; $ir_lt_i32(i, cap); i = $ir_add_i32(i, 1))
     {    
-        $rt_clos_set_word(o, i, $rt_gcForward(vm, $rt_clos_get_word(o, i), $rt_clos_get_tag(o, i)));
+        var t = $ir_load_u8(o, $ir_add_i32(tag_ofs, i));
+        if ($ir_gt_i32(t, $ir_get_tag($nullptr)))
+        {    
+            var w = $ir_load_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)));
+            var fw = $rt_gcForward(vm, w, t);
+            if ($ir_ne_i32(fw, w))
+            {    
+                $ir_store_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)), fw);
+            }
+        }
     }
     var num_cells = $rt_clos_get_num_cells(o);
     for (var i = 0; $ir_lt_i32(i, num_cells); i = $ir_add_i32(i, 1))
     {    
-        $rt_clos_set_cell(o, i, $rt_gcForward(vm, $rt_clos_get_cell(o, i)));
+        $rt_clos_init_cell(o, i, $rt_gcForward(vm, $rt_clos_get_cell(o, i)));
     }
 }
 
@@ -592,17 +841,17 @@ function $rt_cell_ofs_next(o)
 
 function $rt_cell_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_cell_ofs_word(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4);
+    return 16;
 }
 
 function $rt_cell_ofs_tag(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 8);
+    return 24;
 }
 
 function $rt_cell_get_next(o)
@@ -626,6 +875,12 @@ function $rt_cell_get_tag(o)
 }
 
 function $rt_cell_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_cell_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_cell_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_cell_ofs_next(o), v);
 }
@@ -636,6 +891,12 @@ function $rt_cell_set_header(o, v)
 }
 
 function $rt_cell_set_word(o, v)
+{    
+    $ir_store_u64(o, $rt_cell_ofs_word(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_cell_init_word(o, v)
 {    
     $ir_store_u64(o, $rt_cell_ofs_word(o), v);
 }
@@ -647,7 +908,7 @@ function $rt_cell_set_tag(o, v)
 
 function $rt_cell_comp_size()
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 8), 1);
+    return 25;
 }
 
 function $rt_cell_sizeof(o)
@@ -657,16 +918,42 @@ function $rt_cell_sizeof(o)
 
 function $rt_cell_alloc()
 {    
-    var o = $ir_alloc_refptr($rt_cell_comp_size());
+    var o = $ir_alloc_refptr(25);
+    $ir_count_alloc(5, 1, 25);
     $rt_cell_set_header(o, 5);
-    $rt_cell_set_word(o, $ir_get_word($undef));
+    $rt_cell_init_word(o, $ir_get_word($undef));
+    return o;
+}
+
+$ir_obj_def_const(this, "$rt_CELL_STRIDE", 32, false);
+
+$ir_obj_def_const(this, "$rt_CELL_MAX_N", 1023, false);
+
+function $rt_cell_alloc_n(n)
+{    
+    var o_size = $ir_mul_i32(32, n);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(5, n, o_size);
+    for (var i = 0; $ir_lt_i32(i, n); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u32(o, $ir_add_i32($ir_mul_i32(i, 32), $rt_cell_ofs_header(o)), 5);
+        $ir_store_u64(o, $ir_add_i32($ir_mul_i32(i, 32), $rt_cell_ofs_word(o)), $ir_get_word($undef));
+    }
     return o;
 }
 
 function $rt_cell_visit_gc(o)
 {    
-    $rt_cell_set_next(o, $rt_gcForward(vm, $rt_cell_get_next(o)));
-    $rt_cell_set_word(o, $rt_gcForward(vm, $rt_cell_get_word(o), $rt_cell_get_tag(o)));
+    var t = $ir_load_u8(o, $rt_cell_ofs_tag(o));
+    if ($ir_gt_i32(t, $ir_get_tag($nullptr)))
+    {    
+        var w = $ir_load_u64(o, $rt_cell_ofs_word(o));
+        var fw = $rt_gcForward(vm, w, t);
+        if ($ir_ne_i32(fw, w))
+        {    
+            $ir_store_u64(o, $rt_cell_ofs_word(o), fw);
+        }
+    }
 }
 
 $ir_obj_def_const(this, "$rt_LAYOUT_ARR", 6, false);
@@ -678,27 +965,27 @@ function $rt_arr_ofs_next(o)
 
 function $rt_arr_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_arr_ofs_cap(o)
 {    
-    return $ir_add_i32($ir_add_i32(0, 8), 4);
+    return 12;
 }
 
 function $rt_arr_ofs_shape_idx(o)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4);
+    return 16;
 }
 
 function $rt_arr_ofs_word(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, i));
+    return $ir_add_i32($ir_mul_i32(8, i), 24);
 }
 
 function $rt_arr_ofs_tag(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, $rt_arr_get_cap(o))), $ir_mul_i32(1, i));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, $rt_arr_get_cap(o)), i), 24);
 }
 
 function $rt_arr_get_next(o)
@@ -732,6 +1019,12 @@ function $rt_arr_get_tag(o, i)
 }
 
 function $rt_arr_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_arr_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_arr_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_arr_ofs_next(o), v);
 }
@@ -752,6 +1045,12 @@ function $rt_arr_set_shape_idx(o, v)
 }
 
 function $rt_arr_set_word(o, i, v)
+{    
+    $ir_store_u64(o, $rt_arr_ofs_word(o, i), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_arr_init_word(o, i, v)
 {    
     $ir_store_u64(o, $rt_arr_ofs_word(o, i), v);
 }
@@ -761,9 +1060,39 @@ function $rt_arr_set_tag(o, i, v)
     $ir_store_u8(o, $rt_arr_ofs_tag(o, i), v);
 }
 
+function $rt_arr_fill_word(o, start, count, v)
+{    
+    var ofs = $rt_arr_ofs_word(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u64(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+    $ir_write_barrier(o);
+}
+
+function $rt_arr_copy_word(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_arr_ofs_word(dst, dstIdx), src, $rt_arr_ofs_word(src, srcIdx), $ir_mul_i32(count, 8));
+    $ir_write_barrier(dst);
+}
+
+function $rt_arr_fill_tag(o, start, count, v)
+{    
+    var ofs = $rt_arr_ofs_tag(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_arr_copy_tag(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_arr_ofs_tag(dst, dstIdx), src, $rt_arr_ofs_tag(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
 function $rt_arr_comp_size(cap)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), 4), 4), $ir_mul_i32(8, cap)), $ir_mul_i32(1, cap));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), cap), 24);
 }
 
 function $rt_arr_sizeof(o)
@@ -773,7 +1102,9 @@ function $rt_arr_sizeof(o)
 
 function $rt_arr_alloc(cap)
 {    
-    var o = $ir_alloc_array($rt_arr_comp_size(cap));
+    var o_size = $rt_arr_comp_size(cap);
+    var o = $ir_alloc_array(o_size);
+    $ir_count_alloc(6, 1, o_size);
     $rt_arr_set_cap(o, cap);
     $rt_arr_set_header(o, 6);
     return o;
@@ -781,11 +1112,21 @@ function $rt_arr_alloc(cap)
 
 function $rt_arr_visit_gc(o)
 {    
-    $rt_arr_set_next(o, $rt_gcForward(vm, $rt_arr_get_next(o)));
     var cap = $rt_arr_get_cap(o);
+    var word_ofs = $rt_arr_ofs_word(o, 0);
+    var tag_ofs = $rt_arr_ofs_tag(o, 0);
     for (var i = 0; $ir_lt_i32(i, cap); i = $ir_add_i32(i, 1))
     {    
-        $rt_arr_set_word(o, i, $rt_gcForward(vm, $rt_arr_get_word(o, i), $rt_arr_get_tag(o, i)));
+        var t = $ir_load_u8(o, $ir_add_i32(tag_ofs, i));
+        if ($ir_gt_i32(t, $ir_get_tag($nullptr)))
+        {    
+            var w = $ir_load_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)));
+            var fw = $rt_gcForward(vm, w, t);
+            if ($ir_ne_i32(fw, w))
+            {    
+                $ir_store_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)), fw);
+            }
+        }
     }
 }
 
@@ -798,22 +1139,22 @@ function $rt_arrtbl_ofs_next(o)
 
 function $rt_arrtbl_ofs_header(o)
 {    
-    return $ir_add_i32(0, 8);
+    return 8;
 }
 
 function $rt_arrtbl_ofs_cap(o)
 {    
-    return $ir_add_i32($ir_add_i32(0, 8), 4);
+    return 12;
 }
 
 function $rt_arrtbl_ofs_word(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), $ir_mul_i32(8, i));
+    return $ir_add_i32($ir_mul_i32(8, i), 16);
 }
 
 function $rt_arrtbl_ofs_tag(o, i)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), $ir_mul_i32(8, $rt_arrtbl_get_cap(o))), $ir_mul_i32(1, i));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, $rt_arrtbl_get_cap(o)), i), 16);
 }
 
 function $rt_arrtbl_get_next(o)
@@ -842,6 +1183,12 @@ function $rt_arrtbl_get_tag(o, i)
 }
 
 function $rt_arrtbl_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_arrtbl_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_arrtbl_init_next(o, v)
 {    
     $ir_store_refptr(o, $rt_arrtbl_ofs_next(o), v);
 }
@@ -857,6 +1204,12 @@ function $rt_arrtbl_set_cap(o, v)
 }
 
 function $rt_arrtbl_set_word(o, i, v)
+{    
+    $ir_store_u64(o, $rt_arrtbl_ofs_word(o, i), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_arrtbl_init_word(o, i, v)
 {    
     $ir_store_u64(o, $rt_arrtbl_ofs_word(o, i), v);
 }
@@ -866,9 +1219,39 @@ function $rt_arrtbl_set_tag(o, i, v)
     $ir_store_u8(o, $rt_arrtbl_ofs_tag(o, i), v);
 }
 
+function $rt_arrtbl_fill_word(o, start, count, v)
+{    
+    var ofs = $rt_arrtbl_ofs_word(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u64(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+    $ir_write_barrier(o);
+}
+
+function $rt_arrtbl_copy_word(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_arrtbl_ofs_word(dst, dstIdx), src, $rt_arrtbl_ofs_word(src, srcIdx), $ir_mul_i32(count, 8));
+    $ir_write_barrier(dst);
+}
+
+function $rt_arrtbl_fill_tag(o, start, count, v)
+{    
+    var ofs = $rt_arrtbl_ofs_tag(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_arrtbl_copy_tag(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_arrtbl_ofs_tag(dst, dstIdx), src, $rt_arrtbl_ofs_tag(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
 function $rt_arrtbl_comp_size(cap)
 {    
-    return $ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32($ir_add_i32(0, 8), 4), 4), $ir_mul_i32(8, cap)), $ir_mul_i32(1, cap));
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), cap), 16);
 }
 
 function $rt_arrtbl_sizeof(o)
@@ -878,7 +1261,9 @@ function $rt_arrtbl_sizeof(o)
 
 function $rt_arrtbl_alloc(cap)
 {    
-    var o = $ir_alloc_refptr($rt_arrtbl_comp_size(cap));
+    var o_size = $rt_arrtbl_comp_size(cap);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(7, 1, o_size);
     $rt_arrtbl_set_cap(o, cap);
     $rt_arrtbl_set_header(o, 7);
     return o;
@@ -886,94 +1271,1371 @@ function $rt_arrtbl_alloc(cap)
 
 function $rt_arrtbl_visit_gc(o)
 {    
-    $rt_arrtbl_set_next(o, $rt_gcForward(vm, $rt_arrtbl_get_next(o)));
     var cap = $rt_arrtbl_get_cap(o);
+    var word_ofs = $rt_arrtbl_ofs_word(o, 0);
+    var tag_ofs = $rt_arrtbl_ofs_tag(o, 0);
     for (var i = 0; $ir_lt_i32(i, cap); i = $ir_add_i32(i, 1))
     {    
-        $rt_arrtbl_set_word(o, i, $rt_gcForward(vm, $rt_arrtbl_get_word(o, i), $rt_arrtbl_get_tag(o, i)));
+        var t = $ir_load_u8(o, $ir_add_i32(tag_ofs, i));
+        if ($ir_gt_i32(t, $ir_get_tag($nullptr)))
+        {    
+            var w = $ir_load_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)));
+            var fw = $rt_gcForward(vm, w, t);
+            if ($ir_ne_i32(fw, w))
+            {    
+                $ir_store_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)), fw);
+            }
+        }
     }
 }
 
-function $rt_layout_sizeof(o)
+$ir_obj_def_const(this, "$rt_LAYOUT_TARR", 8, false);
+
+function $rt_tarr_ofs_next(o)
 {    
-    var t = $rt_obj_get_header(o);
-    if ($ir_eq_i32(t, LAYOUT_STR))
-    {    
-        return $rt_str_sizeof(o);
-    }
-    if ($ir_eq_i32(t, LAYOUT_STRTBL))
-    {    
-        return $rt_strtbl_sizeof(o);
-    }
-    if ($ir_eq_i32(t, LAYOUT_ROPE))
-    {    
-        return $rt_rope_sizeof(o);
-    }
-    if ($ir_eq_i32(t, LAYOUT_OBJ))
-    {    
-        return $rt_obj_sizeof(o);
-    }
-    if ($ir_eq_i32(t, LAYOUT_CLOS))
-    {    
-        return $rt_clos_sizeof(o);
-    }
-    if ($ir_eq_i32(t, LAYOUT_CELL))
-    {    
-        return $rt_cell_sizeof(o);
-    }
-    if ($ir_eq_i32(t, LAYOUT_ARR))
-    {    
-        return $rt_arr_sizeof(o);
-    }
-    if ($ir_eq_i32(t, LAYOUT_ARRTBL))
-    {    
-        return $rt_arrtbl_sizeof(o);
-    }
-    $rt_assert(false, "invalid layout in layout_sizeof");
+    return 0;
 }
 
-function $rt_layout_visit_gc(o)
+function $rt_tarr_ofs_header(o)
 {    
-    var t = $rt_obj_get_header(o);
-    if ($ir_eq_i32(t, LAYOUT_STR))
-    {    
-        $rt_str_visit_gc(vm, o);
-        return;
-    }
-    if ($ir_eq_i32(t, LAYOUT_STRTBL))
-    {    
-        $rt_strtbl_visit_gc(vm, o);
-        return;
-    }
-    if ($ir_eq_i32(t, LAYOUT_ROPE))
-    {    
-        $rt_rope_visit_gc(vm, o);
-        return;
-    }
-    if ($ir_eq_i32(t, LAYOUT_OBJ))
-    {    
-        $rt_obj_visit_gc(vm, o);
-        return;
-    }
-    if ($ir_eq_i32(t, LAYOUT_CLOS))
-    {    
-        $rt_clos_visit_gc(vm, o);
-        return;
-    }
-    if ($ir_eq_i32(t, LAYOUT_CELL))
-    {    
-        $rt_cell_visit_gc(vm, o);
-        return;
-    }
-    if ($ir_eq_i32(t, LAYOUT_ARR))
-    {    
-        $rt_arr_visit_gc(vm, o);
-        return;
-    }
-    if ($ir_eq_i32(t, LAYOUT_ARRTBL))
+    return 8;
+}
+
+function $rt_tarr_ofs_cap(o)
+{    
+    return 12;
+}
+
+function $rt_tarr_ofs_shape_idx(o)
+{    
+    return 16;
+}
+
+function $rt_tarr_ofs_word(o, i)
+{    
+    return $ir_add_i32($ir_mul_i32(8, i), 24);
+}
+
+function $rt_tarr_ofs_tag(o, i)
+{    
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, $rt_tarr_get_cap(o)), i), 24);
+}
+
+function $rt_tarr_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_tarr_ofs_next(o));
+}
+
+function $rt_tarr_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_tarr_ofs_header(o));
+}
+
+function $rt_tarr_get_cap(o)
+{    
+    return $ir_load_u32(o, $rt_tarr_ofs_cap(o));
+}
+
+function $rt_tarr_get_shape_idx(o)
+{    
+    return $ir_load_u32(o, $rt_tarr_ofs_shape_idx(o));
+}
+
+function $rt_tarr_get_word(o, i)
+{    
+    return $ir_load_u64(o, $rt_tarr_ofs_word(o, i));
+}
+
+function $rt_tarr_get_tag(o, i)
+{    
+    return $ir_load_u8(o, $rt_tarr_ofs_tag(o, i));
+}
+
+function $rt_tarr_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_tarr_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_tarr_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_tarr_ofs_next(o), v);
+}
+
+function $rt_tarr_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_tarr_ofs_header(o), v);
+}
+
+function $rt_tarr_set_cap(o, v)
+{    
+    $ir_store_u32(o, $rt_tarr_ofs_cap(o), v);
+}
+
+function $rt_tarr_set_shape_idx(o, v)
+{    
+    $ir_store_u32(o, $rt_tarr_ofs_shape_idx(o), v);
+}
+
+function $rt_tarr_set_word(o, i, v)
+{    
+    $ir_store_u64(o, $rt_tarr_ofs_word(o, i), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_tarr_init_word(o, i, v)
+{    
+    $ir_store_u64(o, $rt_tarr_ofs_word(o, i), v);
+}
+
+function $rt_tarr_set_tag(o, i, v)
+{    
+    $ir_store_u8(o, $rt_tarr_ofs_tag(o, i), v);
+}
+
+function $rt_tarr_fill_word(o, start, count, v)
+{    
+    var ofs = $rt_tarr_ofs_word(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u64(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+    $ir_write_barrier(o);
+}
+
+function $rt_tarr_copy_word(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_tarr_ofs_word(dst, dstIdx), src, $rt_tarr_ofs_word(src, srcIdx), $ir_mul_i32(count, 8));
+    $ir_write_barrier(dst);
+}
+
+function $rt_tarr_fill_tag(o, start, count, v)
+{    
+    var ofs = $rt_tarr_ofs_tag(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_tarr_copy_tag(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_tarr_ofs_tag(dst, dstIdx), src, $rt_tarr_ofs_tag(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
+function $rt_tarr_comp_size(cap)
+{    
+    return $ir_add_i32($ir_add_i32($ir_mul_i32(8, cap), cap), 24);
+}
+
+function $rt_tarr_sizeof(o)
+{    
+    return $rt_tarr_comp_size($rt_tarr_get_cap(o));
+}
+
+function $rt_tarr_alloc(cap)
+{    
+    var o_size = $rt_tarr_comp_size(cap);
+    var o = $ir_alloc_object(o_size);
+    $ir_count_alloc(8, 1, o_size);
+    $rt_tarr_set_cap(o, cap);
+    $rt_tarr_set_header(o, 8);
+    return o;
+}
+
+function $rt_tarr_visit_gc(o)
+{    
+    var cap = $rt_tarr_get_cap(o);
+    var word_ofs = $rt_tarr_ofs_word(o, 0);
+    var tag_ofs = $rt_tarr_ofs_tag(o, 0);
+    for (var i = 0; $ir_lt_i32(i, cap); i = $ir_add_i32(i, 1))
+    {    
+        var t = $ir_load_u8(o, $ir_add_i32(tag_ofs, i));
+        if ($ir_gt_i32(t, $ir_get_tag($nullptr)))
+        {    
+            var w = $ir_load_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)));
+            var fw = $rt_gcForward(vm, w, t);
+            if ($ir_ne_i32(fw, w))
+            {    
+                $ir_store_u64(o, $ir_add_i32(word_ofs, $ir_mul_i32(8, i)), fw);
+            }
+        }
+    }
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_F64ARR", 9, false);
+
+function $rt_f64arr_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_f64arr_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_f64arr_ofs_len(o)
+{    
+    return 12;
+}
+
+function $rt_f64arr_ofs_data(o, i)
+{    
+    return $ir_add_i32($ir_mul_i32(8, i), 16);
+}
+
+function $rt_f64arr_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_f64arr_ofs_next(o));
+}
+
+function $rt_f64arr_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_f64arr_ofs_header(o));
+}
+
+function $rt_f64arr_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_f64arr_ofs_len(o));
+}
+
+function $rt_f64arr_get_data(o, i)
+{    
+    return $ir_load_f64(o, $rt_f64arr_ofs_data(o, i));
+}
+
+function $rt_f64arr_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_f64arr_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_f64arr_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_f64arr_ofs_next(o), v);
+}
+
+function $rt_f64arr_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_f64arr_ofs_header(o), v);
+}
+
+function $rt_f64arr_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_f64arr_ofs_len(o), v);
+}
+
+function $rt_f64arr_set_data(o, i, v)
+{    
+    $ir_store_f64(o, $rt_f64arr_ofs_data(o, i), v);
+}
+
+function $rt_f64arr_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_f64arr_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_f64(o, $ir_add_i32(ofs, $ir_mul_i32(i, 8)), v);
+    }
+}
+
+function $rt_f64arr_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_f64arr_ofs_data(dst, dstIdx), src, $rt_f64arr_ofs_data(src, srcIdx), $ir_mul_i32(count, 8));
+}
+
+function $rt_f64arr_comp_size(len)
+{    
+    return $ir_add_i32($ir_mul_i32(8, len), 16);
+}
+
+function $rt_f64arr_sizeof(o)
+{    
+    return $rt_f64arr_comp_size($rt_f64arr_get_len(o));
+}
+
+function $rt_f64arr_alloc(len)
+{    
+    var o_size = $rt_f64arr_comp_size(len);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(9, 1, o_size);
+    $rt_f64arr_set_len(o, len);
+    $rt_f64arr_set_header(o, 9);
+    return o;
+}
+
+function $rt_f64arr_visit_gc(o)
+{
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_I32ARR", 10, false);
+
+function $rt_i32arr_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_i32arr_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_i32arr_ofs_len(o)
+{    
+    return 12;
+}
+
+function $rt_i32arr_ofs_data(o, i)
+{    
+    return $ir_add_i32($ir_mul_i32(4, i), 16);
+}
+
+function $rt_i32arr_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_i32arr_ofs_next(o));
+}
+
+function $rt_i32arr_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_i32arr_ofs_header(o));
+}
+
+function $rt_i32arr_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_i32arr_ofs_len(o));
+}
+
+function $rt_i32arr_get_data(o, i)
+{    
+    return $ir_load_i32(o, $rt_i32arr_ofs_data(o, i));
+}
+
+function $rt_i32arr_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_i32arr_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_i32arr_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_i32arr_ofs_next(o), v);
+}
+
+function $rt_i32arr_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_i32arr_ofs_header(o), v);
+}
+
+function $rt_i32arr_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_i32arr_ofs_len(o), v);
+}
+
+function $rt_i32arr_set_data(o, i, v)
+{    
+    $ir_store_i32(o, $rt_i32arr_ofs_data(o, i), v);
+}
+
+function $rt_i32arr_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_i32arr_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_i32(o, $ir_add_i32(ofs, $ir_mul_i32(i, 4)), v);
+    }
+}
+
+function $rt_i32arr_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_i32arr_ofs_data(dst, dstIdx), src, $rt_i32arr_ofs_data(src, srcIdx), $ir_mul_i32(count, 4));
+}
+
+function $rt_i32arr_comp_size(len)
+{    
+    return $ir_add_i32($ir_mul_i32(4, len), 16);
+}
+
+function $rt_i32arr_sizeof(o)
+{    
+    return $rt_i32arr_comp_size($rt_i32arr_get_len(o));
+}
+
+function $rt_i32arr_alloc(len)
+{    
+    var o_size = $rt_i32arr_comp_size(len);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(10, 1, o_size);
+    $rt_i32arr_set_len(o, len);
+    $rt_i32arr_set_header(o, 10);
+    return o;
+}
+
+function $rt_i32arr_visit_gc(o)
+{
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_U8ARR", 11, false);
+
+function $rt_u8arr_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_u8arr_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_u8arr_ofs_len(o)
+{    
+    return 12;
+}
+
+function $rt_u8arr_ofs_data(o, i)
+{    
+    return $ir_add_i32(i, 16);
+}
+
+function $rt_u8arr_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_u8arr_ofs_next(o));
+}
+
+function $rt_u8arr_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_u8arr_ofs_header(o));
+}
+
+function $rt_u8arr_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_u8arr_ofs_len(o));
+}
+
+function $rt_u8arr_get_data(o, i)
+{    
+    return $ir_load_u8(o, $rt_u8arr_ofs_data(o, i));
+}
+
+function $rt_u8arr_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_u8arr_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_u8arr_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_u8arr_ofs_next(o), v);
+}
+
+function $rt_u8arr_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_u8arr_ofs_header(o), v);
+}
+
+function $rt_u8arr_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_u8arr_ofs_len(o), v);
+}
+
+function $rt_u8arr_set_data(o, i, v)
+{    
+    $ir_store_u8(o, $rt_u8arr_ofs_data(o, i), v);
+}
+
+function $rt_u8arr_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_u8arr_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_u8arr_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_u8arr_ofs_data(dst, dstIdx), src, $rt_u8arr_ofs_data(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
+function $rt_u8arr_comp_size(len)
+{    
+    return $ir_add_i32(len, 16);
+}
+
+function $rt_u8arr_sizeof(o)
+{    
+    return $rt_u8arr_comp_size($rt_u8arr_get_len(o));
+}
+
+function $rt_u8arr_alloc(len)
+{    
+    var o_size = $rt_u8arr_comp_size(len);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(11, 1, o_size);
+    $rt_u8arr_set_len(o, len);
+    $rt_u8arr_set_header(o, 11);
+    return o;
+}
+
+function $rt_u8arr_visit_gc(o)
+{
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_I8ARR", 12, false);
+
+function $rt_i8arr_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_i8arr_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_i8arr_ofs_len(o)
+{    
+    return 12;
+}
+
+function $rt_i8arr_ofs_data(o, i)
+{    
+    return $ir_add_i32(i, 16);
+}
+
+function $rt_i8arr_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_i8arr_ofs_next(o));
+}
+
+function $rt_i8arr_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_i8arr_ofs_header(o));
+}
+
+function $rt_i8arr_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_i8arr_ofs_len(o));
+}
+
+function $rt_i8arr_get_data(o, i)
+{    
+    return $ir_load_i8(o, $rt_i8arr_ofs_data(o, i));
+}
+
+function $rt_i8arr_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_i8arr_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_i8arr_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_i8arr_ofs_next(o), v);
+}
+
+function $rt_i8arr_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_i8arr_ofs_header(o), v);
+}
+
+function $rt_i8arr_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_i8arr_ofs_len(o), v);
+}
+
+function $rt_i8arr_set_data(o, i, v)
+{    
+    $ir_store_i8(o, $rt_i8arr_ofs_data(o, i), v);
+}
+
+function $rt_i8arr_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_i8arr_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_i8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_i8arr_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_i8arr_ofs_data(dst, dstIdx), src, $rt_i8arr_ofs_data(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
+function $rt_i8arr_comp_size(len)
+{    
+    return $ir_add_i32(len, 16);
+}
+
+function $rt_i8arr_sizeof(o)
+{    
+    return $rt_i8arr_comp_size($rt_i8arr_get_len(o));
+}
+
+function $rt_i8arr_alloc(len)
+{    
+    var o_size = $rt_i8arr_comp_size(len);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(12, 1, o_size);
+    $rt_i8arr_set_len(o, len);
+    $rt_i8arr_set_header(o, 12);
+    return o;
+}
+
+function $rt_i8arr_visit_gc(o)
+{
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_U32ARR", 13, false);
+
+function $rt_u32arr_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_u32arr_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_u32arr_ofs_len(o)
+{    
+    return 12;
+}
+
+function $rt_u32arr_ofs_data(o, i)
+{    
+    return $ir_add_i32($ir_mul_i32(4, i), 16);
+}
+
+function $rt_u32arr_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_u32arr_ofs_next(o));
+}
+
+function $rt_u32arr_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_u32arr_ofs_header(o));
+}
+
+function $rt_u32arr_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_u32arr_ofs_len(o));
+}
+
+function $rt_u32arr_get_data(o, i)
+{    
+    return $ir_load_u32(o, $rt_u32arr_ofs_data(o, i));
+}
+
+function $rt_u32arr_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_u32arr_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_u32arr_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_u32arr_ofs_next(o), v);
+}
+
+function $rt_u32arr_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_u32arr_ofs_header(o), v);
+}
+
+function $rt_u32arr_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_u32arr_ofs_len(o), v);
+}
+
+function $rt_u32arr_set_data(o, i, v)
+{    
+    $ir_store_u32(o, $rt_u32arr_ofs_data(o, i), v);
+}
+
+function $rt_u32arr_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_u32arr_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u32(o, $ir_add_i32(ofs, $ir_mul_i32(i, 4)), v);
+    }
+}
+
+function $rt_u32arr_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_u32arr_ofs_data(dst, dstIdx), src, $rt_u32arr_ofs_data(src, srcIdx), $ir_mul_i32(count, 4));
+}
+
+function $rt_u32arr_comp_size(len)
+{    
+    return $ir_add_i32($ir_mul_i32(4, len), 16);
+}
+
+function $rt_u32arr_sizeof(o)
+{    
+    return $rt_u32arr_comp_size($rt_u32arr_get_len(o));
+}
+
+function $rt_u32arr_alloc(len)
+{    
+    var o_size = $rt_u32arr_comp_size(len);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(13, 1, o_size);
+    $rt_u32arr_set_len(o, len);
+    $rt_u32arr_set_header(o, 13);
+    return o;
+}
+
+function $rt_u32arr_visit_gc(o)
+{
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_STR8", 14, false);
+
+function $rt_str8_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_str8_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_str8_ofs_len(o)
+{    
+    return 12;
+}
+
+function $rt_str8_ofs_hash(o)
+{    
+    return 16;
+}
+
+function $rt_str8_ofs_data(o, i)
+{    
+    return $ir_add_i32(i, 20);
+}
+
+function $rt_str8_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_str8_ofs_next(o));
+}
+
+function $rt_str8_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_str8_ofs_header(o));
+}
+
+function $rt_str8_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_str8_ofs_len(o));
+}
+
+function $rt_str8_get_hash(o)
+{    
+    return $ir_load_u32(o, $rt_str8_ofs_hash(o));
+}
+
+function $rt_str8_get_data(o, i)
+{    
+    return $ir_load_u8(o, $rt_str8_ofs_data(o, i));
+}
+
+function $rt_str8_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_str8_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_str8_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_str8_ofs_next(o), v);
+}
+
+function $rt_str8_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_str8_ofs_header(o), v);
+}
+
+function $rt_str8_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_str8_ofs_len(o), v);
+}
+
+function $rt_str8_set_hash(o, v)
+{    
+    $ir_store_u32(o, $rt_str8_ofs_hash(o), v);
+}
+
+function $rt_str8_set_data(o, i, v)
+{    
+    $ir_store_u8(o, $rt_str8_ofs_data(o, i), v);
+}
+
+function $rt_str8_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_str8_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_str8_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_str8_ofs_data(dst, dstIdx), src, $rt_str8_ofs_data(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
+function $rt_str8_comp_size(len)
+{    
+    return $ir_add_i32(len, 20);
+}
+
+function $rt_str8_sizeof(o)
+{    
+    return $rt_str8_comp_size($rt_str8_get_len(o));
+}
+
+function $rt_str8_alloc(len)
+{    
+    var o_size = $rt_str8_comp_size(len);
+    var o = $ir_alloc_string(o_size);
+    $ir_count_alloc(14, 1, o_size);
+    $rt_str8_set_len(o, len);
+    $rt_str8_set_header(o, 14);
+    return o;
+}
+
+function $rt_str8_visit_gc(o)
+{
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_STRBUF", 15, false);
+
+function $rt_strbuf_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_strbuf_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_strbuf_ofs_cap(o)
+{    
+    return 12;
+}
+
+function $rt_strbuf_ofs_len(o)
+{    
+    return 16;
+}
+
+function $rt_strbuf_ofs_wide(o)
+{    
+    return 20;
+}
+
+function $rt_strbuf_ofs_data(o, i)
+{    
+    return $ir_add_i32($ir_mul_i32(2, i), 22);
+}
+
+function $rt_strbuf_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_strbuf_ofs_next(o));
+}
+
+function $rt_strbuf_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_strbuf_ofs_header(o));
+}
+
+function $rt_strbuf_get_cap(o)
+{    
+    return $ir_load_u32(o, $rt_strbuf_ofs_cap(o));
+}
+
+function $rt_strbuf_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_strbuf_ofs_len(o));
+}
+
+function $rt_strbuf_get_wide(o)
+{    
+    return $ir_load_u8(o, $rt_strbuf_ofs_wide(o));
+}
+
+function $rt_strbuf_get_data(o, i)
+{    
+    return $ir_load_u16(o, $rt_strbuf_ofs_data(o, i));
+}
+
+function $rt_strbuf_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_strbuf_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_strbuf_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_strbuf_ofs_next(o), v);
+}
+
+function $rt_strbuf_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_strbuf_ofs_header(o), v);
+}
+
+function $rt_strbuf_set_cap(o, v)
+{    
+    $ir_store_u32(o, $rt_strbuf_ofs_cap(o), v);
+}
+
+function $rt_strbuf_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_strbuf_ofs_len(o), v);
+}
+
+function $rt_strbuf_set_wide(o, v)
+{    
+    $ir_store_u8(o, $rt_strbuf_ofs_wide(o), v);
+}
+
+function $rt_strbuf_set_data(o, i, v)
+{    
+    $ir_store_u16(o, $rt_strbuf_ofs_data(o, i), v);
+}
+
+function $rt_strbuf_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_strbuf_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u16(o, $ir_add_i32(ofs, $ir_mul_i32(i, 2)), v);
+    }
+}
+
+function $rt_strbuf_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_strbuf_ofs_data(dst, dstIdx), src, $rt_strbuf_ofs_data(src, srcIdx), $ir_mul_i32(count, 2));
+}
+
+function $rt_strbuf_comp_size(cap)
+{    
+    return $ir_add_i32($ir_mul_i32(2, cap), 22);
+}
+
+function $rt_strbuf_sizeof(o)
+{    
+    return $rt_strbuf_comp_size($rt_strbuf_get_cap(o));
+}
+
+function $rt_strbuf_alloc(cap)
+{    
+    var o_size = $rt_strbuf_comp_size(cap);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(15, 1, o_size);
+    $rt_strbuf_set_cap(o, cap);
+    $rt_strbuf_set_header(o, 15);
+    return o;
+}
+
+function $rt_strbuf_visit_gc(o)
+{
+}
+
+$ir_obj_def_const(this, "$rt_LAYOUT_FILLER", 16, false);
+
+function $rt_filler_ofs_next(o)
+{    
+    return 0;
+}
+
+function $rt_filler_ofs_header(o)
+{    
+    return 8;
+}
+
+function $rt_filler_ofs_len(o)
+{    
+    return 12;
+}
+
+function $rt_filler_ofs_data(o, i)
+{    
+    return $ir_add_i32(i, 16);
+}
+
+function $rt_filler_get_next(o)
+{    
+    return $ir_load_refptr(o, $rt_filler_ofs_next(o));
+}
+
+function $rt_filler_get_header(o)
+{    
+    return $ir_load_u32(o, $rt_filler_ofs_header(o));
+}
+
+function $rt_filler_get_len(o)
+{    
+    return $ir_load_u32(o, $rt_filler_ofs_len(o));
+}
+
+function $rt_filler_get_data(o, i)
+{    
+    return $ir_load_u8(o, $rt_filler_ofs_data(o, i));
+}
+
+function $rt_filler_set_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_filler_ofs_next(o), v);
+    $ir_write_barrier(o);
+}
+
+function $rt_filler_init_next(o, v)
+{    
+    $ir_store_refptr(o, $rt_filler_ofs_next(o), v);
+}
+
+function $rt_filler_set_header(o, v)
+{    
+    $ir_store_u32(o, $rt_filler_ofs_header(o), v);
+}
+
+function $rt_filler_set_len(o, v)
+{    
+    $ir_store_u32(o, $rt_filler_ofs_len(o), v);
+}
+
+function $rt_filler_set_data(o, i, v)
+{    
+    $ir_store_u8(o, $rt_filler_ofs_data(o, i), v);
+}
+
+function $rt_filler_fill_data(o, start, count, v)
+{    
+    var ofs = $rt_filler_ofs_data(o, start);
+    for (var i = 0; $ir_lt_i32(i, count); i = $ir_add_i32(i, 1))
+    {    
+        $ir_store_u8(o, $ir_add_i32(ofs, $ir_mul_i32(i, 1)), v);
+    }
+}
+
+function $rt_filler_copy_data(dst, dstIdx, src, srcIdx, count)
+{    
+    $ir_memcpy(dst, $rt_filler_ofs_data(dst, dstIdx), src, $rt_filler_ofs_data(src, srcIdx), $ir_mul_i32(count, 1));
+}
+
+function $rt_filler_comp_size(len)
+{    
+    return $ir_add_i32(len, 16);
+}
+
+function $rt_filler_sizeof(o)
+{    
+    return $rt_filler_comp_size($rt_filler_get_len(o));
+}
+
+function $rt_filler_alloc(len)
+{    
+    var o_size = $rt_filler_comp_size(len);
+    var o = $ir_alloc_refptr(o_size);
+    $ir_count_alloc(16, 1, o_size);
+    $rt_filler_set_len(o, len);
+    $rt_filler_set_header(o, 16);
+    return o;
+}
+
+function $rt_filler_visit_gc(o)
+{
+}
+
+function $rt_layout_sizeof(o)
+{    
+    var t = $rt_obj_get_header(o);
+    if ($ir_gt_i32($rt_LAYOUT_TARR, t))
+    {    
+        if ($ir_gt_i32($rt_LAYOUT_CLOS, t))
+        {    
+            if ($ir_gt_i32($rt_LAYOUT_ROPE, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_STRTBL, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_STR))
+                    {    
+                        return $rt_str_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_STRTBL))
+                    {    
+                        return $rt_strtbl_sizeof(o);
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_OBJ, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_ROPE))
+                    {    
+                        return $rt_rope_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_OBJ))
+                    {    
+                        return $rt_obj_sizeof(o);
+                    }
+                }
+            }
+        }else{    
+            if ($ir_gt_i32($rt_LAYOUT_ARR, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_CELL, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_CLOS))
+                    {    
+                        return $rt_clos_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_CELL))
+                    {    
+                        return $rt_cell_sizeof(o);
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_ARRTBL, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_ARR))
+                    {    
+                        return $rt_arr_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_ARRTBL))
+                    {    
+                        return $rt_arrtbl_sizeof(o);
+                    }
+                }
+            }
+        }
+    }else{    
+        if ($ir_gt_i32($rt_LAYOUT_I8ARR, t))
+        {    
+            if ($ir_gt_i32($rt_LAYOUT_I32ARR, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_F64ARR, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_TARR))
+                    {    
+                        return $rt_tarr_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_F64ARR))
+                    {    
+                        return $rt_f64arr_sizeof(o);
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_U8ARR, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_I32ARR))
+                    {    
+                        return $rt_i32arr_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_U8ARR))
+                    {    
+                        return $rt_u8arr_sizeof(o);
+                    }
+                }
+            }
+        }else{    
+            if ($ir_gt_i32($rt_LAYOUT_STR8, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_U32ARR, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_I8ARR))
+                    {    
+                        return $rt_i8arr_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_U32ARR))
+                    {    
+                        return $rt_u32arr_sizeof(o);
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_STRBUF, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_STR8))
+                    {    
+                        return $rt_str8_sizeof(o);
+                    }
+                }else{    
+                    if ($ir_gt_i32($rt_LAYOUT_FILLER, t))
+                    {    
+                        if ($ir_eq_i32(t, $rt_LAYOUT_STRBUF))
+                        {    
+                            return $rt_strbuf_sizeof(o);
+                        }
+                    }else{    
+                        if ($ir_eq_i32(t, $rt_LAYOUT_FILLER))
+                        {    
+                            return $rt_filler_sizeof(o);
+                        }
+                    }
+                }
+            }
+        }
+    }
+    $rt_assert(false, "invalid layout in layout_sizeof");
+}
+
+function $rt_layout_visit_gc(o)
+{    
+    var t = $rt_obj_get_header(o);
+    if ($ir_gt_i32($rt_LAYOUT_TARR, t))
     {    
-        $rt_arrtbl_visit_gc(vm, o);
-        return;
+        if ($ir_gt_i32($rt_LAYOUT_CLOS, t))
+        {    
+            if ($ir_gt_i32($rt_LAYOUT_ROPE, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_STRTBL, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_STR))
+                    {    
+                        return;
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_STRTBL))
+                    {    
+                        $rt_strtbl_visit_gc(vm, o);
+                        return;
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_OBJ, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_ROPE))
+                    {    
+                        $rt_rope_visit_gc(vm, o);
+                        return;
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_OBJ))
+                    {    
+                        $rt_obj_visit_gc(vm, o);
+                        return;
+                    }
+                }
+            }
+        }else{    
+            if ($ir_gt_i32($rt_LAYOUT_ARR, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_CELL, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_CLOS))
+                    {    
+                        $rt_clos_visit_gc(vm, o);
+                        return;
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_CELL))
+                    {    
+                        $rt_cell_visit_gc(vm, o);
+                        return;
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_ARRTBL, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_ARR))
+                    {    
+                        $rt_arr_visit_gc(vm, o);
+                        return;
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_ARRTBL))
+                    {    
+                        $rt_arrtbl_visit_gc(vm, o);
+                        return;
+                    }
+                }
+            }
+        }
+    }else{    
+        if ($ir_gt_i32($rt_LAYOUT_I8ARR, t))
+        {    
+            if ($ir_gt_i32($rt_LAYOUT_I32ARR, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_F64ARR, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_TARR))
+                    {    
+                        $rt_tarr_visit_gc(vm, o);
+                        return;
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_F64ARR))
+                    {    
+                        return;
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_U8ARR, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_I32ARR))
+                    {    
+                        return;
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_U8ARR))
+                    {    
+                        return;
+                    }
+                }
+            }
+        }else{    
+            if ($ir_gt_i32($rt_LAYOUT_STR8, t))
+            {    
+                if ($ir_gt_i32($rt_LAYOUT_U32ARR, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_I8ARR))
+                    {    
+                        return;
+                    }
+                }else{    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_U32ARR))
+                    {    
+                        return;
+                    }
+                }
+            }else{    
+                if ($ir_gt_i32($rt_LAYOUT_STRBUF, t))
+                {    
+                    if ($ir_eq_i32(t, $rt_LAYOUT_STR8))
+                    {    
+                        return;
+                    }
+                }else{    
+                    if ($ir_gt_i32($rt_LAYOUT_FILLER, t))
+                    {    
+                        if ($ir_eq_i32(t, $rt_LAYOUT_STRBUF))
+                        {    
+                            return;
+                        }
+                    }else{    
+                        if ($ir_eq_i32(t, $rt_LAYOUT_FILLER))
+                        {    
+                            return;
+                        }
+                    }
+                }
+            }
+        }
     }
     $rt_assert(false, "invalid layout in layout_visit_gc");
 }
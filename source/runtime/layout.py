@@ -1,12 +1,42 @@
 import sys
 import string
+import zlib
 from copy import deepcopy
+from itertools import permutations
 
 D_OUT_FILE = 'runtime/layout.d'
 JS_OUT_FILE = 'runtime/layout.js'
+PY_OUT_FILE = 'runtime/layout_info.py'
 
 JS_DEF_PREFIX = '$rt_'
 
+# Reorder the fixed-size fields of each layout to minimize padding
+PACK_FIELDS = '--pack' in sys.argv[1:]
+
+# Drop the next pointer from non-object layouts, the header word holds
+# the forwarding pointer during collections instead
+COMPACT_HEADER = '--compact-header' in sys.argv[1:]
+
+# Store heap references held in layout fields as compressed 32-bit
+# offsets from the heap base instead of full 64-bit pointers
+CREF32 = '--cref32' in sys.argv[1:]
+
+# Objects whose size, as computed by the layout size functions, is at
+# least this large are allocated in the non-moving large object space
+# Note: compressed references cannot point outside of the heap, so
+# there is no large object space with compressed references
+LARGE_OBJ_SIZE = 0x7FFFFFFF if CREF32 else 32 * 1024
+
+# Header word marker for forwarded objects (compact headers only)
+# Note: this is never a valid layout id
+FWD_MARK = 0xFFFF
+
+# Element count assumed for variable-size fields in the packing report
+TYPICAL_LEN = 8
+
+# Maximum number of fields to try all orderings of when packing
+MAX_PERMUTE_FIELDS = 7
+
 # Type sizes in bytes
 typeSize = {
     'uint8':1,
@@ -20,6 +50,7 @@ typeSize = {
     'float64':8,
     'rawptr':8,
     'refptr':8,
+    'cref32':4,
     'funptr':8,
     'shapeptr':8,
 }
@@ -36,10 +67,18 @@ typeShortName = {
     'float64':'f64',
     'rawptr':'rawptr',
     'refptr':'refptr',
+    'cref32':'cref',
     'funptr':'funptr',
     'shapeptr':'shapeptr',
 }
 
+# Type of the values read from and written to fields of a given type
+# Note: compressed references are expanded into plain reference pointers
+def valType(type):
+    if type == 'cref32':
+        return 'refptr'
+    return type
+
 # Layout declarations
 layouts = [
 
@@ -74,6 +113,10 @@ layouts = [
 
             # Array of strings
             { 'name':'str', 'tag':'refptr', 'szField':'cap', 'init':'null' },
+
+            # Hash codes of the strings, so that probes can skip slots
+            # without dereferencing the strings
+            { 'name':'hash', 'tag':'uint32', 'szField':'cap', 'init':'0' },
         ]
     },
 
@@ -86,10 +129,15 @@ layouts = [
             # Total length
             { 'name':'len', 'tag':'uint32' },
 
+            # Number of ropes in the chain of left children, including
+            # this one
+            { 'name':'depth', 'tag':'uint32', 'init':'1' },
+
             # Left string (rope or string)
+            # Note: once the rope is flattened, this caches the flat string
             { 'name':'left', 'tag':'refptr' },
 
-            # Right string (always a string)
+            # Right string (always a string), null once flattened
             { 'name':'right', 'tag':'refptr' },
         ]
     },
@@ -132,9 +180,11 @@ layouts = [
     },
 
     # Closure cell
+    # Note: the cells of a function activation are co-allocated
     {
         'name':'cell',
         'tag':'refptr',
+        'coalloc':True,
         'fields':
         [
             # Value word
@@ -171,6 +221,142 @@ layouts = [
             { 'name':"tag", 'tag':"uint8", 'szField':"cap" },
         ]
     },
+
+    # Typed array layout (extends object)
+    # Note: the element table is stored in the first object slot
+    {
+        'name':'tarr',
+        'tag':'object',
+        'extends':'obj',
+        'fields':
+        [
+        ]
+    },
+
+    # Float64 typed array elements (unboxed, no type tags)
+    {
+        'name':'f64arr',
+        'tag':'refptr',
+        'fields':
+        [
+            # Number of elements
+            { 'name':"len" , 'tag':"uint32" },
+
+            # Element values
+            { 'name':"data", 'tag':"float64", 'szField':"len" },
+        ]
+    },
+
+    # Int32 typed array elements (unboxed, no type tags)
+    {
+        'name':'i32arr',
+        'tag':'refptr',
+        'fields':
+        [
+            # Number of elements
+            { 'name':"len" , 'tag':"uint32" },
+
+            # Element values
+            { 'name':"data", 'tag':"int32", 'szField':"len" },
+        ]
+    },
+
+    # Uint8 typed array elements (unboxed, no type tags)
+    {
+        'name':'u8arr',
+        'tag':'refptr',
+        'fields':
+        [
+            # Number of elements
+            { 'name':"len" , 'tag':"uint32" },
+
+            # Element values
+            { 'name':"data", 'tag':"uint8", 'szField':"len" },
+        ]
+    },
+
+    # Int8 typed array elements (unboxed, no type tags)
+    {
+        'name':'i8arr',
+        'tag':'refptr',
+        'fields':
+        [
+            # Number of elements
+            { 'name':"len" , 'tag':"uint32" },
+
+            # Element values
+            { 'name':"data", 'tag':"int8", 'szField':"len" },
+        ]
+    },
+
+    # Uint32 typed array elements (unboxed, no type tags)
+    {
+        'name':'u32arr',
+        'tag':'refptr',
+        'fields':
+        [
+            # Number of elements
+            { 'name':"len" , 'tag':"uint32" },
+
+            # Element values
+            { 'name':"data", 'tag':"uint32", 'szField':"len" },
+        ]
+    },
+
+    # One-byte string layout, for strings whose characters all fit in
+    # 8 bits (Latin-1). The len and hash fields are at the same offsets
+    # as in the UTF-16 string layout, so the str getters work on both.
+    {
+        'name':'str8',
+        'tag':'string',
+        'fields':
+        [
+            # String length
+            { 'name': "len" , 'tag':'uint32' },
+
+            # Hash code
+            { 'name': 'hash', 'tag':'uint32' },
+
+            # Latin-1 character data
+            { 'name': 'data', 'tag':'uint8', 'szField':'len' }
+        ]
+    },
+
+    # String builder, a growable UTF-16 buffer used internally for
+    # repeated appends, converted to a string once complete
+    {
+        'name':'strbuf',
+        'tag':'refptr',
+        'fields':
+        [
+            # Capacity, number of character slots
+            { 'name':'cap', 'tag':'uint32' },
+
+            # Number of characters appended
+            { 'name':'len', 'tag':'uint32', 'init':'0' },
+
+            # Flag set if some character does not fit in 8 bits
+            { 'name':'wide', 'tag':'uint8', 'init':'0' },
+
+            # UTF-16 character data
+            { 'name':'data', 'tag':'uint16', 'szField':'cap' }
+        ]
+    },
+
+    # Filler object, covers the unused tails of the to-space copy
+    # buffers of the parallel collector so the heap remains parseable
+    {
+        'name':'filler',
+        'tag':'refptr',
+        'fields':
+        [
+            # Number of padding bytes
+            { 'name':'len', 'tag':'uint32' },
+
+            # Padding bytes
+            { 'name':'data', 'tag':'uint8', 'szField':'len' }
+        ]
+    },
 ]
 
 # Indent a text string
@@ -223,6 +409,8 @@ class Cst:
             return '$ir_get_word($undef)'
         if self.val == 'undef_type':
             return '$ir_get_tag($undef)'
+        if self.val == 'rawptr_type':
+            return '$ir_get_tag($nullptr)'
 
         return str(self.val)
 
@@ -232,6 +420,8 @@ class Cst:
             return 'UNDEF.word.uint8Val'
         if self.val == 'undef_type':
             return 'Type.CONST'
+        if self.val == 'rawptr_type':
+            return 'Tag.RAWPTR'
 
         return str(self.val)
 
@@ -251,6 +441,18 @@ class ConstDef:
     def genD(self):
         return 'const ' + self.type + ' ' + self.name + ' = ' + str(self.val) + ';'
 
+class ConstRef:
+
+    def __init__(self, type, name):
+        self.type = type
+        self.name = name
+
+    def genJS(self):
+        return JS_DEF_PREFIX + self.name
+
+    def genD(self):
+        return self.name
+
 class Function:
 
     def __init__(self, type, name, params):
@@ -259,7 +461,12 @@ class Function:
         self.params = params
         self.stmts = []
 
+        # Functions only used by the D runtime are not output to JS
+        self.dOnly = False
+
     def genJS(self):
+        if self.dOnly:
+            return None
         out = ''
         out += 'function ' + JS_DEF_PREFIX + self.name + '('
         params = self.params
@@ -372,6 +579,65 @@ class IfStmt:
             out += '\n}'
         return out
 
+class SwitchStmt:
+
+    # If the cases are sorted by increasing value and all return, the JS
+    # output can be a binary search over the case values, since Higgs
+    # lowers a JS switch to a chain of comparisons
+    def __init__(self, expr, cases, defaultStmts = None, sortedReturns = False):
+        self.expr = expr
+        self.cases = cases
+        self.defaultStmts = defaultStmts
+        self.sortedReturns = sortedReturns
+
+    def searchTree(self, cases):
+        if len(cases) == 1:
+            (caseExpr, caseStmts) = cases[0]
+            return IfStmt(EqExpr(self.expr, caseExpr), caseStmts)
+        mid = len(cases) // 2
+        testExpr = GtExpr(cases[mid][0], self.expr)
+        return IfStmt(testExpr, [self.searchTree(cases[:mid])], [self.searchTree(cases[mid:])])
+
+    def genJS(self):
+        if self.sortedReturns:
+            out = self.searchTree(self.cases).genJS()
+            for stmt in (self.defaultStmts or []):
+                out += '\n' + stmt.genJS()
+            return out
+
+        out = 'switch (' + self.expr.genJS() + ')\n'
+        out += '{'
+        stmts = ''
+        for (caseExpr, caseStmts) in self.cases:
+            stmts += '\ncase ' + caseExpr.genJS() + ':'
+            for stmt in caseStmts:
+                stmts += '\n' + stmt.genJS()
+        if self.defaultStmts:
+            stmts += '\ndefault:'
+            for stmt in self.defaultStmts:
+                stmts += '\n' + stmt.genJS()
+        out += indent(stmts)
+        out += '\n}'
+        return out
+
+    def genD(self):
+        out = 'switch (' + self.expr.genD() + ')\n'
+        out += '{'
+        stmts = ''
+        for (caseExpr, caseStmts) in self.cases:
+            stmts += '\ncase ' + caseExpr.genD() + ':'
+            for stmt in caseStmts:
+                stmts += '\n' + stmt.genD()
+        stmts += '\ndefault:'
+        if self.defaultStmts:
+            for stmt in self.defaultStmts:
+                stmts += '\n' + stmt.genD()
+        else:
+            stmts += '\nbreak;'
+        out += indent(stmts)
+        out += '\n}'
+        return out
+
 class AddExpr:
 
     def __init__(self, lExpr, rExpr):
@@ -420,31 +686,68 @@ class EqExpr:
     def genD(self):
         return '(' + self.lExpr.genD() + ' == ' + self.rExpr.genD() + ')'
 
+class NeExpr:
+
+    def __init__(self, lExpr, rExpr):
+        self.lExpr = lExpr
+        self.rExpr = rExpr
+
+    def genJS(self):
+        return '$ir_ne_i32(' + self.lExpr.genJS() + ', ' + self.rExpr.genJS() + ')'
+
+    def genD(self):
+        return '(' + self.lExpr.genD() + ' != ' + self.rExpr.genD() + ')'
+
+class GtExpr:
+
+    def __init__(self, lExpr, rExpr):
+        self.lExpr = lExpr
+        self.rExpr = rExpr
+
+    def genJS(self):
+        return '$ir_gt_i32(' + self.lExpr.genJS() + ', ' + self.rExpr.genJS() + ')'
+
+    def genD(self):
+        return '(' + self.lExpr.genD() + ' > ' + self.rExpr.genD() + ')'
+
+# Heap base compressed references are relative to, outside of collections
+HEAP_BASE = Cst('vm.heapStart')
+
 class LoadExpr:
 
-    def __init__(self, type, ptr, ofs):
+    # The base is only used for compressed references (D only, the
+    # JIT always decompresses relative to the current heap)
+    def __init__(self, type, ptr, ofs, base = HEAP_BASE):
         self.type = type
         self.ptr = ptr
         self.ofs = ofs
+        self.base = base
 
     def genJS(self):
         return '$ir_load_' + typeShortName[self.type] + '(' + self.ptr.genJS() + ', ' + self.ofs.genJS() + ')'
 
     def genD(self):
+        if self.type == 'cref32':
+            load = LoadExpr('uint32', self.ptr, self.ofs).genD()
+            return 'cref_decode(' + self.base.genD() + ', ' + load + ')'
         return '*cast(' + self.type + '*)(' + self.ptr.genD() + ' + ' + self.ofs.genD() + ')'
 
 class StoreExpr:
 
-    def __init__(self, type, ptr, ofs, val):
+    def __init__(self, type, ptr, ofs, val, base = HEAP_BASE):
         self.type = type
         self.ptr = ptr
         self.ofs = ofs
         self.val = val
+        self.base = base
 
     def genJS(self):
         return '$ir_store_' + typeShortName[self.type] + '(' + self.ptr.genJS() + ', ' + self.ofs.genJS() + ', ' + self.val.genJS() + ')'
 
     def genD(self):
+        if self.type == 'cref32':
+            val = Cst('cref_encode(' + self.base.genD() + ', ' + self.val.genD() + ')')
+            return StoreExpr('uint32', self.ptr, self.ofs, val).genD()
         return '*cast(' + self.type + '*)(' + self.ptr.genD() + ' + ' + self.ofs.genD() + ') = ' + self.val.genD()
 
 class AllocExpr:
@@ -459,6 +762,82 @@ class AllocExpr:
     def genD(self):
         return 'vm.heapAlloc(' + self.size.genD() + ')'
 
+class AllocStmt:
+
+    # The layout, if given, has its allocation counters incremented
+    # by the number of objects allocated when statistics are enabled
+    def __init__(self, var, alloc, layout = None, count = None):
+        self.var = var
+        self.alloc = alloc
+        self.layout = layout
+        self.count = count if count else Cst(1)
+
+    # The JIT already compiles $ir_alloc_* into an inline bump allocation
+    # Note: $ir_count_alloc compiles to nothing unless stats are enabled
+    def genJS(self):
+        var = self.var.genJS()
+        size = self.alloc.size
+
+        if self.layout is None:
+            return 'var ' + var + ' = ' + self.alloc.genJS() + ';'
+
+        out = ''
+        if isIntCst(size):
+            sizeStr = size.genJS()
+            out += 'var ' + var + ' = ' + self.alloc.genJS() + ';\n'
+        else:
+            sizeStr = var + '_size'
+            allocExpr = AllocExpr(Var('uint32', sizeStr), self.alloc.tag)
+            out += 'var ' + sizeStr + ' = ' + size.genJS() + ';\n'
+            out += 'var ' + var + ' = ' + allocExpr.genJS() + ';\n'
+
+        out += '$ir_count_alloc(%d, %s, %s);' % (
+            self.layout['typeId'],
+            self.count.genJS(),
+            sizeStr
+        )
+        return out
+
+    # Emit the bump-pointer fast path inline and only call into
+    # vm.heapAlloc when the allocation would exceed the heap limit,
+    # or belongs in the large object space
+    def genD(self):
+        var = self.var.genD()
+        size = self.alloc.size
+
+        out = ''
+        if isIntCst(size):
+            # The allocation pointer is always aligned, so a constant
+            # size can be aligned ahead of time
+            ptrSize = typeSize['rawptr']
+            alignSize = (size.val + ptrSize - 1) & -ptrSize
+            sizeStr = size.genD()
+            bumpStr = 'vm.allocPtr = ' + var + ' + ' + str(alignSize) + ';'
+            limitStr = var + ' + ' + sizeStr + ' > vm.heapLimit'
+            if size.val >= LARGE_OBJ_SIZE:
+                limitStr = 'true'
+        else:
+            sizeStr = var + '_size'
+            bumpStr = 'vm.allocPtr = alignPtr(' + var + ' + ' + sizeStr + ');'
+            out += 'auto ' + sizeStr + ' = ' + size.genD() + ';\n'
+            limitStr = var + ' + ' + sizeStr + ' > vm.heapLimit || ' + sizeStr + ' >= LARGE_OBJ_SIZE'
+
+        out += 'auto ' + var + ' = vm.allocPtr;\n'
+        out += 'if (' + limitStr + ')\n'
+        out += '    ' + var + ' = vm.heapAlloc(' + sizeStr + ');\n'
+        out += 'else\n'
+        out += '    ' + bumpStr
+
+        if self.layout is not None:
+            out += '\nif (opts.stats)\n'
+            out += '    countAlloc(LAYOUT_%s, %s, %s);' % (
+                self.layout['name'].upper(),
+                self.count.genD(),
+                sizeStr
+            )
+
+        return out
+
 class CallExpr:
 
     def __init__(self, fName, args):
@@ -477,6 +856,69 @@ class CallExpr:
         out += ')'
         return out
 
+class FillStmt:
+
+    def __init__(self, type, ptr, ofs, count, val):
+        self.type = type
+        self.ptr = ptr
+        self.ofs = ofs
+        self.count = count
+        self.val = val
+
+    # There is no fill primitive in the IR, store the elements in a loop
+    def genJS(self):
+        loopVar = Var('uint32', 'i')
+        elemOfs = AddExpr(self.ofs, MulExpr(loopVar, Cst(typeSize[self.type])))
+        storeExpr = StoreExpr(self.type, self.ptr, elemOfs, self.val)
+        return ForLoop(loopVar, self.count, [ExprStmt(storeExpr)]).genJS()
+
+    def genD(self):
+        ptr = '(' + self.ptr.genD() + ' + ' + self.ofs.genD() + ')'
+        if typeSize[self.type] == 1:
+            return 'memset(' + ptr + ', ' + self.val.genD() + ', ' + self.count.genD() + ');'
+        if self.type == 'cref32':
+            val = 'cref_encode(' + HEAP_BASE.genD() + ', ' + self.val.genD() + ')'
+            return '(cast(uint32*)' + ptr + ')[0 .. ' + self.count.genD() + '] = ' + val + ';'
+        return '(cast(' + self.type + '*)' + ptr + ')[0 .. ' + self.count.genD() + '] = ' + self.val.genD() + ';'
+
+class CopyStmt:
+
+    def __init__(self, type, dst, dstOfs, src, srcOfs, count):
+        self.type = type
+        self.dst = dst
+        self.dstOfs = dstOfs
+        self.src = src
+        self.srcOfs = srcOfs
+        self.count = count
+
+    def numBytes(self):
+        return MulExpr(self.count, Cst(typeSize[self.type]))
+
+    def genJS(self):
+        args = [self.dst, self.dstOfs, self.src, self.srcOfs, self.numBytes()]
+        return '$ir_memcpy(' + sepList(list(map(lambda a: a.genJS(), args))) + ');'
+
+    # The source and destination may be the same object, so use memmove
+    def genD(self):
+        out = 'memmove('
+        out += self.dst.genD() + ' + ' + self.dstOfs.genD() + ', '
+        out += self.src.genD() + ' + ' + self.srcOfs.genD() + ', '
+        out += self.numBytes().genD() + ');'
+        return out
+
+# Write barrier for the generational collector, marks the card
+# holding the header of an object which had a reference stored into it
+class BarrierStmt:
+
+    def __init__(self, ptr):
+        self.ptr = ptr
+
+    def genJS(self):
+        return '$ir_write_barrier(' + self.ptr.genJS() + ');'
+
+    def genD(self):
+        return 'writeBarrier(' + self.ptr.genD() + ');'
+
 class ForLoop:
 
     def __init__(self, loopVar, endVar, stmts):
@@ -509,6 +951,162 @@ class ForLoop:
         out += '\n}'
         return out
 
+# Test if an expression is an integer constant
+def isIntCst(expr, val = None):
+    if not isinstance(expr, Cst) or not isinstance(expr.val, int):
+        return False
+    return val == None or expr.val == val
+
+# Flatten a tree of additions into a list of terms
+def addTerms(expr):
+    if isinstance(expr, AddExpr):
+        return addTerms(expr.lExpr) + addTerms(expr.rExpr)
+    return [expr]
+
+# Fold constant subexpressions in an expression tree
+def foldExpr(expr):
+
+    if isinstance(expr, AddExpr):
+        terms = addTerms(AddExpr(foldExpr(expr.lExpr), foldExpr(expr.rExpr)))
+
+        # Sum the constant terms, keep the others in order
+        cstSum = 0
+        varTerms = []
+        for term in terms:
+            if isIntCst(term):
+                cstSum += term.val
+            else:
+                varTerms += [term]
+
+        if len(varTerms) == 0:
+            return Cst(cstSum)
+
+        sumExpr = varTerms[0]
+        for term in varTerms[1:]:
+            sumExpr = AddExpr(sumExpr, term)
+        if cstSum != 0:
+            sumExpr = AddExpr(sumExpr, Cst(cstSum))
+        return sumExpr
+
+    if isinstance(expr, MulExpr):
+        lExpr = foldExpr(expr.lExpr)
+        rExpr = foldExpr(expr.rExpr)
+        if isIntCst(lExpr) and isIntCst(rExpr):
+            return Cst(lExpr.val * rExpr.val)
+        if isIntCst(lExpr, 0) or isIntCst(rExpr, 0):
+            return Cst(0)
+        if isIntCst(lExpr, 1):
+            return rExpr
+        if isIntCst(rExpr, 1):
+            return lExpr
+        return MulExpr(lExpr, rExpr)
+
+    if isinstance(expr, AndExpr):
+        lExpr = foldExpr(expr.lExpr)
+        rExpr = foldExpr(expr.rExpr)
+        if isIntCst(lExpr) and isIntCst(rExpr):
+            return Cst(lExpr.val & rExpr.val)
+        return AndExpr(lExpr, rExpr)
+
+    if isinstance(expr, EqExpr) or isinstance(expr, NeExpr) or isinstance(expr, GtExpr):
+        return type(expr)(foldExpr(expr.lExpr), foldExpr(expr.rExpr))
+
+    if isinstance(expr, LoadExpr):
+        return LoadExpr(expr.type, foldExpr(expr.ptr), foldExpr(expr.ofs), expr.base)
+
+    if isinstance(expr, StoreExpr):
+        return StoreExpr(expr.type, foldExpr(expr.ptr), foldExpr(expr.ofs), foldExpr(expr.val), expr.base)
+
+    if isinstance(expr, AllocExpr):
+        return AllocExpr(foldExpr(expr.size), expr.tag)
+
+    if isinstance(expr, CallExpr):
+        return CallExpr(expr.fName, list(map(foldExpr, expr.args)))
+
+    return expr
+
+# Apply a transformation to every expression in a statement list
+def mapStmts(stmts, fn):
+
+    for stmt in stmts:
+
+        if isinstance(stmt, RetStmt):
+            if stmt.expr:
+                stmt.expr = fn(stmt.expr)
+        elif isinstance(stmt, ExprStmt):
+            stmt.expr = fn(stmt.expr)
+        elif isinstance(stmt, DeclStmt):
+            stmt.val = fn(stmt.val)
+        elif isinstance(stmt, AllocStmt):
+            stmt.alloc = fn(stmt.alloc)
+        elif isinstance(stmt, IfStmt):
+            stmt.expr = fn(stmt.expr)
+            mapStmts(stmt.trueStmts, fn)
+            if stmt.falseStmts:
+                mapStmts(stmt.falseStmts, fn)
+        elif isinstance(stmt, SwitchStmt):
+            stmt.expr = fn(stmt.expr)
+            for (caseExpr, caseStmts) in stmt.cases:
+                mapStmts(caseStmts, fn)
+            if stmt.defaultStmts:
+                mapStmts(stmt.defaultStmts, fn)
+        elif isinstance(stmt, ForLoop):
+            mapStmts(stmt.stmts, fn)
+
+# Apply a function to every call expression in an expression tree
+def visitCalls(expr, fn):
+
+    if isinstance(expr, CallExpr):
+        expr.args = list(map(lambda a: visitCalls(a, fn), expr.args))
+        return fn(expr)
+
+    for attr in ['lExpr', 'rExpr', 'ptr', 'ofs', 'val', 'size']:
+        if hasattr(expr, attr) and not isinstance(expr, Cst):
+            setattr(expr, attr, visitCalls(getattr(expr, attr), fn))
+
+    return expr
+
+# Replace repeated field getter calls on the function parameters by
+# a single load into a local variable, declared at the function entry
+def cseGetters(fun):
+
+    paramNames = list(map(lambda p: p.name, fun.params))
+
+    # Count the getter calls with parameter-only arguments
+    counts = {}
+    def countCall(call):
+        if '_get_' in call.fName and \
+           all(map(lambda a: isinstance(a, Var) and a.name in paramNames, call.args)):
+            key = call.genD()
+            counts[key] = counts.get(key, 0) + 1
+        return call
+    mapStmts(fun.stmts, lambda e: visitCalls(e, countCall))
+
+    # Create a local variable for each repeated call
+    locals = {}
+    declStmts = []
+    usedNames = set(paramNames)
+    def replaceCall(call):
+        key = call.genD()
+        if counts.get(key, 0) < 2:
+            return call
+        if key not in locals:
+            name = call.fName[call.fName.index('_get_') + 5:]
+            while name in usedNames:
+                name = name + '_'
+            usedNames.add(name)
+            locals[key] = Var('uint32', name)
+            declStmts.append(DeclStmt(locals[key], call))
+        return locals[key]
+    mapStmts(fun.stmts, lambda e: visitCalls(e, replaceCall))
+
+    fun.stmts = declStmts + fun.stmts
+
+# Simplify the expressions of a generated function
+def simplify(fun):
+    mapStmts(fun.stmts, foldExpr)
+    cseGetters(fun)
+
 # Perform basic validation
 for layout in layouts:
 
@@ -518,6 +1116,14 @@ for layout in layouts:
             if prev['name'] == field['name']:
                 raise Exception('duplicate field name ' + field['name'])
 
+# With compressed references, store the reference fields as 32-bit offsets
+# Note: the next pointer is added below and left uncompressed, because it
+# holds both from-space and to-space pointers during collections
+if CREF32:
+    for layout in layouts:
+        for field in layout['fields']:
+            if field['tag'] == 'refptr':
+                field['tag'] = 'cref32'
 
 # Perform layout extensions
 for layoutIdx, layout in enumerate(layouts):
@@ -551,7 +1157,18 @@ for layout in layouts:
 
     nextField = [{ 'name':'next', 'tag':'refptr', 'init':"null" }]
     typeField = [{ 'name':'header', 'tag':'uint32', 'init':str(layoutId) }]
-    layout['fields'] = nextField + typeField + layout['fields']
+
+    # With compact headers, only objects keep a next pointer, which
+    # points to their overflow slot table
+    if not COMPACT_HEADER:
+        hdrFields = nextField + typeField
+    elif layout['tag'] in ['object', 'array', 'closure']:
+        hdrFields = typeField + nextField
+    else:
+        hdrFields = typeField
+
+    layout['numHdrFields'] = len(hdrFields)
+    layout['fields'] = hdrFields + layout['fields']
 
 # Find/resolve size fields
 for layout in layouts:
@@ -600,24 +1217,39 @@ for layout in layouts:
         if field['tpField'] == None:
             raise Exception('type field "%s" of "%s" not found' % (tpName, field['name']))
 
-# Compute field alignment requirements
+# Find which fields hold heap references the GC must forward
+# Note: the next pointer is skipped, because objects copied into the
+# to-space either have a null next pointer or one to an overflow slot
+# table which gcForward has already forwarded
 for layout in layouts:
 
-    #print('');
-    #print(layout['name'])
+    for field in layout['fields']:
+        isRef = field['tag'] in ['refptr', 'cref32'] or 'tpField' in field
+        field['gcRef'] = isRef and field['name'] != 'next'
+
+        # Stores into reference fields, including the next pointer, go
+        # through the write barrier so that the generational collector
+        # can find old objects pointing into the nursery
+        field['barrier'] = isRef
+
+    # Flag layouts without references, the GC need not visit them
+    layout['hasPtrs'] = any(map(lambda f: f['gcRef'], layout['fields']))
+
+# Compute field alignment requirements
+def computeAlign(fields):
 
     # Current offset since last dynamic alignment
     curOfs = 0
 
     # For each field of this layout
-    for fieldIdx, field in enumerate(layout['fields']):
+    for fieldIdx, field in enumerate(fields):
 
         # Field type size
         fSize = typeSize[field['tag']]
 
         # If the previous field was dynamically sized and of smaller type size
-        if fieldIdx > 0 and 'szField' in layout['fields'][fieldIdx-1] and \
-           typeSize[layout['fields'][fieldIdx-1]['tag']] < fSize:
+        if fieldIdx > 0 and 'szField' in fields[fieldIdx-1] and \
+           typeSize[fields[fieldIdx-1]['tag']] < fSize:
 
             # This field will be dynamically aligned
             field['dynAlign'] = True
@@ -641,19 +1273,225 @@ for layout in layouts:
             # Update the current offset
             curOfs += alignPad + fSize
 
-        #print(field['name'])
-        #print('  fSize: ' + str(fSize))
-        #print('  align: ' + str(field['alignPad']))
+# Compute the allocated size of an instance, with all size fields
+# set to the given element count
+def instSize(fields, numElems):
+
+    fields = deepcopy(fields)
+    computeAlign(fields)
+
+    ptrSize = typeSize['rawptr']
+    size = 0
+
+    for field in fields:
+        if field['dynAlign']:
+            size = (size + ptrSize - 1) & -ptrSize
+        else:
+            size += field['alignPad']
+
+        fSize = typeSize[field['tag']]
+        size += fSize * numElems if 'szField' in field else fSize
+
+    # Allocations are pointer-aligned
+    return (size + ptrSize - 1) & -ptrSize
+
+# Reorder the fixed-size fields of a layout to minimize its size
+def packFields(layout, parent):
+
+    fields = layout['fields']
+
+    # The next and header fields stay in front
+    numKept = layout['numHdrFields']
+
+    # Keep the parent's (already packed) field order as a prefix
+    if parent != None:
+        parentNames = list(map(lambda f: f['name'], parent['fields']))
+        inherited = []
+        for name in parentNames:
+            inherited += [f for f in fields if f['name'] == name]
+        fields = inherited + [f for f in fields if f['name'] not in parentNames]
+        numKept = len(parentNames)
+
+    # Only the run of fixed-size fields after the kept prefix is reordered,
+    # variable-size fields must follow their size fields
+    end = numKept
+    while end < len(fields) and 'szField' not in fields[end]:
+        end += 1
+    prefix = fields[:numKept]
+    region = fields[numKept:end]
+    suffix = fields[end:]
+
+    def cost(order):
+        allFields = prefix + list(order) + suffix
+        return (instSize(allFields, 0), instSize(allFields, TYPICAL_LEN))
+
+    # Try every ordering for small layouts, otherwise sort by decreasing
+    # size. Ties keep the declared order.
+    if len(region) <= MAX_PERMUTE_FIELDS:
+        best = min(permutations(region), key=cost)
+    else:
+        best = sorted(region, key=lambda f: -typeSize[f['tag']])
+        if cost(best) >= cost(region):
+            best = region
+
+    layout['fields'] = prefix + list(best) + suffix
+
+# Reorder fields and report the space saved
+if PACK_FIELDS:
+
+    for layout in layouts:
+
+        parent = None
+        if 'extends' in layout:
+            parent = [l for l in layouts if l['name'] == layout['extends']][0]
+
+        oldFixed = instSize(layout['fields'], 0)
+        oldTypical = instSize(layout['fields'], TYPICAL_LEN)
+
+        packFields(layout, parent)
+
+        newFixed = instSize(layout['fields'], 0)
+        newTypical = instSize(layout['fields'], TYPICAL_LEN)
+
+        print('%-8s fixed: %3d -> %3d bytes (%d saved), len %d: %3d -> %3d bytes (%d saved)' % (
+            layout['name'],
+            oldFixed, newFixed, oldFixed - newFixed,
+            TYPICAL_LEN,
+            oldTypical, newTypical, oldTypical - newTypical
+        ))
+
+for layout in layouts:
+    computeAlign(layout['fields'])
 
 # List of generated functions and declarations
 decls = []
 
+# Flag whether references are compressed, for code outside the layouts
+decls += [ConstDef('bool', 'CREF32', 'true' if CREF32 else 'false')]
+
+# Size threshold of the large object space
+decls += [ConstDef('uint32', 'LARGE_OBJ_SIZE', str(LARGE_OBJ_SIZE))]
+
+def genVisitFun(layout, funName, fwdName, crefBase):
+    """
+    Generate a function visiting the heap references of a layout, passing
+    them through the forwarding function and writing back the results.
+    The compressed references are re-encoded relative to crefBase, or
+    left unchanged if it is None.
+    """
+
+    ofsPref = layout['name'] + '_ofs_';
+    getPref = layout['name'] + '_get_';
+    initPref = layout['name'] + '_init_';
+
+    fun = Function('void', funName, [Var('VM', 'vm'), Var('refptr', 'o')])
+    vmVar = fun.params[0]
+    objVar = fun.params[1]
+
+    for field in layout['fields']:
+
+        # If this is not a heap reference field, skip it
+        if not field['gcRef']:
+            continue
+
+        # If this is a word/type pair
+        # Note: the tags are tested inline so that only words which may
+        # hold references are forwarded, and only moved words are written
+        if 'tpField' in field:
+
+            tpField = field['tpField']
+            wordVar = Var('uint64', 'w')
+            tagVar = Var('uint8', 't')
+            fwdVar = Var('uint64', 'fw')
+
+            # If this is a variable-size field, walk the raw arrays
+            if 'szField' in field:
+                szVar = Var('uint32', field['szField']['name'])
+                wOfsVar = Var('uint32', field['name'] + '_ofs')
+                tOfsVar = Var('uint32', tpField['name'] + '_ofs')
+                fun.stmts += [DeclStmt(szVar, CallExpr(getPref + field['szField']['name'], [objVar]))]
+                fun.stmts += [DeclStmt(wOfsVar, CallExpr(ofsPref + field['name'], [objVar, Cst(0)]))]
+                fun.stmts += [DeclStmt(tOfsVar, CallExpr(ofsPref + tpField['name'], [objVar, Cst(0)]))]
+
+                loopVar = Var('uint32', 'i')
+                wOfs = AddExpr(wOfsVar, MulExpr(Cst(typeSize[field['tag']]), loopVar))
+                tOfs = AddExpr(tOfsVar, MulExpr(Cst(typeSize[tpField['tag']]), loopVar))
+            else:
+                wOfs = CallExpr(ofsPref + field['name'], [objVar])
+                tOfs = CallExpr(ofsPref + tpField['name'], [objVar])
+
+            fwdStmts = [
+                DeclStmt(wordVar, LoadExpr(field['tag'], objVar, wOfs)),
+                DeclStmt(fwdVar, CallExpr(fwdName, [vmVar, wordVar, tagVar])),
+                IfStmt(NeExpr(fwdVar, wordVar), [
+                    ExprStmt(StoreExpr(field['tag'], objVar, wOfs, fwdVar))
+                ])
+            ]
+
+            visitStmts = [
+                DeclStmt(tagVar, LoadExpr(tpField['tag'], objVar, tOfs)),
+                IfStmt(GtExpr(tagVar, Cst('rawptr_type')), fwdStmts)
+            ]
+
+            if 'szField' in field:
+                fun.stmts += [ForLoop(loopVar, szVar, visitStmts)]
+            else:
+                fun.stmts += visitStmts
+
+        # If this is a compressed reference field
+        # Note: the references of a copied object are still relative to
+        # the from-space, they are re-encoded relative to the to-space
+        elif field['tag'] == 'cref32':
+
+            if crefBase is None:
+                continue
+
+            ofsCall = CallExpr(ofsPref + field['name'], [objVar])
+            if 'szField' in field:
+                szVar = Var('uint32', field['szField']['name'])
+                fun.stmts += [DeclStmt(szVar, CallExpr(getPref + field['szField']['name'], [objVar]))]
+                loopVar = Var('uint32', 'i')
+                ofsCall.args += [loopVar]
+
+            loadExpr = LoadExpr(field['tag'], objVar, ofsCall, HEAP_BASE)
+            fwdCall = CallExpr(fwdName, [vmVar, loadExpr])
+            storeStmt = ExprStmt(StoreExpr(field['tag'], objVar, ofsCall, fwdCall, crefBase))
+
+            if 'szField' in field:
+                fun.stmts += [ForLoop(loopVar, szVar, [storeStmt])]
+            else:
+                fun.stmts += [storeStmt]
+
+        # If this is a variable-size field
+        elif 'szField' in field:
+
+            szVar = Var('uint32', field['szField']['name'])
+            szStmt = DeclStmt(szVar, CallExpr(getPref + field['szField']['name'], [objVar]))
+            fun.stmts += [szStmt]
+
+            loopVar = Var('uint32', 'i')
+            getCall = CallExpr(getPref + field['name'], [objVar, loopVar])
+            fwdCall = CallExpr(fwdName, [vmVar, getCall])
+            setCall = CallExpr(initPref + field['name'], [objVar, loopVar, fwdCall])
+            fun.stmts += [ForLoop(loopVar, szVar, [ExprStmt(setCall)])]
+
+        else:
+
+            getCall = CallExpr(getPref + field['name'], [objVar])
+            fwdCall = CallExpr(fwdName, [vmVar, getCall])
+            setCall = CallExpr(initPref + field['name'], [objVar, fwdCall])
+            fun.stmts += [ExprStmt(setCall)]
+
+
+    return fun
+
 # For each layout
 for layout in layouts:
 
     ofsPref = layout['name'] + '_ofs_';
     setPref = layout['name'] + '_set_';
     getPref = layout['name'] + '_get_';
+    initPref = layout['name'] + '_init_';
 
     # Define the layout type constant
     decls += [ConstDef(
@@ -706,7 +1544,7 @@ for layout in layouts:
     # Generate getter methods
     for fieldIdx, field in enumerate(layout['fields']):
 
-        fun = Function(field['tag'], getPref + field['name'], [Var('refptr', 'o')])
+        fun = Function(valType(field['tag']), getPref + field['name'], [Var('refptr', 'o')])
         if 'szField' in field:
             fun.params += [Var('uint32', 'i')]
 
@@ -719,19 +1557,54 @@ for layout in layouts:
         decls += [fun]
 
     # Generate setter methods
+    # Note: reference fields also get a barrier-free initializing setter,
+    # for stores into objects which cannot be older than the value stored
     for fieldIdx, field in enumerate(layout['fields']):
 
-        fun = Function('void', setPref + field['name'], [Var('refptr', 'o')])
-        if 'szField' in field:
-            fun.params += [Var('uint32', 'i')]
-        fun.params += [Var(field['tag'], 'v')]
+        prefixes = [setPref]
+        if field['barrier']:
+            prefixes += [initPref]
 
-        ofsCall = CallExpr(ofsPref + field['name'], [fun.params[0]])
-        if 'szField' in field:
-            ofsCall.args += [fun.params[1]]
+        for prefix in prefixes:
+
+            fun = Function('void', prefix + field['name'], [Var('refptr', 'o')])
+            if 'szField' in field:
+                fun.params += [Var('uint32', 'i')]
+            fun.params += [Var(valType(field['tag']), 'v')]
+
+            ofsCall = CallExpr(ofsPref + field['name'], [fun.params[0]])
+            if 'szField' in field:
+                ofsCall.args += [fun.params[1]]
+
+            fun.stmts += [ExprStmt(StoreExpr(field['tag'], fun.params[0], ofsCall, fun.params[-1]))]
+
+            if field['barrier'] and prefix == setPref:
+                fun.stmts += [BarrierStmt(fun.params[0])]
+
+            decls += [fun]
+
+    # Generate bulk fill and copy methods for variable-size fields
+    for fieldIdx, field in enumerate(layout['fields']):
+
+        if 'szField' not in field:
+            continue
 
-        fun.stmts += [ExprStmt(StoreExpr(field['tag'], fun.params[0], ofsCall, fun.params[-1]))]
+        fun = Function('void', layout['name'] + '_fill_' + field['name'], [Var('refptr', 'o')])
+        fun.params += [Var('uint32', 'start'), Var('uint32', 'count'), Var(valType(field['tag']), 'v')]
+        ofsVar = Var('uint32', 'ofs')
+        fun.stmts += [DeclStmt(ofsVar, CallExpr(ofsPref + field['name'], [fun.params[0], fun.params[1]]))]
+        fun.stmts += [FillStmt(field['tag'], fun.params[0], ofsVar, fun.params[2], fun.params[3])]
+        if field['barrier']:
+            fun.stmts += [BarrierStmt(fun.params[0])]
+        decls += [fun]
 
+        fun = Function('void', layout['name'] + '_copy_' + field['name'], [Var('refptr', 'dst')])
+        fun.params += [Var('uint32', 'dstIdx'), Var('refptr', 'src'), Var('uint32', 'srcIdx'), Var('uint32', 'count')]
+        dstOfs = CallExpr(ofsPref + field['name'], [fun.params[0], fun.params[1]])
+        srcOfs = CallExpr(ofsPref + field['name'], [fun.params[2], fun.params[3]])
+        fun.stmts += [CopyStmt(field['tag'], fun.params[0], dstOfs, fun.params[2], srcOfs, fun.params[4])]
+        if field['barrier']:
+            fun.stmts += [BarrierStmt(fun.params[0])]
         decls += [fun]
 
     # Generate the layout size computation function
@@ -780,11 +1653,15 @@ for layout in layouts:
         szVars[szVar.name] = szVar
         fun.params += [szVar]
 
-    szCall = CallExpr(layout['name'] + '_comp_size', [])
-    for szField in layout['szFields']:
-        szCall.args += [szVars[szField['name']]]
+    # Fixed-size layouts get a constant allocation size
+    if len(layout['szFields']) == 0:
+        szExpr = foldExpr(szSum)
+    else:
+        szExpr = CallExpr(layout['name'] + '_comp_size', [])
+        for szField in layout['szFields']:
+            szExpr.args += [szVars[szField['name']]]
     objVar = Var('refptr', 'o')
-    fun.stmts += [DeclStmt(objVar, AllocExpr(szCall, layout['tag']))]
+    fun.stmts += [AllocStmt(objVar, AllocExpr(szExpr, layout['tag']), layout)]
 
     for szField in layout['szFields']:
         setCall = CallExpr(setPref + szField['name'], [objVar, szVars[szField['name']]])
@@ -805,97 +1682,453 @@ for layout in layouts:
         if initVal == 'undef_type':
             continue
 
-        if 'szField' in field:
-            loopVar = Var('uint32', 'i')
+        # The new object is in the nursery, or freshly placed in the old
+        # space with constant field values, the stores need no barrier
+        if 'szField' in field and field['barrier']:
             szVar = szVars[field['szField']['name']]
-            setCall = CallExpr(setPref + field['name'], [objVar, loopVar, Cst(field['init'])])
-            fun.stmts += [ForLoop(loopVar, szVar, [ExprStmt(setCall)])]
+            ofsVar = Var('uint32', field['name'] + '_ofs')
+            fun.stmts += [DeclStmt(ofsVar, CallExpr(ofsPref + field['name'], [objVar, Cst(0)]))]
+            fun.stmts += [FillStmt(field['tag'], objVar, ofsVar, szVar, Cst(field['init']))]
+        elif 'szField' in field:
+            szVar = szVars[field['szField']['name']]
+            fillCall = CallExpr(layout['name'] + '_fill_' + field['name'], [objVar, Cst(0), szVar, Cst(field['init'])])
+            fun.stmts += [ExprStmt(fillCall)]
         else:
-            setCall = CallExpr(setPref + field['name'], [objVar, Cst(field['init'])])
+            prefix = initPref if field['barrier'] else setPref
+            setCall = CallExpr(prefix + field['name'], [objVar, Cst(field['init'])])
             fun.stmts += [ExprStmt(setCall)]
 
     fun.stmts += [RetStmt(objVar)]
     decls += [fun]
 
-    # Generate the GC visit function
-    fun = Function('void', layout['name'] + '_visit_gc', [Var('VM', 'vm'), Var('refptr', 'o')])
-    vmVar = fun.params[0]
-    objVar = fun.params[1]
+    # Generate the co-allocation function, which allocates several
+    # instances of a fixed-size layout in one contiguous bump. Each
+    # instance keeps its own header, so that they can be referenced,
+    # visited and copied by the GC independently.
+    if layout.get('coalloc', False):
 
-    for field in layout['fields']:
-
-        # If this is not a heap reference field, skip it
-        if field['tag'] != 'refptr' and (not 'tpField' in field):
-            continue
-
-        # If this is a variable-size field
-        if 'szField' in field:
+        assert len(layout['szFields']) == 0
+        ptrSize = typeSize['rawptr']
+        stride = (szExpr.val + ptrSize - 1) & -ptrSize
 
-            szVar = Var('uint32', field['szField']['name'])
-            szStmt = DeclStmt(szVar, CallExpr(getPref + field['szField']['name'], [objVar]))
-            fun.stmts += [szStmt]
+        decls += [ConstDef('uint32', layout['name'].upper() + '_STRIDE', stride)]
 
-            loopVar = Var('uint32', 'i')
+        # Co-allocated blocks must stay below the large object size,
+        # since a large object cannot hold several objects
+        maxNum = (LARGE_OBJ_SIZE - 1) // stride
+        decls += [ConstDef('uint32', layout['name'].upper() + '_MAX_N', maxNum)]
 
-            # If this is a word/type pair
-            if 'tpField' in field:
-                getWCall = CallExpr(getPref + field['name'], [objVar, loopVar])
-                getTCall = CallExpr(getPref + field['tpField']['name'], [objVar, loopVar])
-                fwdCall = CallExpr('gcForward', [vmVar, getWCall, getTCall])
-            else:
-                getCall = CallExpr(getPref + field['name'], [objVar, loopVar])
-                fwdCall = CallExpr('gcForward', [vmVar, getCall])
+        fun = Function('refptr', layout['name'] + '_alloc_n', [Var('VM', 'vm'), Var('uint32', 'n')])
+        numVar = fun.params[1]
+        objVar = Var('refptr', 'o')
+        fun.stmts += [AllocStmt(objVar, AllocExpr(MulExpr(Cst(stride), numVar), layout['tag']), layout, numVar)]
 
-            setCall = CallExpr(setPref + field['name'], [objVar, loopVar, fwdCall])
-            fun.stmts += [ForLoop(loopVar, szVar, [ExprStmt(setCall)])]
+        loopVar = Var('uint32', 'i')
+        initStmts = []
+        for field in layout['fields']:
 
-        else:
+            if 'init' not in field:
+                continue
+            if field['init'] in ['0', 'null', 'undef_type']:
+                continue
 
-            # If this is a word/type pair
-            if 'tpField' in field:
-                getWCall = CallExpr(getPref + field['name'], [objVar])
-                getTCall = CallExpr(getPref + field['tpField']['name'], [objVar])
-                fwdCall = CallExpr('gcForward', [vmVar, getWCall, getTCall])
-            else:
-                getCall = CallExpr(getPref + field['name'], [objVar])
-                fwdCall = CallExpr('gcForward', [vmVar, getCall])
+            ofsExpr = AddExpr(MulExpr(loopVar, Cst(stride)), CallExpr(ofsPref + field['name'], [objVar]))
+            initStmts += [ExprStmt(StoreExpr(field['tag'], objVar, ofsExpr, Cst(field['init'])))]
 
-            setCall = CallExpr(setPref + field['name'], [objVar, fwdCall])
-            fun.stmts += [ExprStmt(setCall)]
+        fun.stmts += [ForLoop(loopVar, numVar, initStmts)]
+        fun.stmts += [RetStmt(objVar)]
+        decls += [fun]
 
+    # Generate the GC visit function
+    # Note: the object visited is a to-space copy, the barrier-free
+    # setters are used to write back the forwarded references
+    decls += [genVisitFun(layout, layout['name'] + '_visit_gc', 'gcForward', Cst('vm.toStart'))]
+
+    # Generate the heap image relocation function (D only)
+    # Note: compressed references are offsets from the heap base,
+    # they remain valid when the heap is relocated
+    fun = genVisitFun(layout, layout['name'] + '_visit_reloc', 'imageReloc', None)
+    fun.dOnly = True
     decls += [fun]
 
+
 # Generate the sizeof dispatch method
+# Note: the dispatch is a switch over the dense layout ids, which the
+# D compiler lowers to a jump table instead of a chain of comparisons.
+# The JS output is a binary search over the layout ids instead.
 fun = Function('uint32', 'layout_sizeof', [Var('refptr', 'o')])
 
 typeVar = Var('uint32', 't')
 fun.stmts += [DeclStmt(typeVar, CallExpr('obj_get_header', [fun.params[0]]))]
 
+cases = []
 for layout in layouts:
-    cmpExpr = EqExpr(typeVar, Var('uint32', 'LAYOUT_' + layout['name'].upper()))
+    idConst = ConstRef('uint32', 'LAYOUT_' + layout['name'].upper())
     retStmt = RetStmt(CallExpr(layout['name'] + '_sizeof', [fun.params[0]]))
-    fun.stmts += [IfStmt(cmpExpr, [retStmt])]
+    cases += [(idConst, [retStmt])]
 
-fun.stmts += [ExprStmt(CallExpr('assert', [Cst('false'), Cst('"invalid layout in layout_sizeof"')]))]
+assertStmt = ExprStmt(CallExpr('assert', [Cst('false'), Cst('"invalid layout in layout_sizeof"')]))
+fun.stmts += [SwitchStmt(typeVar, cases, [assertStmt], True)]
 
 decls += [fun]
 
-# Generate the GC visit dispatch method
-fun = Function('void', 'layout_visit_gc', [Var('VM', 'vm'), Var('refptr', 'o')])
+def genVisitDispatch(suffix):
+    """
+    Generate a method dispatching to the visit functions of each layout
+    """
 
-typeVar = Var('uint32', 't')
-fun.stmts += [DeclStmt(typeVar, CallExpr('obj_get_header', [fun.params[1]]))]
+    funName = 'layout_visit_' + suffix
+    fun = Function('void', funName, [Var('VM', 'vm'), Var('refptr', 'o')])
 
-for layout in layouts:
-    cmpExpr = EqExpr(typeVar, Var('uint32', 'LAYOUT_' + layout['name'].upper()))
-    callStmt = ExprStmt(CallExpr(layout['name'] + '_visit_gc', [fun.params[0], fun.params[1]]))
-    retStmt = RetStmt()
-    fun.stmts += [IfStmt(cmpExpr, [callStmt, retStmt])]
+    typeVar = Var('uint32', 't')
+    fun.stmts += [DeclStmt(typeVar, CallExpr('obj_get_header', [fun.params[1]]))]
+
+    cases = []
+    for layout in layouts:
+        idConst = ConstRef('uint32', 'LAYOUT_' + layout['name'].upper())
+        retStmt = RetStmt()
+        if not layout['hasPtrs']:
+            cases += [(idConst, [retStmt])]
+            continue
+        callStmt = ExprStmt(CallExpr(layout['name'] + '_visit_' + suffix, [fun.params[0], fun.params[1]]))
+        cases += [(idConst, [callStmt, retStmt])]
+
+    assertStmt = ExprStmt(CallExpr('assert', [Cst('false'), Cst('"invalid layout in ' + funName + '"')]))
+    fun.stmts += [SwitchStmt(typeVar, cases, [assertStmt], True)]
 
-fun.stmts += [ExprStmt(CallExpr('assert', [Cst('false'), Cst('"invalid layout in layout_visit_gc"')]))]
+    return fun
 
+# Generate the GC visit dispatch method
+decls += [genVisitDispatch('gc')]
+
+# Generate the heap image relocation dispatch method (D only)
+fun = genVisitDispatch('reloc')
+fun.dOnly = True
 decls += [fun]
 
+# Simplify the generated functions before code generation
+for decl in decls:
+    if isinstance(decl, Function):
+        simplify(decl)
+
+# Generate the D functions to read and write forwarding pointers
+def genFwdFuns():
+
+    out = ''
+    out += 'const bool COMPACT_HEADER = %s;\n' % ('true' if COMPACT_HEADER else 'false')
+    out += '\n'
+
+    if not COMPACT_HEADER:
+        out += '/// Get the forwarding pointer of a from-space object\n'
+        out += '/// Note: for objects, this may be an overflow slot table pointer\n'
+        out += 'refptr layout_get_fwd(refptr o)\n'
+        out += '{\n'
+        out += '    return obj_get_next(o);\n'
+        out += '}\n'
+        out += '\n'
+        out += '/// Set the forwarding pointer of a from-space object\n'
+        out += 'void layout_set_fwd(refptr o, refptr p)\n'
+        out += '{\n'
+        out += '    obj_init_next(o, p);\n'
+        out += '}\n'
+        out += '\n'
+        out += '/// Forwarding word of an object being copied by a parallel collector thread\n'
+        out += 'const uint64 FWD_BUSY = 1;\n'
+        out += '\n'
+        out += '/// Get the address of the word holding the forwarding pointer\n'
+        out += 'uint64* layout_fwd_addr(refptr o)\n'
+        out += '{\n'
+        out += '    return cast(uint64*)(o + obj_ofs_next(o));\n'
+        out += '}\n'
+        out += '\n'
+        out += '/// Encode a forwarding pointer as a forwarding word\n'
+        out += 'uint64 layout_fwd_encode(refptr p)\n'
+        out += '{\n'
+        out += '    return cast(uint64)p;\n'
+        out += '}\n'
+        out += '\n'
+        out += '/// Decode a forwarding word\n'
+        out += 'refptr layout_fwd_decode(uint64 word)\n'
+        out += '{\n'
+        out += '    return cast(refptr)word;\n'
+        out += '}\n'
+        return out
+
+    out += '/// Header word marker for forwarded objects, never a valid layout id\n'
+    out += 'const uint64 FWD_MARK = 0x%X;\n' % FWD_MARK
+    out += '\n'
+    out += '/// Get the forwarding pointer of a from-space object, null if the\n'
+    out += '/// object was not copied. The pointer is stored over the first word\n'
+    out += '/// of the object, shifted above the marker.\n'
+    out += 'refptr layout_get_fwd(refptr o)\n'
+    out += '{\n'
+    out += '    return layout_fwd_decode(*cast(uint64*)o);\n'
+    out += '}\n'
+    out += '\n'
+    out += '/// Set the forwarding pointer of a from-space object\n'
+    out += '/// Note: this clobbers the first word, the object must be copied first\n'
+    out += 'void layout_set_fwd(refptr o, refptr p)\n'
+    out += '{\n'
+    out += '    assert ((cast(uint64)p >> 48) == 0, "pointer too wide for header");\n'
+    out += '    *cast(uint64*)o = layout_fwd_encode(p);\n'
+    out += '}\n'
+    out += '\n'
+    out += '/// Forwarding word of an object being copied by a parallel collector\n'
+    out += '/// thread, the marker with a null pointer\n'
+    out += 'const uint64 FWD_BUSY = FWD_MARK;\n'
+    out += '\n'
+    out += '/// Get the address of the word holding the forwarding pointer\n'
+    out += 'uint64* layout_fwd_addr(refptr o)\n'
+    out += '{\n'
+    out += '    return cast(uint64*)o;\n'
+    out += '}\n'
+    out += '\n'
+    out += '/// Encode a forwarding pointer as a forwarding word\n'
+    out += 'uint64 layout_fwd_encode(refptr p)\n'
+    out += '{\n'
+    out += '    return (cast(uint64)p << 16) | FWD_MARK;\n'
+    out += '}\n'
+    out += '\n'
+    out += '/// Decode a forwarding word, null if the object was not copied\n'
+    out += 'refptr layout_fwd_decode(uint64 word)\n'
+    out += '{\n'
+    out += '    if ((word & FWD_MARK) != FWD_MARK)\n'
+    out += '        return null;\n'
+    out += '    return cast(refptr)(word >> 16);\n'
+    out += '}\n'
+    return out
+
+# Generate the D functions to compress and decompress heap references
+# Note: allocations are aligned on 8 bytes, so the offsets are stored
+# divided by 8, biased by one so that zero encodes the null reference
+def genCRefFuns():
+
+    out = ''
+    out += '/// Compress a heap reference into a 32-bit offset from a heap base\n'
+    out += 'uint32 cref_encode(ubyte* base, refptr p)\n'
+    out += '{\n'
+    out += '    if (p is null)\n'
+    out += '        return 0;\n'
+    out += '    assert (\n'
+    out += '        p >= base && ((p - base) >> 3) < uint32.max,\n'
+    out += '        "reference out of compressed range"\n'
+    out += '    );\n'
+    out += '    return cast(uint32)((p - base) >> 3) + 1;\n'
+    out += '}\n'
+    out += '\n'
+    out += '/// Decompress a 32-bit offset from a heap base into a heap reference\n'
+    out += 'refptr cref_decode(ubyte* base, uint32 c)\n'
+    out += '{\n'
+    out += '    if (c == 0)\n'
+    out += '        return null;\n'
+    out += '    return base + (cast(size_t)(c - 1) << 3);\n'
+    out += '}\n'
+    return out
+
+# Generate the static layout metadata tables (D only)
+# These describe each layout's fields so that the GC can scan objects
+# with a single table-driven loop instead of per-layout visit functions
+def layoutTable():
+    """
+    Compute the layout metadata, indexed by layout id. This is the
+    table the GC walks objects with, and which heap dumps are decoded with.
+    """
+
+    table = []
+
+    for layout in layouts:
+
+        fields = layout['fields']
+
+        # Compute the static offsets of the fixed-size prefix fields
+        curOfs = 0
+        firstVar = len(fields)
+        fieldOfs = [0] * len(fields)
+        for fieldIdx, field in enumerate(fields):
+            if 'szField' in field:
+                firstVar = fieldIdx
+                break
+            curOfs += field['alignPad']
+            fieldOfs[fieldIdx] = curOfs
+            curOfs += typeSize[field['tag']]
+        hdrSize = curOfs
+
+        fieldInfos = []
+        for fieldIdx, field in enumerate(fields):
+
+            szIdx = -1
+            if 'szField' in field:
+                if field['szField']['tag'] != 'uint32':
+                    raise Exception('size field "%s" must be uint32' % field['szField']['name'])
+                szIdx = fields.index(field['szField'])
+
+            tpIdx = -1
+            if 'tpField' in field:
+                tpIdx = fields.index(field['tpField'])
+
+            fieldInfos += [{
+                'name': field['name'],
+                'type': field['tag'],
+                'ofs': fieldOfs[fieldIdx],
+                'elemSize': typeSize[field['tag']],
+                'alignPad': field['alignPad'],
+                'dynAlign': field['dynAlign'],
+                'szField': szIdx,
+                'tpField': tpIdx,
+                'isRef': field['gcRef'] and field['tag'] == 'refptr',
+                'isCRef': field['gcRef'] and field['tag'] == 'cref32'
+            }]
+
+        table += [{
+            'name': layout['name'],
+            'hdrSize': hdrSize,
+            'firstVar': firstVar,
+            'hasPtrs': layout['hasPtrs'],
+            'fields': fieldInfos
+        }]
+
+    return table
+
+def layoutHash(table):
+    """
+    Hash of the layout metadata and object encoding options, recorded
+    in heap dumps so that they are only decoded with matching metadata
+    """
+
+    return zlib.crc32(repr((table, CREF32, COMPACT_HEADER)).encode()) & 0xFFFFFFFF
+
+def genLayoutInfo():
+
+    table = layoutTable()
+    maxFields = max(map(lambda l: len(l['fields']), layouts))
+
+    out = ''
+    out += genFwdFuns()
+    out += '\n'
+    out += genCRefFuns()
+    out += '\n'
+    out += 'const uint32 NUM_LAYOUTS = %d;\n' % len(layouts)
+    out += 'const uint32 LAYOUT_HASH = 0x%08X;\n' % layoutHash(table)
+    out += 'const uint32 MAX_LAYOUT_FIELDS = %d;\n' % maxFields
+    out += '\n'
+    out += '/// Layout names, indexed by layout id\n'
+    out += 'immutable string[NUM_LAYOUTS] layoutNames = [\n'
+    for layout in layouts:
+        out += '    "%s",\n' % layout['name']
+    out += '];\n'
+    out += '\n'
+    out += '/// Layout field descriptor\n'
+    out += 'struct FieldInfo\n'
+    out += '{\n'
+    out += '    /// Static offset, for fields before the first array field\n'
+    out += '    uint32 ofs;\n'
+    out += '\n'
+    out += '    /// Element size in bytes\n'
+    out += '    uint32 elemSize;\n'
+    out += '\n'
+    out += '    /// Alignment padding inserted before the field\n'
+    out += '    uint8 alignPad;\n'
+    out += '\n'
+    out += '    /// The field is dynamically aligned on the pointer size\n'
+    out += '    bool dynAlign;\n'
+    out += '\n'
+    out += '    /// Index of the (uint32) size field, -1 if not an array\n'
+    out += '    int8 szField;\n'
+    out += '\n'
+    out += '    /// Index of the type tag field for word/tag pairs, -1 if none\n'
+    out += '    int8 tpField;\n'
+    out += '\n'
+    out += '    /// The field holds heap references\n'
+    out += '    bool isRef;\n'
+    out += '\n'
+    out += '    /// The field holds compressed heap references\n'
+    out += '    bool isCRef;\n'
+    out += '}\n'
+    out += '\n'
+    out += '/// Layout metadata, indexed by layout id\n'
+    out += 'struct LayoutInfo\n'
+    out += '{\n'
+    out += '    /// Size of the fixed-size prefix of the layout\n'
+    out += '    uint32 hdrSize;\n'
+    out += '\n'
+    out += '    /// Index of the first array field, numFields if none\n'
+    out += '    uint32 firstVar;\n'
+    out += '\n'
+    out += '    /// The layout holds heap references, false if the GC can skip it\n'
+    out += '    bool hasPtrs;\n'
+    out += '\n'
+    out += '    /// Number of fields\n'
+    out += '    uint32 numFields;\n'
+    out += '\n'
+    out += '    /// Field descriptors\n'
+    out += '    FieldInfo[MAX_LAYOUT_FIELDS] fields;\n'
+    out += '}\n'
+    out += '\n'
+    out += 'immutable LayoutInfo[NUM_LAYOUTS] layoutInfo = [\n'
+
+    for info in table:
+
+        fieldStrs = []
+        for field in info['fields']:
+            fieldStrs += ['FieldInfo(%d, %d, %d, %s, %d, %d, %s, %s)' % (
+                field['ofs'],
+                field['elemSize'],
+                field['alignPad'],
+                'true' if field['dynAlign'] else 'false',
+                field['szField'],
+                field['tpField'],
+                'true' if field['isRef'] else 'false',
+                'true' if field['isCRef'] else 'false'
+            )]
+
+        fieldStrs += ['FieldInfo.init'] * (maxFields - len(info['fields']))
+
+        out += '    // ' + info['name'] + '\n'
+        out += '    LayoutInfo(%d, %d, %s, %d, [\n' % (
+            info['hdrSize'],
+            info['firstVar'],
+            'true' if info['hasPtrs'] else 'false',
+            len(info['fields'])
+        )
+        for fieldStr in fieldStrs:
+            out += '        ' + fieldStr + ',\n'
+        out += '    ]),\n'
+
+    out += '];'
+
+    return out
+
+def genPyLayoutInfo():
+
+    table = layoutTable()
+
+    out = ''
+    out += 'CREF32 = %s\n' % CREF32
+    out += 'COMPACT_HEADER = %s\n' % COMPACT_HEADER
+    out += 'LAYOUT_HASH = 0x%08X\n' % layoutHash(table)
+    out += '\n'
+    out += '# Layout metadata, indexed by layout id, see layoutInfo in layout.d\n'
+    out += 'layouts = [\n'
+
+    for info in table:
+        out += '    {\n'
+        out += '        \'name\': %r,\n' % info['name']
+        out += '        \'hdrSize\': %d,\n' % info['hdrSize']
+        out += '        \'firstVar\': %d,\n' % info['firstVar']
+        out += '        \'hasPtrs\': %s,\n' % info['hasPtrs']
+        out += '        \'fields\': [\n'
+        for field in info['fields']:
+            out += '            {\n'
+            for key in ['name', 'type', 'ofs', 'elemSize', 'alignPad', 'dynAlign', 'szField', 'tpField', 'isRef', 'isCRef']:
+                out += '                %r: %r,\n' % (key, field[key])
+            out += '            },\n'
+        out += '        ]\n'
+        out += '    },\n'
+
+    out += ']\n'
+
+    return out
+
 # Open the output files for writing
 DFile = open(D_OUT_FILE, 'w')
 JSFile = open(JS_OUT_FILE, 'w')
@@ -912,6 +2145,11 @@ DFile.write('module runtime.layout;\n')
 DFile.write('\n');
 DFile.write('import runtime.vm;\n')
 DFile.write('import runtime.gc;\n')
+DFile.write('import runtime.image;\n')
+DFile.write('import util.misc;\n')
+DFile.write('import options;\n')
+DFile.write('import stats;\n')
+DFile.write('import core.stdc.string;\n')
 DFile.write('\n');
 
 DFile.write('alias ubyte* funptr;\n');
@@ -932,9 +2170,19 @@ DFile.write('\n');
 # Output D and JS code, write to file
 for decl in decls:
 
-    JSFile.write(decl.genJS() + '\n\n')
+    jsCode = decl.genJS()
+    if jsCode is not None:
+        JSFile.write(jsCode + '\n\n')
     DFile.write(decl.genD() + '\n\n')
 
+DFile.write(genLayoutInfo() + '\n')
+
 DFile.close()
 JSFile.close()
 
+# The heap dump decoder imports the layout metadata as a Python module
+PyFile = open(PY_OUT_FILE, 'w')
+PyFile.write(comment.replace('//', '#'))
+PyFile.write(genPyLayoutInfo())
+PyFile.close()
+
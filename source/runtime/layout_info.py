@@ -0,0 +1,1191 @@
+#
+# Code auto-generated from "runtime/layout.py". Do not modify.
+#
+
+CREF32 = False
+COMPACT_HEADER = False
+LAYOUT_HASH = 0xA597A63B
+
+# Layout metadata, indexed by layout id, see layoutInfo in layout.d
+layouts = [
+    {
+        'name': 'str',
+        'hdrSize': 20,
+        'firstVar': 4,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'hash',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'uint16',
+                'ofs': 0,
+                'elemSize': 2,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'strtbl',
+        'hdrSize': 20,
+        'firstVar': 4,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cap',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'num_strs',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'str',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 4,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': True,
+                'isCRef': False,
+            },
+            {
+                'name': 'hash',
+                'type': 'uint32',
+                'ofs': 0,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'rope',
+        'hdrSize': 40,
+        'firstVar': 6,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'depth',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'left',
+                'type': 'refptr',
+                'ofs': 24,
+                'elemSize': 8,
+                'alignPad': 4,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': True,
+                'isCRef': False,
+            },
+            {
+                'name': 'right',
+                'type': 'refptr',
+                'ofs': 32,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': True,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'obj',
+        'hdrSize': 20,
+        'firstVar': 4,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cap',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'shape_idx',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'word',
+                'type': 'uint64',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 4,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': 5,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'tag',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'clos',
+        'hdrSize': 20,
+        'firstVar': 4,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cap',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'shape_idx',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'word',
+                'type': 'uint64',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 4,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': 5,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'tag',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'num_cells',
+                'type': 'uint32',
+                'ofs': 0,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': True,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cell',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 6,
+                'tpField': -1,
+                'isRef': True,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'cell',
+        'hdrSize': 25,
+        'firstVar': 4,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'word',
+                'type': 'uint64',
+                'ofs': 16,
+                'elemSize': 8,
+                'alignPad': 4,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': 3,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'tag',
+                'type': 'uint8',
+                'ofs': 24,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'arr',
+        'hdrSize': 20,
+        'firstVar': 4,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cap',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'shape_idx',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'word',
+                'type': 'uint64',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 4,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': 5,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'tag',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'arrtbl',
+        'hdrSize': 16,
+        'firstVar': 3,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cap',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'word',
+                'type': 'uint64',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': 4,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'tag',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'tarr',
+        'hdrSize': 20,
+        'firstVar': 4,
+        'hasPtrs': True,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cap',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'shape_idx',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'word',
+                'type': 'uint64',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 4,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': 5,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'tag',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'f64arr',
+        'hdrSize': 16,
+        'firstVar': 3,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'float64',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'i32arr',
+        'hdrSize': 16,
+        'firstVar': 3,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'int32',
+                'ofs': 0,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'u8arr',
+        'hdrSize': 16,
+        'firstVar': 3,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'i8arr',
+        'hdrSize': 16,
+        'firstVar': 3,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'int8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'u32arr',
+        'hdrSize': 16,
+        'firstVar': 3,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'uint32',
+                'ofs': 0,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'str8',
+        'hdrSize': 20,
+        'firstVar': 4,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'hash',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'strbuf',
+        'hdrSize': 21,
+        'firstVar': 5,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'cap',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 16,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'wide',
+                'type': 'uint8',
+                'ofs': 20,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'uint16',
+                'ofs': 0,
+                'elemSize': 2,
+                'alignPad': 1,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+    {
+        'name': 'filler',
+        'hdrSize': 16,
+        'firstVar': 3,
+        'hasPtrs': False,
+        'fields': [
+            {
+                'name': 'next',
+                'type': 'refptr',
+                'ofs': 0,
+                'elemSize': 8,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'header',
+                'type': 'uint32',
+                'ofs': 8,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'len',
+                'type': 'uint32',
+                'ofs': 12,
+                'elemSize': 4,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': -1,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+            {
+                'name': 'data',
+                'type': 'uint8',
+                'ofs': 0,
+                'elemSize': 1,
+                'alignPad': 0,
+                'dynAlign': False,
+                'szField': 2,
+                'tpField': -1,
+                'isRef': False,
+                'isCRef': False,
+            },
+        ]
+    },
+]
@@ -166,6 +166,27 @@ function $rt_makeClosCell()
     return cell;
 }
 
+/**
+Allocate the closure cells of a function activation in one contiguous
+block. Returns the first cell, the others follow it at a fixed stride.
+*/
+function $rt_makeClosCells(numCells)
+{
+    var cells = $rt_cell_alloc_n(numCells);
+    return cells;
+}
+
+/**
+Get a cell out of a block of co-allocated cells, given its byte offset
+Note: this must be done before the next allocation, since the GC
+moves each cell separately and does not keep the block together
+*/
+function $rt_getClosCell(cells, cellOfs)
+{
+    var cellPtr = $ir_add_ptr_i32(cells, cellOfs);
+    return $ir_make_value($ir_get_word(cellPtr), $ir_get_tag(cells));
+}
+
 /**
 Set the value stored in a closure cell
 */
@@ -191,6 +212,70 @@ function $rt_getCellVal(cell)
     return $ir_make_value(word, type);
 }
 
+/**
+Test if a string object uses the one-byte (Latin-1) layout
+*/
+function $rt_isNarrowStr(str)
+{
+    return $ir_eq_i32($rt_str_get_header(str), $rt_LAYOUT_STR8);
+}
+
+/**
+Get the character code at a given index of a string object
+*/
+function $rt_strGetChar(str, idx)
+{
+    if ($rt_isNarrowStr(str))
+        return $rt_str8_get_data(str, idx);
+
+    return $rt_str_get_data(str, idx);
+}
+
+/**
+Get the string object for a single character code
+*/
+function $rt_charToStr(ch)
+{
+    if ($ir_lt_i32(ch, 256))
+    {
+        var str = $rt_str8_alloc(1);
+        $rt_str8_set_data(str, 0, ch);
+    }
+    else
+    {
+        var str = $rt_str_alloc(1);
+        $rt_str_set_data(str, 0, ch);
+    }
+
+    return $ir_get_str(str);
+}
+
+/**
+Copy the characters of a string object into another string object. The
+characters of a one-byte string are widened if the destination is a
+UTF-16 string.
+*/
+function $rt_strCopyChars(dstStr, dstIdx, srcStr, len)
+{
+    if (!$rt_isNarrowStr(srcStr))
+    {
+        $rt_str_copy_data(dstStr, dstIdx, srcStr, 0, len);
+        return;
+    }
+
+    if ($rt_isNarrowStr(dstStr))
+    {
+        $rt_str8_copy_data(dstStr, dstIdx, srcStr, 0, len);
+        return;
+    }
+
+    for (var i = 0; $ir_lt_i32(i, len); i = $ir_add_i32(i, 1))
+    {
+        var ch = $rt_str8_get_data(srcStr, i);
+        $rt_str_set_data(dstStr, $ir_add_i32(dstIdx, i), ch);
+    }
+}
+
 /**
 Concatenate the strings from two string objects
 */
@@ -200,8 +285,25 @@ function $rt_strcat(strA, strB)
     var lenA = $rt_str_get_len(strA);
     var lenB = $rt_str_get_len(strB);
 
-    // Allocate a string object
     var lenO = $ir_add_i32(lenA, lenB);
+
+    // If either string is a one-byte string
+    if ($rt_isNarrowStr(strA) || $rt_isNarrowStr(strB))
+    {
+        // The output is a one-byte string only if both inputs are
+        if ($rt_isNarrowStr(strA) && $rt_isNarrowStr(strB))
+            var strO = $rt_str8_alloc(lenO);
+        else
+            var strO = $rt_str_alloc(lenO);
+
+        $rt_strCopyChars(strO, 0, strA, lenA);
+        $rt_strCopyChars(strO, lenA, strB, lenB);
+
+        // Find/add the concatenated string in the string table
+        return $ir_get_str(strO);
+    }
+
+    // Allocate a string object
     var strO = $rt_str_alloc(lenO);
 
     // Output pointer
@@ -257,6 +359,100 @@ function $rt_strcat(strA, strB)
     return $ir_get_str(strO);
 }
 
+/**
+Allocate a string builder with a given initial capacity
+*/
+function $rt_strbufAlloc(cap)
+{
+    if ($ir_lt_i32(cap, 16))
+        cap = 16;
+
+    return $rt_strbuf_alloc(cap);
+}
+
+/**
+Append a string object to a string builder. The buffer grows
+geometrically, so the builder returned may be a new object.
+*/
+function $rt_strbufAppend(buf, str)
+{
+    var len = $rt_strbuf_get_len(buf);
+    var strLen = $rt_str_get_len(str);
+    var newLen = $ir_add_i32(len, strLen);
+
+    var cap = $rt_strbuf_get_cap(buf);
+
+    // If the buffer is full, double its capacity
+    if ($ir_gt_i32(newLen, cap))
+    {
+        var newCap = $ir_lsft_i32(cap, 1);
+        if ($ir_lt_i32(newCap, newLen))
+            newCap = newLen;
+
+        var newBuf = $rt_strbuf_alloc(newCap);
+        $rt_strbuf_copy_data(newBuf, 0, buf, 0, len);
+        $rt_strbuf_set_wide(newBuf, $rt_strbuf_get_wide(buf));
+        buf = newBuf;
+    }
+
+    // Widen the characters of one-byte strings
+    if ($rt_isNarrowStr(str))
+    {
+        for (var i = 0; $ir_lt_i32(i, strLen); i = $ir_add_i32(i, 1))
+        {
+            var ch = $rt_str8_get_data(str, i);
+            $rt_strbuf_set_data(buf, $ir_add_i32(len, i), ch);
+        }
+    }
+    else
+    {
+        $ir_memcpy(
+            buf,
+            $rt_strbuf_ofs_data(buf, len),
+            str,
+            $rt_str_ofs_data(str, 0),
+            $ir_lsft_i32(strLen, 1)
+        );
+
+        $rt_strbuf_set_wide(buf, 1);
+    }
+
+    $rt_strbuf_set_len(buf, newLen);
+
+    return buf;
+}
+
+/**
+Produce the string object for the contents of a string builder
+*/
+function $rt_strbufToStr(buf)
+{
+    var len = $rt_strbuf_get_len(buf);
+
+    // If all characters fit in 8 bits, produce a one-byte string
+    if ($ir_eq_i32($rt_strbuf_get_wide(buf), 0))
+    {
+        var str = $rt_str8_alloc(len);
+
+        for (var i = 0; $ir_lt_i32(i, len); i = $ir_add_i32(i, 1))
+            $rt_str8_set_data(str, i, $rt_strbuf_get_data(buf, i));
+    }
+    else
+    {
+        var str = $rt_str_alloc(len);
+
+        $ir_memcpy(
+            str,
+            $rt_str_ofs_data(str, 0),
+            buf,
+            $rt_strbuf_ofs_data(buf, 0),
+            $ir_lsft_i32(len, 1)
+        );
+    }
+
+    return $ir_get_str(str);
+}
+
 /**
 Compare two string objects lexicographically by iterating over UTF-16
 code units. This conforms to section 11.8.5 of the ECMAScript 262
@@ -274,8 +470,8 @@ function $rt_strcmp(strA, strB)
     // For each character to be compared
     for (var i = 0; $ir_lt_i32(i, minLen); i = $ir_add_i32(i, 1))
     {
-        var ch1 = $rt_str_get_data(strA, i);
-        var ch2 = $rt_str_get_data(strB, i);
+        var ch1 = $rt_strGetChar(strA, i);
+        var ch2 = $rt_strGetChar(strB, i);
 
         if ($ir_lt_i32(ch1, ch2))
             return -1;
@@ -306,7 +502,7 @@ function $rt_strToInt(strVal)
     // For each string character
     for (var i = 0; $ir_lt_i32(i, strLen);)
     {
-        var ch = $rt_str_get_data(strVal, i);
+        var ch = $rt_strGetChar(strVal, i);
 
         if ($ir_eq_refptr(state, 'PREWS'))
         {
@@ -420,13 +616,13 @@ function $rt_intToStr(intVal, radix)
 
     } while ($ir_ne_i32(intVal2, 0));
 
-    // Allocate a string object
-    var strObj = $rt_str_alloc(strLen);
+    // Allocate a one-byte string object, digits are ASCII characters
+    var strObj = $rt_str8_alloc(strLen);
 
     // If the string is negative, write the minus sign
     if ($ir_eq_bool(neg, true))
     {
-        $rt_str_set_data(strObj, 0, 45);
+        $rt_str8_set_data(strObj, 0, 45);
     }
 
     var digits = '0123456789abcdefghijklmnopqrstuvwxyz';
@@ -437,9 +633,9 @@ function $rt_intToStr(intVal, radix)
     {
         var digit = $ir_mod_i32(intVal, radix);
 
-        var ch = $rt_str_get_data(digits, digit);
+        var ch = $rt_str8_get_data(digits, digit);
 
-        $rt_str_set_data(strObj, i, ch);
+        $rt_str8_set_data(strObj, i, ch);
 
         intVal = $ir_div_i32(intVal, radix);
 
@@ -493,12 +689,100 @@ function $rt_ropeToStr(rope)
     // If this rope was already converted to a string
     if ($ir_eq_refptr(rightStr, null))
     {
+        if ($rt_CREF32)
+            return $ir_load_cref_str(rope, $rt_rope_ofs_left(rope));
+
         return $ir_load_string(rope, $rt_rope_ofs_left(rope));
     }
 
     return $rt_concatRope(rope, rightStr);
 }
 
+/**
+Test if all the strings in a rope are one-byte strings
+*/
+function $rt_ropeIsNarrow(rope, rightStr)
+{
+    for (var curRope = rope;;)
+    {
+        if (!$rt_isNarrowStr(rightStr))
+            return false;
+
+        curRope = $rt_rope_get_left(curRope);
+
+        // If this is the last string in the chain
+        if ($ir_ne_i32($rt_rope_get_header(curRope), $rt_LAYOUT_ROPE))
+            return $rt_isNarrowStr(curRope);
+
+        rightStr = $rt_rope_get_right(curRope);
+
+        // If the rope was already converted to a string
+        if ($ir_eq_refptr(rightStr, null))
+            return $rt_isNarrowStr($rt_rope_get_left(curRope));
+    }
+}
+
+/**
+Append a string to a rope, producing a new rope. The right-hand strings
+at the top of the chain are merged when the depth exceeds a threshold.
+*/
+function $rt_ropeAppend(rope, str)
+{
+    var len = $ir_add_i32($rt_rope_get_len(rope), $rt_str_get_len(str));
+
+    // If the rope was already flattened, start from the cached string
+    if ($ir_eq_refptr($rt_rope_get_right(rope), null))
+    {
+        var left = $rt_rope_get_left(rope);
+        var depth = 1;
+    }
+    else
+    {
+        var left = rope;
+        var depth = $ir_add_i32($rt_rope_get_depth(rope), 1);
+    }
+
+    // If the chain is too deep, rebalance it by merging the right-hand
+    // strings which are no longer than the merged string. This keeps the
+    // string lengths increasing down the chain, like a binary counter, so
+    // that the depth is logarithmic in the rope length and each character
+    // is only copied a logarithmic number of times.
+    if ($ir_gt_i32(depth, $rt_ROPE_MAX_DEPTH))
+    {
+        // Note: the loaded children are untyped references, so ropes
+        // are recognized by their layout
+        while ($ir_eq_i32($rt_rope_get_header(left), $rt_LAYOUT_ROPE))
+        {
+            var leftRight = $rt_rope_get_right(left);
+
+            // If this rope was flattened, use the cached string
+            if ($ir_eq_refptr(leftRight, null))
+            {
+                left = $rt_rope_get_left(left);
+                break;
+            }
+
+            if ($ir_gt_i32($rt_str_get_len(leftRight), $rt_str_get_len(str)))
+                break;
+
+            str = $rt_strcat(leftRight, str);
+            left = $rt_rope_get_left(left);
+        }
+
+        if ($ir_eq_i32($rt_rope_get_header(left), $rt_LAYOUT_ROPE))
+            depth = $ir_add_i32($rt_rope_get_depth(left), 1);
+        else
+            depth = 1;
+    }
+
+    var newRope = $rt_rope_alloc();
+    $rt_rope_set_left(newRope, left);
+    $rt_rope_set_right(newRope, str);
+    $rt_rope_set_len(newRope, len);
+    $rt_rope_set_depth(newRope, depth);
+    return newRope;
+}
+
 /**
 Convert a rope to a string by concatenation
 */
@@ -506,12 +790,15 @@ function $rt_concatRope(rope, rightStr)
 {
     var ropeLen = $rt_rope_get_len(rope);
 
-    // Allocate a string object for the output
-    var dstStr = $rt_str_alloc(ropeLen);
+    // Allocate a string object for the output, which is a one-byte
+    // string only if all the strings in the rope are
+    if ($rt_ropeIsNarrow(rope, rightStr))
+        var dstStr = $rt_str8_alloc(ropeLen);
+    else
+        var dstStr = $rt_str_alloc(ropeLen);
 
-    // Output string data pointer
-    var dataO = $ir_add_ptr_i32(dstStr, $rt_str_ofs_data(null, 0));
-    var idxO = $ir_lsft_i32(ropeLen, 1);
+    // Output string index, the strings are copied from right to left
+    var idxO = ropeLen;
 
     // Until we are done traversing the ropes
     for (var curRope = rope;;)
@@ -519,23 +806,15 @@ function $rt_concatRope(rope, rightStr)
         // The right-hand node must be a string
         var rightLen = $rt_str_get_len(rightStr);
 
-        // Right string data pointers
-        var dataI = $ir_add_ptr_i32(rightStr, $rt_str_ofs_data(null, 0));
-        var idxI = $ir_lsft_i32(rightLen, 1);
-
         // Copy the string characters
-	    while ($ir_ne_i32(idxI, 0))
-	    {
-            idxI = $ir_sub_i32(idxI, 2);
-            idxO = $ir_sub_i32(idxO, 2);
-            $ir_store_u16(dataO, idxO, $ir_load_u16(dataI, idxI));
-	    }
+        idxO = $ir_sub_i32(idxO, rightLen);
+        $rt_strCopyChars(dstStr, idxO, rightStr, rightLen);
 
         // Move to the next rope
         curRope = $rt_rope_get_left(curRope);
 
         // If this is the last string in the chain, stop
-        if ($ir_eq_i32($rt_rope_get_header(curRope), $rt_LAYOUT_STR))
+        if ($ir_ne_i32($rt_rope_get_header(curRope), $rt_LAYOUT_ROPE))
         {
             var leftStr = curRope;
             break;
@@ -554,18 +833,7 @@ function $rt_concatRope(rope, rightStr)
 
     // Copy the last string
     var leftLen = $rt_str_get_len(leftStr);
-
-    // Left string data pointers
-    var dataI = $ir_add_ptr_i32(leftStr, $rt_str_ofs_data(null, 0));
-    var idxI = $ir_lsft_i32(leftLen, 1);
-
-    // Copy the string characters
-    while ($ir_ne_i32(idxI, 0))
-    {
-        idxI = $ir_sub_i32(idxI, 2);
-        idxO = $ir_sub_i32(idxO, 2);
-        $ir_store_u16(dataO, idxO, $ir_load_u16(dataI, idxI));
-    }
+    $rt_strCopyChars(dstStr, 0, leftStr, leftLen);
 
     // Get the corresponding string from the string table
     dstStr = $ir_get_str(dstStr);
@@ -573,6 +841,7 @@ function $rt_concatRope(rope, rightStr)
     // Cache the concatenated string in the original rope
     $rt_rope_set_left(rope, dstStr);
     $rt_rope_set_right(rope, null);
+    $rt_rope_set_depth(rope, 1);
 
     return dstStr;
 }
@@ -955,12 +1224,7 @@ function $rt_add(x, y)
     {
         var sy = $ir_is_string(y)? y:$rt_toString(y);
 
-        var rope = $rt_rope_alloc();
-        var len = $ir_add_i32($rt_rope_get_len(x), $rt_str_get_len(sy));
-        $rt_rope_set_left(rope, x);
-        $rt_rope_set_right(rope, sy);
-        $rt_rope_set_len(rope, len);
-        return rope;
+        return $rt_ropeAppend(x, sy);
     }
 
     // Convert x and y to primitives
@@ -2110,8 +2374,8 @@ Allocate an array of the given length
 */
 function $rt_newArr(length)
 {
-    // Allocate the array table
-    var tblPtr = $rt_arrtbl_alloc(length);
+    // Allocate the array table, arrays start out as packed int32
+    var tblPtr = $rt_allocArrTbl($rt_LAYOUT_I32ARR, length);
 
     // Allocate the array
     var objPtr = $rt_arr_alloc($rt_OBJ_MIN_CAP);
@@ -2151,6 +2415,17 @@ function $rt_shrinkHeap(freeSpace)
     $ir_gc_collect(newSize);
 }
 
+/**
+Write a heap dump to a file, to be decoded offline with heapdump.py
+*/
+function $rt_heapDump(fileName)
+{
+    if (!$ir_is_string(fileName) && !$ir_is_rope(fileName))
+        throw TypeError("expected string for file name argument");
+
+    $ir_heap_dump($rt_toString(fileName));
+}
+
 //=============================================================================
 // Objects and property access
 //=============================================================================
@@ -2169,7 +2444,10 @@ function $rt_setProto(obj, proto)
 
 function $rt_setArrTbl(arr, tbl)
 {
-    return $ir_store_refptr(arr, $rt_ARRTBL_SLOT_OFS, tbl);
+    $ir_store_refptr(arr, $rt_ARRTBL_SLOT_OFS, tbl);
+
+    // The table may be younger than the array
+    $ir_write_barrier(arr);
 }
 
 function $rt_getArrTbl(arr)
@@ -2187,6 +2465,354 @@ function $rt_getArrLen(arr)
     return $ir_load_u32(arr, $rt_ARRLEN_SLOT_OFS);
 }
 
+/*
+Array element kinds. The kind of an array is the layout of its table:
+generic tagged values (arrtbl), packed int32 (i32arr) or packed float64
+(f64arr). Arrays start out packed int32 and move to a more general kind
+when a value that doesn't fit is stored. Undefined elements (holes) are
+marked with ARR_HOLE_I32 in int32 tables and with a NaN whose high word
+is ARR_HOLE_F64_HI in float64 tables. Arithmetic never produces that NaN.
+*/
+
+/**
+Allocate an array table of the given kind. All elements are holes.
+*/
+function $rt_allocArrTbl(kind, cap)
+{
+    if ($ir_eq_i32(kind, $rt_LAYOUT_I32ARR))
+        var tbl = $rt_i32arr_alloc(cap);
+    else if ($ir_eq_i32(kind, $rt_LAYOUT_F64ARR))
+        var tbl = $rt_f64arr_alloc(cap);
+    else
+        return $rt_arrtbl_alloc(cap);
+
+    // Packed tables need their holes marked explicitly
+    $rt_fillArrHoles(tbl, 0, cap);
+
+    return tbl;
+}
+
+/**
+Get the capacity of an array table
+*/
+function $rt_getArrTblCap(tbl)
+{
+    var kind = $rt_arrtbl_get_header(tbl);
+
+    if ($ir_eq_i32(kind, $rt_LAYOUT_I32ARR))
+        return $rt_i32arr_get_len(tbl);
+
+    if ($ir_eq_i32(kind, $rt_LAYOUT_F64ARR))
+        return $rt_f64arr_get_len(tbl);
+
+    return $rt_arrtbl_get_cap(tbl);
+}
+
+/**
+Turn a range of array table elements into holes
+*/
+function $rt_fillArrHoles(tbl, from, to)
+{
+    var kind = $rt_arrtbl_get_header(tbl);
+
+    if ($ir_eq_i32(kind, $rt_LAYOUT_I32ARR))
+    {
+        $rt_i32arr_fill_data(tbl, from, $ir_sub_i32(to, from), $rt_ARR_HOLE_I32);
+    }
+    else if ($ir_eq_i32(kind, $rt_LAYOUT_F64ARR))
+    {
+        for (var i = from; $ir_lt_i32(i, to); i = $ir_add_i32(i, 1))
+        {
+            var ofs = $rt_f64arr_ofs_data(tbl, i);
+            $ir_store_u32(tbl, ofs, 0);
+            $ir_store_u32(tbl, $ir_add_i32(ofs, 4), $rt_ARR_HOLE_F64_HI);
+        }
+    }
+    else
+    {
+        var count = $ir_sub_i32(to, from);
+        $rt_arrtbl_fill_word(tbl, from, count, $ir_get_word(undefined));
+        $rt_arrtbl_fill_tag(tbl, from, count, $ir_get_tag(undefined));
+    }
+}
+
+/**
+Read an element from an array table, the index must be within bounds
+*/
+function $rt_getArrTblElem(tbl, idx)
+{
+    var kind = $rt_arrtbl_get_header(tbl);
+
+    if ($ir_eq_i32(kind, $rt_LAYOUT_F64ARR))
+    {
+        var ofs = $rt_f64arr_ofs_data(tbl, idx);
+        if ($ir_eq_i32($ir_load_u32(tbl, $ir_add_i32(ofs, 4)), $rt_ARR_HOLE_F64_HI))
+            return $undef;
+        return $ir_load_f64(tbl, ofs);
+    }
+
+    if ($ir_eq_i32(kind, $rt_LAYOUT_I32ARR))
+    {
+        var intVal = $rt_i32arr_get_data(tbl, idx);
+        if ($ir_eq_i32(intVal, $rt_ARR_HOLE_I32))
+            return $undef;
+        return intVal;
+    }
+
+    var word = $rt_arrtbl_get_word(tbl, idx);
+    var type = $rt_arrtbl_get_tag(tbl, idx);
+    return $ir_make_value(word, type);
+}
+
+/**
+Write an element to an array table, the index must be within capacity.
+The array moves to a more general element kind if the value doesn't fit.
+*/
+function $rt_setArrTblElem(arr, tbl, idx, val)
+{
+    var kind = $rt_arrtbl_get_header(tbl);
+
+    if ($ir_eq_i32(kind, $rt_LAYOUT_ARRTBL))
+    {
+        $rt_arrtbl_set_word(tbl, idx, $ir_get_word(val));
+        $rt_arrtbl_set_tag(tbl, idx, $ir_get_tag(val));
+        return;
+    }
+
+    if ($ir_eq_i32(kind, $rt_LAYOUT_I32ARR))
+    {
+        if ($ir_is_int32(val) && $ir_ne_i32(val, $rt_ARR_HOLE_I32))
+        {
+            $rt_i32arr_set_data(tbl, idx, val);
+            return;
+        }
+    }
+    else
+    {
+        if ($ir_is_int32(val))
+        {
+            $rt_f64arr_set_data(tbl, idx, $ir_i32_to_f64(val));
+            return;
+        }
+
+        if ($ir_is_float64(val))
+        {
+            $rt_f64arr_set_data(tbl, idx, val);
+            return;
+        }
+    }
+
+    // The value doesn't fit, change the element kind
+    tbl = $rt_transArrKind(arr, tbl, val);
+    $rt_setArrTblElem(arr, tbl, idx, val);
+}
+
+/**
+Move an array to an element kind able to hold the given value.
+Returns the new array table.
+*/
+function $rt_transArrKind(arr, tbl, val)
+{
+    var kind = $rt_arrtbl_get_header(tbl);
+
+    // Packed int32 arrays become packed float64 when storing a double,
+    // all other transitions go to generic tagged values
+    if ($ir_eq_i32(kind, $rt_LAYOUT_I32ARR) && $ir_is_float64(val))
+        var newKind = $rt_LAYOUT_F64ARR;
+    else
+        var newKind = $rt_LAYOUT_ARRTBL;
+
+    var len = $rt_getArrLen(arr);
+    var newTbl = $rt_allocArrTbl(newKind, $rt_getArrTblCap(tbl));
+
+    // Copy the elements over, holes are already marked in the new table
+    for (var i = 0; $ir_lt_i32(i, len); i = $ir_add_i32(i, 1))
+    {
+        var elem = $rt_getArrTblElem(tbl, i);
+        if (!$ir_is_undef(elem))
+            $rt_setArrTblElem(arr, newTbl, i, elem);
+    }
+
+    // Update the table reference in the array
+    $rt_setArrTbl(arr, newTbl);
+
+    return newTbl;
+}
+
+/**
+Allocate a typed array with unboxed elements. The layout id selects
+the element table layout (f64arr, i32arr, u8arr, i8arr or u32arr).
+*/
+function $rt_newTypedArr(protoPtr, layoutId, length)
+{
+    // Allocate the element table, elements are zero-initialized
+    if ($ir_eq_i32(layoutId, $rt_LAYOUT_F64ARR))
+        var tblPtr = $rt_f64arr_alloc(length);
+    else if ($ir_eq_i32(layoutId, $rt_LAYOUT_I32ARR))
+        var tblPtr = $rt_i32arr_alloc(length);
+    else if ($ir_eq_i32(layoutId, $rt_LAYOUT_U8ARR))
+        var tblPtr = $rt_u8arr_alloc(length);
+    else if ($ir_eq_i32(layoutId, $rt_LAYOUT_I8ARR))
+        var tblPtr = $rt_i8arr_alloc(length);
+    else if ($ir_eq_i32(layoutId, $rt_LAYOUT_U32ARR))
+        var tblPtr = $rt_u32arr_alloc(length);
+    else
+        assert (false, 'invalid typed array layout');
+
+    // Allocate the typed array object
+    var objPtr = $rt_tarr_alloc($rt_OBJ_MIN_CAP);
+
+    // Initialize the object
+    $ir_obj_init_shape(objPtr, protoPtr);
+    $rt_setProto(objPtr, protoPtr);
+
+    // The element table goes in the first slot after the prototype,
+    // which is where $rt_getArrTbl reads it from
+    $ir_obj_def_const(objPtr, '__tbl__', tblPtr, false);
+    $ir_obj_def_const(objPtr, 'length', length, false);
+
+    // If shapes are not to be propagated, clear shape information
+    if ($ir_break());
+    $ir_clear_shape(objPtr);
+
+    return objPtr;
+}
+
+/**
+Test if an object is a typed array with unboxed elements
+*/
+function $rt_isTypedArr(obj)
+{
+    return $ir_eq_i32($rt_obj_get_header(obj), $rt_LAYOUT_TARR);
+}
+
+/**
+Read an element from a typed array
+*/
+function $rt_getTypedArrElem(arr, idx)
+{
+    // Only integer indices name elements
+    if (!$ir_is_int32(idx))
+    {
+        var intVal = $rt_toUint32(idx);
+        if (intVal !== idx || !$ir_is_int32(intVal))
+            return $undef;
+        idx = intVal;
+    }
+
+    if ($ir_lt_i32(idx, 0))
+        return $undef;
+
+    var tbl = $rt_getArrTbl(arr);
+    var layout = $rt_obj_get_header(tbl);
+
+    if ($ir_eq_i32(layout, $rt_LAYOUT_F64ARR))
+    {
+        if ($ir_lt_i32(idx, $rt_f64arr_get_len(tbl)))
+            return $rt_f64arr_get_data(tbl, idx);
+        return $undef;
+    }
+
+    if ($ir_eq_i32(layout, $rt_LAYOUT_I32ARR))
+    {
+        if ($ir_lt_i32(idx, $rt_i32arr_get_len(tbl)))
+            return $rt_i32arr_get_data(tbl, idx);
+        return $undef;
+    }
+
+    if ($ir_eq_i32(layout, $rt_LAYOUT_U8ARR))
+    {
+        if ($ir_lt_i32(idx, $rt_u8arr_get_len(tbl)))
+            return $rt_u8arr_get_data(tbl, idx);
+        return $undef;
+    }
+
+    if ($ir_eq_i32(layout, $rt_LAYOUT_I8ARR))
+    {
+        if ($ir_lt_i32(idx, $rt_i8arr_get_len(tbl)))
+            return $rt_i8arr_get_data(tbl, idx);
+        return $undef;
+    }
+
+    if ($ir_lt_i32(idx, $rt_u32arr_get_len(tbl)))
+    {
+        // Values past the int32 range are returned as doubles
+        var val = $rt_u32arr_get_data(tbl, idx);
+        if ($ir_lt_i32(val, 0))
+            return $ir_add_f64($ir_i32_to_f64(val), 4294967296.0);
+        return val;
+    }
+    return $undef;
+}
+
+/**
+Write an element to a typed array. The value is converted to the
+element type, out of bounds writes are ignored.
+*/
+function $rt_setTypedArrElem(arr, idx, val)
+{
+    // Only integer indices name elements
+    if (!$ir_is_int32(idx))
+    {
+        var intVal = $rt_toUint32(idx);
+        if (intVal !== idx || !$ir_is_int32(intVal))
+            return;
+        idx = intVal;
+    }
+
+    if ($ir_lt_i32(idx, 0))
+        return;
+
+    var tbl = $rt_getArrTbl(arr);
+    var layout = $rt_obj_get_header(tbl);
+
+    if ($ir_eq_i32(layout, $rt_LAYOUT_F64ARR))
+    {
+        if ($ir_ge_i32(idx, $rt_f64arr_get_len(tbl)))
+            return;
+
+        val = $rt_toNumber(val);
+        if ($ir_is_int32(val))
+            val = $ir_i32_to_f64(val);
+
+        $rt_f64arr_set_data(tbl, idx, val);
+        return;
+    }
+
+    if ($ir_eq_i32(layout, $rt_LAYOUT_I32ARR))
+    {
+        if ($ir_ge_i32(idx, $rt_i32arr_get_len(tbl)))
+            return;
+
+        $rt_i32arr_set_data(tbl, idx, $rt_toInt32(val));
+        return;
+    }
+
+    if ($ir_eq_i32(layout, $rt_LAYOUT_U8ARR))
+    {
+        if ($ir_ge_i32(idx, $rt_u8arr_get_len(tbl)))
+            return;
+
+        $rt_u8arr_set_data(tbl, idx, $ir_and_i32($rt_toInt32(val), 255));
+        return;
+    }
+
+    // The low bits of the int32 value are stored
+    if ($ir_eq_i32(layout, $rt_LAYOUT_I8ARR))
+    {
+        if ($ir_ge_i32(idx, $rt_i8arr_get_len(tbl)))
+            return;
+
+        $rt_i8arr_set_data(tbl, idx, $rt_toInt32(val));
+        return;
+    }
+
+    if ($ir_ge_i32(idx, $rt_u32arr_get_len(tbl)))
+        return;
+
+    $rt_u32arr_set_data(tbl, idx, $rt_toInt32(val));
+}
+
 /**
 Property read inline cache implementation
 Note: this primitive is always inlined
@@ -2278,6 +2904,11 @@ function $rt_getProp(base, prop)
         if ($ir_is_string(prop))
             return $rt_objGetProp(base, prop);
 
+        // If this is a numeric index into a typed array
+        if (($ir_is_int32(prop) || $ir_is_float64(prop)) &&
+            $rt_isTypedArr(base))
+            return $rt_getTypedArrElem(base, prop);
+
         return $rt_objGetProp(base, $rt_toString(prop));
     }
 
@@ -2288,10 +2919,7 @@ function $rt_getProp(base, prop)
         if ($ir_is_int32(prop) && $ir_ge_i32(prop, 0) &&
             $ir_lt_i32(prop, $rt_getArrLen(base)))
         {
-            var tbl = $rt_getArrTbl(base);
-            var word = $rt_arrtbl_get_word(tbl, prop);
-            var type = $rt_arrtbl_get_tag(tbl, prop);
-            return $ir_make_value(word, type);
+            return $rt_getArrTblElem($rt_getArrTbl(base), prop);
         }
 
         // If the property is a floating-point number
@@ -2326,10 +2954,8 @@ function $rt_getProp(base, prop)
         if ($ir_is_int32(prop) && $ir_ge_i32(prop, 0) &&
             $ir_lt_i32(prop, $rt_str_get_len(base)))
         {
-            var ch = $rt_str_get_data(base, prop);
-            var str = $rt_str_alloc(1);
-            $rt_str_set_data(str, 0, ch);
-            return $ir_get_str(str);
+            var ch = $rt_strGetChar(base, prop);
+            return $rt_charToStr(ch);
         }
 
         // If this is the length property
@@ -2497,15 +3123,16 @@ function $rt_getPropElem(base, prop)
     {
         if ($ir_lt_i32(prop, $rt_getArrLen(base)))
         {
-            var tbl = $rt_getArrTbl(base);
-            var word = $rt_arrtbl_get_word(tbl, prop);
-            var type = $rt_arrtbl_get_tag(tbl, prop);
-            return $ir_make_value(word, type);
+            return $rt_getArrTblElem($rt_getArrTbl(base), prop);
         }
 
         return $undef;
     }
 
+    // If the base is a typed array and the property is an integer
+    if ($ir_is_object(base) && $ir_is_int32(prop) && $rt_isTypedArr(base))
+        return $rt_getTypedArrElem(base, prop);
+
     return $rt_getProp(base, prop);
 }
 
@@ -2689,14 +3316,24 @@ function $rt_extArrTbl(
     newSize
 )
 {
-    // Allocate the new table without initializing it, for performance
-    var newTbl = $rt_arrtbl_alloc(newSize);
+    var kind = $rt_arrtbl_get_header(curTbl);
 
-    // Copy elements from the old table to the new
-    for (var i = 0; $ir_lt_i32(i, curLen); i = $ir_add_i32(i, 1))
+    // Allocate a new table of the same element kind
+    var newTbl = $rt_allocArrTbl(kind, newSize);
+
+    // Copy elements from the old table to the new, holes included
+    if ($ir_eq_i32(kind, $rt_LAYOUT_I32ARR))
+    {
+        $rt_i32arr_copy_data(newTbl, 0, curTbl, 0, curLen);
+    }
+    else if ($ir_eq_i32(kind, $rt_LAYOUT_F64ARR))
+    {
+        $rt_f64arr_copy_data(newTbl, 0, curTbl, 0, curLen);
+    }
+    else
     {
-        $rt_arrtbl_set_word(newTbl, i, $rt_arrtbl_get_word(curTbl, i));
-        $rt_arrtbl_set_tag(newTbl, i, $rt_arrtbl_get_tag(curTbl, i));
+        $rt_arrtbl_copy_word(newTbl, 0, curTbl, 0, curLen);
+        $rt_arrtbl_copy_tag(newTbl, 0, curTbl, 0, curLen);
     }
 
     // Update the table reference in the array
@@ -2723,7 +3360,7 @@ function $rt_setArrElem(arr, index, val)
         var newLen = $ir_add_i32(index, 1);
 
         // Get the array capacity
-        var cap = $rt_arrtbl_get_cap(tbl);
+        var cap = $rt_getArrTblCap(tbl);
 
         // If the new length would exceed the capacity
         if ($ir_gt_i32(newLen, cap))
@@ -2742,8 +3379,7 @@ function $rt_setArrElem(arr, index, val)
     }
 
     // Set the element in the array
-    $rt_arrtbl_set_word(tbl, index, $ir_get_word(val));
-    $rt_arrtbl_set_tag(tbl, index, $ir_get_tag(val));
+    $rt_setArrTblElem(arr, tbl, index, val);
 }
 
 /**
@@ -2761,7 +3397,7 @@ function $rt_setArrLength(arr, newLen)
     if (newLen > len)
     {
         // Get the array capacity
-        var cap = $rt_arrtbl_get_cap(tbl);
+        var cap = $rt_getArrTblCap(tbl);
 
         // If the new length would exceed the capacity
         if (newLen > cap)
@@ -2778,11 +3414,7 @@ function $rt_setArrLength(arr, newLen)
     else
     {
         // Set the removed entries to undefined
-        for (var i = newLen; i < len; i++)
-        {
-            $rt_arrtbl_set_word(tbl, i, $ir_get_word(undefined));
-            $rt_arrtbl_set_tag(tbl, i, $ir_get_tag(undefined));
-        }
+        $rt_fillArrHoles(tbl, newLen, len);
     }
 
     // Update the array length
@@ -2801,6 +3433,11 @@ function $rt_setProp(base, prop, val)
         if ($ir_is_string(prop))
             return $rt_objSetProp(base, prop, val);
 
+        // If this is a numeric index into a typed array
+        if (($ir_is_int32(prop) || $ir_is_float64(prop)) &&
+            $rt_isTypedArr(base))
+            return $rt_setTypedArrElem(base, prop, val);
+
         return $rt_objSetProp(base, $rt_toString(prop), val);
     }
 
@@ -2909,8 +3546,7 @@ function $rt_setPropElem(base, prop, val)
                 var tbl = $rt_getArrTbl(base);
 
                 // Set the element in the array
-                $rt_arrtbl_set_word(tbl, prop, $ir_get_word(val));
-                $rt_arrtbl_set_tag(tbl, prop, $ir_get_tag(val));
+                $rt_setArrTblElem(base, tbl, prop, val);
                 return;
             }
 
@@ -2918,6 +3554,10 @@ function $rt_setPropElem(base, prop, val)
         }
     }
 
+    // If the base is a typed array and the property is an integer
+    if ($ir_is_object(base) && $ir_is_int32(prop) && $rt_isTypedArr(base))
+        return $rt_setTypedArrElem(base, prop, val);
+
     return $rt_setProp(base, prop, val);
 }
 
@@ -2930,8 +3570,7 @@ function $rt_setArrElemNoCheck(arr, index, val)
     var tbl = $rt_getArrTbl(arr);
 
     // Set the element in the array
-    $rt_arrtbl_set_word(tbl, index, $ir_get_word(val));
-    $rt_arrtbl_set_tag(tbl, index, $ir_get_tag(val));
+    $rt_setArrTblElem(arr, tbl, index, val);
 }
 
 /**
@@ -3223,6 +3862,15 @@ function $rt_getEnumKey(topObj, curObj, propIdx)
                 return arrIdx;
         }
 
+        // If the object is a typed array
+        if ($ir_is_object(curObj) && $rt_isTypedArr(curObj))
+        {
+            // If this is a valid element index
+            var arrIdx = propIdx - $ir_rsft_i32(tblLen, 1);
+            if ($ir_lt_i32(arrIdx, curObj.length))
+                return arrIdx;
+        }
+
         // No more properties to enumerate
         return true;
     }
@@ -146,31 +146,32 @@ function array_join(separator)
     else if (!$ir_is_string(separator))
         separator = $rt_toString(separator);
 
-    var outStr = '';
-
     var arrLen = o.length;
 
+    // Accumulate the output in a string builder, which grows
+    // geometrically instead of allocating on every append
+    var initCap = ($ir_is_int32(arrLen) && arrLen < 4096)? arrLen * 8:32768;
+    var buf = $rt_strbufAlloc(initCap);
+
     if (arrLen > 0)
     {
         var elem = o[0];
 
-        // Use the += operator to do concatenation lazily using ropes
         if (!$ir_is_undef(elem))
-            outStr += elem;
+            buf = $rt_strbufAppend(buf, $rt_toString(elem));
     }
 
     for (var i = 1; i < arrLen; ++i)
     {
-        outStr += separator;
+        buf = $rt_strbufAppend(buf, separator);
 
         var elem = o[i];
 
-        // Use the += operator to do concatenation lazily using ropes
         if (!$ir_is_undef(elem))
-            outStr += elem;
+            buf = $rt_strbufAppend(buf, $rt_toString(elem));
     }
 
-    return outStr;
+    return $rt_strbufToStr(buf);
 }
 
 function array_pop()
@@ -264,6 +264,8 @@ Function.prototype.apply = function (thisArg, argArray)
     }
 
     // Get the arguments table from the array
+    // Note: the table may hold packed elements, which call_apply reads
+    // without changing the element kind of the array
     var argTable = $rt_getArrTbl(argArray);
 
     // Perform the call using the apply instruction
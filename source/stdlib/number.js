@@ -188,10 +188,10 @@ Number.prototype.toFixed = function (fractionDigits)
 
         if (f !== 0)
         {
-            padding = $rt_str_alloc(f + 1);
-            $rt_str_set_data(padding, 0, 46);
+            padding = $rt_str8_alloc(f + 1);
+            $rt_str8_set_data(padding, 0, 46);
             for (i = 1; i <= f; i++)
-                $rt_str_set_data(padding, i, 48);
+                $rt_str8_set_data(padding, i, 48);
 
             m = $rt_strcat(m, $ir_get_str(padding));
         }
@@ -260,9 +260,9 @@ Number.prototype.toFixed = function (fractionDigits)
                 // 8.c.ii.1 Let z be the String consisting of f+1–k occurrences of the
                 // character ‘0’
                 var end = f + 1 - k;
-                padding = $rt_str_alloc(end);
+                padding = $rt_str8_alloc(end);
                 for (i = 0; i < end; i++)
-                    $rt_str_set_data(padding, i, 48);
+                    $rt_str8_set_data(padding, i, 48);
 
                 // 8.c.ii.2 Let m be the concatenation of Strings z and m.
                 m = $rt_strcat($ir_get_str(padding), m);
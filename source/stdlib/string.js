@@ -100,7 +100,7 @@ function string_internal_toCharCodeArray(x)
     a.length = s.length;
 
     for (var i = 0; i < s.length; i++)
-        a[i] = $rt_str_get_data(s, i);
+        a[i] = $rt_strGetChar(s, i);
 
     return a;
 }
@@ -158,9 +158,7 @@ $rt_char_str_table = (function ()
 
     for (var c = 0; c < len; c++)
     {
-        var str = $rt_str_alloc(1);
-        $rt_str_set_data(str, 0, c);
-        str = $ir_get_str(str);
+        var str = $rt_charToStr(c);
 
         $rt_arrtbl_set_word(table, c, $ir_get_word(str))
         $rt_arrtbl_set_tag(table, c, $ir_get_tag(str))
@@ -284,10 +282,8 @@ function string_charAt(pos)
         $ir_ge_i32(pos, 0) &&
         $ir_lt_i32(pos, $rt_str_get_len(this)))
     {
-        var ch = $rt_str_get_data(this, pos);
-        var str = $rt_str_alloc(1);
-        $rt_str_set_data(str, 0, ch);
-        return $ir_get_str(str);
+        var ch = $rt_strGetChar(this, pos);
+        return $rt_charToStr(ch);
     }
 
     var source = this.toString();
@@ -299,9 +295,7 @@ function string_charAt(pos)
     }
 
     var ch = source.charCodeAt(pos);
-    var str = $rt_str_alloc(1);
-    $rt_str_set_data(str, 0, ch);
-    return $ir_get_str(str);
+    return $rt_charToStr(ch);
 }
 
 /**
@@ -312,10 +306,10 @@ function string_charCodeAt(pos)
     if ($ir_is_int32(pos) && $ir_ge_i32(pos, 0))
     {
         if ($ir_is_string(this) && $ir_lt_i32(pos, $rt_str_get_len(this)))
-            return $rt_str_get_data(this, pos);
+            return $rt_strGetChar(this, pos);
 
         if ($ir_is_rope(this) && $ir_lt_i32(pos, $rt_rope_get_len(this)))
-            return $rt_str_get_data($rt_ropeToStr(this), pos);
+            return $rt_strGetChar($rt_ropeToStr(this), pos);
     }
 
     var source = this.toString();
@@ -326,7 +320,7 @@ function string_charCodeAt(pos)
         if ($ir_is_int32(pos) == false)
             pos = $rt_toUint32(pos);
 
-        return $rt_str_get_data(source, pos);
+        return $rt_strGetChar(source, pos);
     }
 
     return NaN;
@@ -596,13 +590,13 @@ function string_repeat(count)
 
     if (str.length === 0 || count === 0) return '';
 
-    var buff = '';
+    var buf = $rt_strbufAlloc($rt_str_get_len(str));
     for (var i = 0; i < count; i++)
     {
-        buff += str;
+        buf = $rt_strbufAppend(buf, str);
     }
 
-    return buff;
+    return $rt_strbufToStr(buf);
 }
 
 /**
@@ -967,6 +961,14 @@ function string_substring(start, end)
         end = tmp;
     }
 
+    // Substrings of one-byte strings are also one-byte strings
+    if ($rt_isNarrowStr(source))
+    {
+        var s = $rt_str8_alloc(end - start);
+        $rt_str8_copy_data(s, 0, source, start, end - start);
+        return $ir_get_str(s);
+    }
+
     // Allocate new string
     var s = $rt_str_alloc(end - start);
 
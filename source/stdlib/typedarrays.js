@@ -47,12 +47,102 @@
         return a;
     }
 
-    Int8Array = TypedArrayCtor;
-    Int32Array = TypedArrayCtor;
-    Uint8Array = TypedArrayCtor;
-    Uint32Array = TypedArrayCtor;
+    /**
+    Create a typed array constructor whose elements are stored unboxed
+    in a table of the given layout
+    */
+    function makeTypedArrayCtor(layoutId, bytesPerElem)
+    {
+        function ctor(x)
+        {
+            // Construct from a length
+            if ($ir_is_int32(x) || $ir_is_float64(x))
+                return $rt_newTypedArr(ctor.prototype, layoutId, $rt_toUint32(x));
+
+            // Construct from an array-like object
+            var len = (x === undefined)? 0:$rt_toUint32(x.length);
+            var a = $rt_newTypedArr(ctor.prototype, layoutId, len);
+            for (var i = 0; i < len; ++i)
+                a[i] = x[i];
+
+            return a;
+        }
+
+        ctor.BYTES_PER_ELEMENT = bytesPerElem;
+        ctor.prototype.BYTES_PER_ELEMENT = bytesPerElem;
+
+        /**
+        Copy elements from an array-like object at the given offset
+        */
+        ctor.prototype.set = function (src, offset)
+        {
+            if (offset === undefined)
+                offset = 0;
+
+            if (offset + src.length > this.length)
+                throw RangeError('source too large for typed array');
+
+            for (var i = 0; i < src.length; ++i)
+                this[offset + i] = src[i];
+        };
+
+        /**
+        Get a range of elements as a new typed array.
+        Note: the result is a copy, not a view sharing the same storage.
+        */
+        ctor.prototype.subarray = function (begin, end)
+        {
+            var len = this.length;
+
+            if (begin === undefined)
+                begin = 0;
+            else if (begin < 0)
+                begin = Math.max(len + begin, 0);
+            else
+                begin = Math.min(begin, len);
+
+            if (end === undefined)
+                end = len;
+            else if (end < 0)
+                end = Math.max(len + end, 0);
+            else
+                end = Math.min(end, len);
+
+            var a = new ctor(Math.max(end - begin, 0));
+            for (var i = begin; i < end; ++i)
+                a[i - begin] = this[i];
+
+            return a;
+        };
+
+        // Generic array methods also work on typed arrays
+        var methods = [
+            'toString', 'join', 'indexOf', 'lastIndexOf', 'every', 'some',
+            'forEach', 'reduce', 'reduceRight'
+        ];
+        for (var i = 0; i < methods.length; ++i)
+            ctor.prototype[methods[i]] = Array.prototype[methods[i]];
+
+        // Make the prototype properties non-enumerable
+        for (var p in ctor.prototype)
+        {
+            Object.defineProperty(
+                ctor.prototype,
+                p,
+                {enumerable:false, writable:true, configurable:true }
+            );
+        }
+
+        return ctor;
+    }
+
+    // Note: Float32Array stays array-backed, since the IR has
+    // no 32-bit floating-point loads and stores
+    Int8Array = makeTypedArrayCtor($rt_LAYOUT_I8ARR, 1);
+    Int32Array = makeTypedArrayCtor($rt_LAYOUT_I32ARR, 4);
+    Uint8Array = makeTypedArrayCtor($rt_LAYOUT_U8ARR, 1);
+    Uint32Array = makeTypedArrayCtor($rt_LAYOUT_U32ARR, 4);
     Float32Array = TypedArrayCtor;
-    Float64Array = TypedArrayCtor;
+    Float64Array = makeTypedArrayCtor($rt_LAYOUT_F64ARR, 8);
 
 }());
-
@@ -254,6 +254,16 @@ function test_join()
     if ([1,o,2].join('!?') != '1!?foo!?2')
         return 6;
 
+    // Output longer than the initial builder capacity, with wide characters
+    var a = [];
+    for (var i = 0; i < 100; ++i)
+        a.push((i % 10 === 0)? '\u0100':'abc');
+    var s = a.join('--');
+    if (s.length != 10 * 1 + 90 * 3 + 99 * 2)
+        return 7;
+    if (s.charCodeAt(0) != 0x100 || s.charAt(3) != 'a')
+        return 8;
+
     return 0;
 }
 
@@ -449,6 +459,37 @@ function test_array_syntax()
     return 0;
 }
 
+function test_elem_kinds()
+{
+    // Packed int32, then double, then generic
+    var a = [1, 2, 3];
+    a[1] = 2.5;
+    if (!array_eq(a, [1, 2.5, 3]))
+        return 1;
+    a[3] = 'foo';
+    if (!array_eq(a, [1, 2.5, 3, 'foo']))
+        return 2;
+
+    // Holes must survive transitions and growth
+    var b = new Array(4);
+    b[1] = 1;
+    b[2] = 0.5;
+    b[6] = 2;
+    if (!array_eq(b, [undefined, 1, 0.5, undefined, undefined, undefined, 2]))
+        return 3;
+
+    b.length = 2;
+    b.length = 3;
+    if (b[2] !== undefined)
+        return 4;
+
+    // Apply on a packed array
+    if (Math.max.apply(null, [3, 7, 5]) !== 7)
+        return 5;
+
+    return 0;
+}
+
 function test_array_of()
 {
     assert (array_eq(Array.of(), []))
@@ -535,6 +576,10 @@ function test()
     if (r != 0)
         return 1800 + r;
 
+    var r = test_elem_kinds();
+    if (r != 0)
+        return 1900 + r;
+
     return 0;
 }
 
@@ -93,6 +93,19 @@ function test_apply()
     if (sum.apply(null, [1, 2, 3, 4, 5, 6]) !== 21)
         return 2;
 
+    // Packed arrays keep their element kind when applied
+    var doubles = [1.5, 2.5, 3.5, 4.5, 0.5];
+    if (Math.max.apply(null, doubles) !== 4.5)
+        return 3;
+    if ($rt_obj_get_header($rt_getArrTbl(doubles)) !== $rt_LAYOUT_F64ARR)
+        return 4;
+
+    var ints = [5, 1, 7, 3, 2];
+    if (Math.max.apply(null, ints) !== 7)
+        return 5;
+    if ($rt_obj_get_header($rt_getArrTbl(ints)) !== $rt_LAYOUT_I32ARR)
+        return 6;
+
     return 0;
 }
 
@@ -305,7 +318,7 @@ test_proto()
 
 test_toString();
 
-test_apply();
+assert (test_apply() === 0);
 
 test_call();
 
@@ -409,6 +409,124 @@ function test_keys()
     assert (keys.length === 2)
 }
 
+function test_manyProps()
+{
+    // Properties past the object capacity go in the overflow table
+    var o = {};
+    for (var i = 0; i < 300; ++i)
+        o['p' + i] = i;
+
+    o.x = 'foo';
+    o.p250 = 'bar';
+
+    // Move the object and its overflow table
+    $ir_gc_collect(0);
+
+    var sum = 0;
+    for (var i = 0; i < 250; ++i)
+        sum += o['p' + i];
+    assert (sum === 31125);
+    assert (o.p250 === 'bar');
+    assert (o.p299 === 299);
+    assert (o.x === 'foo');
+    assert (Object.keys(o).length === 301);
+
+    o.y = 3;
+    assert (o.y === 3);
+
+    // Overflow table large enough to be in the large object space
+    var o = {};
+    for (var i = 0; i < 5000; ++i)
+        o['q' + i] = i;
+
+    $ir_gc_collect(0);
+    $ir_gc_collect(0);
+
+    var sum = 0;
+    for (var i = 0; i < 5000; ++i)
+        sum += o['q' + i];
+    assert (sum === 12497500);
+    assert (Object.keys(o).length === 5000);
+
+    o.z = 'baz';
+    assert (o.z === 'baz');
+}
+
+function ManyProps()
+{
+    this.p0 = 0;
+    this.p1 = 1;
+    this.p2 = 2;
+    this.p3 = 3;
+    this.p4 = 4;
+    this.p5 = 5;
+    this.p6 = 6;
+    this.p7 = 7;
+    this.p8 = 8;
+    this.p9 = 9;
+    this.p10 = 10;
+    this.p11 = 11;
+    this.p12 = 12;
+    this.p13 = 13;
+    this.p14 = 14;
+    this.p15 = 15;
+    this.p16 = 16;
+    this.p17 = 17;
+    this.p18 = 18;
+    this.p19 = 19;
+    this.p20 = 20;
+    this.p21 = 21;
+    this.p22 = 22;
+    this.p23 = 23;
+    this.p24 = 24;
+    this.p25 = 25;
+    this.p26 = 26;
+    this.p27 = 27;
+    this.p28 = 28;
+    this.p29 = 29;
+    this.p30 = 30;
+    this.p31 = 31;
+    this.p32 = 32;
+    this.p33 = 33;
+    this.p34 = 34;
+    this.p35 = 35;
+    this.p36 = 36;
+    this.p37 = 37;
+    this.p38 = 38;
+    this.p39 = 39;
+}
+
+function test_ovfTypes()
+{
+    // Known-shape object, with constant property names past the
+    // object capacity, stored in the overflow table
+    var o = new ManyProps();
+
+    for (var i = 0; i < 100; ++i)
+    {
+        // Stores changing the type of overflow properties
+        o.p37 = 'foo';
+        o.p38 = 1.5;
+        o.p39 = (i % 2 === 0)? null:i;
+
+        assert (o.p37 === 'foo');
+        assert (o.p38 === 1.5);
+        assert (o.p39 === ((i % 2 === 0)? null:i));
+        assert (o.p36 === 36);
+
+        o.p37 = 37;
+        o.p38 = 38;
+        assert (o.p37 === 37);
+        assert (o.p38 === 38);
+    }
+
+    $ir_gc_collect(0);
+
+    for (var i = 0; i < 37; ++i)
+        assert (o['p' + i] === i);
+    assert (o.p39 === 99);
+}
+
 function test_is()
 {
     assert(!Object.is(-0, 0));
@@ -623,6 +741,10 @@ function test()
 
     test_keys();
 
+    test_manyProps();
+
+    test_ovfTypes();
+
     test_is();
 
     test_assign();
@@ -533,6 +533,61 @@ function test_fromCodePoint()
     assert(String.fromCodePoint(102, 0x1F0A1, 111, 111) === 'f🂡oo');
 }
 
+function test_narrow()
+{
+    // Strings built character by character are interned in the same
+    // (one-byte) form as literals
+    assert(String.fromCharCode(104, 105, 233) === 'hi\u00e9');
+    assert($rt_isNarrowStr(String.fromCharCode(104, 105, 233)));
+    assert(!$rt_isNarrowStr('\u0100'));
+
+    // Concatenation across both forms
+    var wide = 'x\u0100';
+    assert('ab' + wide === 'abx\u0100');
+    assert(wide + 'ab' === 'x\u0100ab');
+    assert(('abc' + wide).substring(0, 3) === 'abc');
+    assert($rt_isNarrowStr(('abc' + wide).substring(0, 3)));
+
+    // Ropes mixing both forms
+    var s = '';
+    for (var i = 0; i < 20; ++i)
+        s += (i % 5 === 0)? wide:String(i);
+    assert(s.length === 32);
+    assert(s.charCodeAt(1) === 0x100);
+    assert(s.charAt(2) === '1');
+
+    assert('abc' < 'abd');
+    assert('\u00ff' < '\u0100');
+}
+
+function test_ropes()
+{
+    // Long chains of appends are rebalanced
+    var s = '';
+    for (var i = 0; i < 2000; ++i)
+    {
+        s += String.fromCharCode(97 + i % 26);
+
+        // Flatten the rope part of the time
+        if (i % 300 === 0)
+            assert(s.charCodeAt(i) === 97 + i % 26);
+    }
+
+    assert(s.length === 2000);
+    for (var i = 0; i < 2000; i += 37)
+        assert(s.charCodeAt(i) === 97 + i % 26);
+
+    // Appending to a shared rope does not modify it
+    var a = 'x';
+    for (var i = 0; i < 100; ++i)
+        a += 'y';
+    var b = a + 'b';
+    var c = a + 'c';
+    assert(a.length === 101 && b.length === 102 && c.length === 102);
+    assert(b.charAt(101) === 'b' && c.charAt(101) === 'c');
+    assert(b.substring(0, 101) === a);
+}
+
 function test()
 {
     var r = test_lit();
@@ -611,6 +666,10 @@ function test()
 
     test_fromCodePoint();
 
+    test_narrow();
+
+    test_ropes();
+
     return 0;
 }
 
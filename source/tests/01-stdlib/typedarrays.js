@@ -0,0 +1,90 @@
+/*****************************************************************************
+*
+*                      Higgs JavaScript Virtual Machine
+*
+*  This file is part of the Higgs project. The project is distributed at:
+*  https://github.com/maximecb/Higgs
+*
+*  Copyright (c) 2011-2015, Maxime Chevalier-Boisvert. All rights reserved.
+*
+*  This software is licensed under the following license (Modified BSD
+*  License):
+*
+*  Redistribution and use in source and binary forms, with or without
+*  modification, are permitted provided that the following conditions are
+*  met:
+*   1. Redistributions of source code must retain the above copyright
+*      notice, this list of conditions and the following disclaimer.
+*   2. Redistributions in binary form must reproduce the above copyright
+*      notice, this list of conditions and the following disclaimer in the
+*      documentation and/or other materials provided with the distribution.
+*   3. The name of the author may not be used to endorse or promote
+*      products derived from this software without specific prior written
+*      permission.
+*
+*  THIS SOFTWARE IS PROVIDED ``AS IS'' AND ANY EXPRESS OR IMPLIED
+*  WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF
+*  MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN
+*  NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+*  INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+*  NOT LIMITED TO PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+*  DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+*  THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+*  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+*  THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*
+*****************************************************************************/
+
+var f = new Float64Array(4);
+assert (f.length === 4);
+assert (f[0] === 0);
+f[1] = 1.5;
+f[2] = 3;
+assert (f[1] === 1.5);
+assert (f[2] === 3);
+assert (f[4] === undefined);
+f[7] = 2;
+assert (f.length === 4);
+
+var a = new Int32Array([1, 2, 3]);
+assert (a.length === 3);
+assert (a[0] + a[1] + a[2] === 6);
+a[0] = 2.7;
+assert (a[0] === 2);
+
+var b = new Uint8Array(2);
+b[0] = 257;
+b[1] = -1;
+assert (b[0] === 1);
+assert (b[1] === 255);
+
+var c = new Int8Array(3);
+c[0] = 127;
+c[1] = 128;
+c[2] = -129;
+assert (c[0] === 127);
+assert (c[1] === -128);
+assert (c[2] === 127);
+assert (Int8Array.BYTES_PER_ELEMENT === 1);
+
+var d = new Uint32Array([1, -1, 4294967295]);
+assert (d.length === 3);
+assert (d[0] === 1);
+assert (d[1] === 4294967295);
+assert (d[2] === 4294967295);
+assert (Uint32Array.BYTES_PER_ELEMENT === 4);
+
+var s = a.subarray(1);
+assert (s.length === 2 && s[0] === 2 && s[1] === 3);
+assert (a.join(',') === '2,2,3');
+
+var keys = [];
+for (var k in a)
+    keys.push(k);
+assert (keys.length === 3);
+assert (keys.join(',') === '0,1,2');
+
+// Elements must survive garbage collection
+$ir_gc_collect(0);
+assert (f[1] === 1.5 && a[2] === 3 && b[1] === 255);
+assert (c[1] === -128 && d[1] === 4294967295);
@@ -22,6 +22,35 @@ function closTest(freeSpace)
     return 0;
 }
 
+function makeCounter(x)
+{
+    // The cells for a and b are co-allocated
+    var a = x;
+    var b = 2 * x;
+
+    return function () { return a++ + b; };
+}
+
+function cellsTest(freeSpace)
+{
+    $rt_shrinkHeap(freeSpace);
+
+    var gcCount = $ir_get_gc_count();
+
+    for (var i = 0; $ir_get_gc_count() < gcCount + 2; ++i)
+    {
+        var clos = makeCounter(i);
+
+        if (clos() !== 3 * i)
+            return 1;
+
+        if (clos() !== 3 * i + 1)
+            return 2;
+    }
+
+    return 0;
+}
+
 function test()
 {
     if (closTest(25000) !== 0)
@@ -33,6 +62,9 @@ function test()
     if (closTest(15000) !== 0)
         return 3;
 
+    if (cellsTest(25000) !== 0)
+        return 4;
+
     return 0;
 }
 
@@ -0,0 +1,15 @@
+// Heap with a known retainer, for the heap dump decoder test
+
+// Number of objects only reachable through the retainer
+var NUM_RETAINED = 50000;
+
+var retainer;
+
+function test()
+{
+    retainer = new Array(NUM_RETAINED);
+    for (var i = 0; i < NUM_RETAINED; ++i)
+        retainer[i] = { v: i };
+
+    return 0;
+}
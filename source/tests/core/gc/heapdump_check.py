@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+# Check the decoding of a heap dump of tests/core/gc/heapdump.js, along
+# with the dominators of the objects held by the retainer array
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+from heapdump import HeapDump, HeapGraph
+
+# Must match NUM_RETAINED in heapdump.js
+NUM_RETAINED = 50000
+
+dump = HeapDump(sys.argv[1])
+graph = HeapGraph(dump)
+
+objId = dump.layoutIds['obj']
+arrId = dump.layoutIds['arr']
+
+counts, shallow, retained = graph.layoutStats()
+assert counts[objId] >= NUM_RETAINED, 'missing objects'
+assert counts[arrId] >= 1, 'missing arrays'
+assert sum(counts) == len(graph.addrs)
+
+# The table of the retainer array is the largest array table
+tbl = graph.biggest(['arrtbl'], 1)[0]
+assert dump.layouts[graph.layoutIds[graph.doms[tbl] - 1]]['name'] == 'arr', \
+    'retainer table not dominated by its array'
+
+# The objects in the table are dominated by it
+dominated = [
+    node for node in graph.succList(tbl)
+    if graph.layoutIds[node - 1] == objId and graph.doms[node] == tbl
+]
+assert len(dominated) == NUM_RETAINED, 'wrong dominator for retained objects'
+assert graph.retained[tbl] >= sum(graph.sizes[node - 1] for node in dominated)
+
+print('heap dump check passed')
@@ -0,0 +1,91 @@
+// Large objects are allocated outside of the heap and never moved
+
+function largeArrs(n)
+{
+    // Large array table kept alive across collections, referencing
+    // small objects which are moved by every collection
+    var big = new Array(20000);
+    for (var i = 0; i < big.length; ++i)
+        big[i] = { v: i };
+
+    for (var i = 0; i < n; ++i)
+    {
+        // Large garbage arrays, freed by the collections
+        var garbage = new Array(10000);
+        garbage[0] = i;
+
+        // Small garbage objects
+        for (var j = 0; j < 1000; ++j)
+            var g = [i, j];
+
+        big[i] = { v: i };
+    }
+
+    for (var i = 0; i < big.length; ++i)
+        if (big[i].v !== i)
+            return 1;
+
+    return 0;
+}
+
+function largeStrs(n)
+{
+    var str = 'x';
+    for (var i = 0; i < 16; ++i)
+        str += str;
+
+    for (var i = 0; i < n; ++i)
+    {
+        var s = str + String(i);
+
+        if (s.length !== 65536 + String(i).length)
+            return 1;
+        if (s.charCodeAt(65535) !== 120)
+            return 2;
+    }
+
+    return 0;
+}
+
+function manyCells(n)
+{
+    // Function with more escaping variables than fit in
+    // one co-allocated block of closure cells
+    var src = '(function () {';
+    for (var i = 0; i < n; ++i)
+        src += 'var v' + i + ' = ' + i + ';';
+    src += 'return function () { return 0';
+    for (var i = 0; i < n; ++i)
+        src += ' + v' + i;
+    src += '; }; })';
+
+    var getSum = eval(src)();
+
+    // Garbage, to move the cells
+    for (var i = 0; i < 200; ++i)
+        var garbage = new Array(10000);
+
+    if (getSum() !== n * (n - 1) / 2)
+        return 1;
+
+    return 0;
+}
+
+function test()
+{
+    var gcCount = $ir_get_gc_count();
+
+    if (largeArrs(400) !== 0)
+        return 1;
+
+    if (largeStrs(200) !== 0)
+        return 2;
+
+    if (manyCells(2000) !== 0)
+        return 3;
+
+    if ($ir_get_gc_count() === gcCount)
+        return 4;
+
+    return 0;
+}
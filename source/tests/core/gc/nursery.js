@@ -0,0 +1,81 @@
+// Objects only referenced by older objects must survive minor collections
+
+function Link(v, next)
+{
+    this.v = v;
+    this.next = next;
+}
+
+function oldToYoung(n)
+{
+    // These objects are promoted early on, then point to young objects
+    var arr = [];
+    var obj = {};
+    var list = new Link(-1, null);
+    var cell = null;
+
+    function getCell()
+    {
+        return cell;
+    }
+
+    for (var i = 0; i < n; ++i)
+    {
+        arr.push({ v: i });
+        obj['k' + (i % 100)] = [i];
+        list.next = new Link(i, list.next);
+        cell = { v: i };
+
+        // Garbage, to fill the nursery
+        var g = [i, i, i, i];
+    }
+
+    for (var i = 0; i < n; ++i)
+        if (arr[i].v !== i)
+            return 1;
+
+    for (var i = 0; i < 100; ++i)
+        if (obj['k' + i][0] !== n - 100 + i)
+            return 2;
+
+    var l = list.next;
+    for (var i = n - 1; i >= 0; --i, l = l.next)
+        if (l.v !== i)
+            return 3;
+
+    if (getCell().v !== n - 1)
+        return 4;
+
+    return 0;
+}
+
+function largeObjs(n)
+{
+    // Too large for the nursery, allocated in the old space directly
+    var big = new Array(100000);
+
+    for (var i = 0; i < n; ++i)
+        big[i % big.length] = { v: i };
+
+    for (var i = n - big.length; i < n; ++i)
+        if (big[i % big.length].v !== i)
+            return 1;
+
+    return 0;
+}
+
+function test()
+{
+    var gcCount = $ir_get_gc_count();
+
+    if (oldToYoung(30000) !== 0)
+        return 1;
+
+    if (largeObjs(200000) !== 0)
+        return 2;
+
+    if ($ir_get_gc_count() === gcCount)
+        return 3;
+
+    return 0;
+}